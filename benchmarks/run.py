@@ -0,0 +1,149 @@
+"""
+Benchmarks of synctodoist against an in-process fake of the Todoist Sync API
+
+Usage:
+    python -m benchmarks.run --sizes 1000 10000 100000 --repeat 3 --output benchmark_results.json
+
+The results are written as JSON, so the output of two releases can be compared.
+"""
+import argparse
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+from synctodoist import TodoistAPI
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.models import CacheBackendEnum, HydrationEnum, Task
+from synctodoist.todoist_api import CACHE_MAPPING
+
+
+def _reset(api: TodoistAPI, cache_dir: Path) -> None:
+    for cache_file in [*cache_dir.glob('todoist_*.json'), *cache_dir.glob('todoist_*.msgpack'), *cache_dir.glob('todoist_cache.sqlite3*')]:
+        cache_file.unlink()
+    for key in CACHE_MAPPING:
+        getattr(api, key)._items = {}  # pylint: disable=protected-access
+    api.command_manager.sync_token = '*'  # nosec
+
+
+def _measure(runs: int, setup: Callable[[], Any], benchmark: Callable[[], Any]) -> dict[str, Any]:
+    durations = []
+    for _ in range(runs):
+        setup()
+        start = perf_counter()
+        benchmark()
+        durations.append(perf_counter() - start)
+
+    return {'min': min(durations), 'median': statistics.median(durations), 'mean': statistics.mean(durations), 'runs': durations}
+
+
+def _peak_memory(setup: Callable[[], Any], benchmark: Callable[[], Any]) -> int:
+    setup()
+    tracemalloc.start()
+    try:
+        benchmark()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_size(tasks: int, commands: int, repeat: int, cache_dir: Path, cache_backend: CacheBackendEnum = CacheBackendEnum.json,  # pylint: disable=too-many-locals,too-many-arguments,too-many-positional-arguments
+             hydration: HydrationEnum = HydrationEnum.validate) -> list[dict[str, Any]]:
+    """
+    Run all benchmarks for an account with the given number of tasks
+
+    Args:
+        tasks: the number of tasks in the synthetic account
+        commands: the number of commands sent by the commit benchmark
+        repeat: the number of runs of each benchmark
+        cache_dir: the cache directory of the API client
+        cache_backend: the cache backend of the API client
+        hydration: the hydration mode of the API client
+
+    Returns:
+        One result dict per benchmark
+    """
+    fake = FakeSyncAPI()
+    fake.populate(tasks=tasks)
+    api = TodoistAPI(api_key='benchmark', cache_dir=cache_dir, cache_backend=cache_backend, hydration=hydration, rate_limit_enabled=False,
+                     coalesce_commands=False, transport=fake.transport())
+    results: list[dict[str, Any]] = []
+
+    def record(name: str, **values: Any) -> None:
+        results.append({'benchmark': name, 'tasks': tasks, 'cache_backend': cache_backend.value, 'hydration': hydration.value, **values})
+        print(f'{tasks:>8} tasks  {name:<26} {values.get("median", values.get("peak_bytes"))}')
+
+    def full_sync() -> None:
+        api.sync(full_sync=True)
+
+    def full_sync_setup() -> None:
+        _reset(api, cache_dir)
+
+    for streamed in (False, True):
+        api.settings.stream_sync = streamed
+        name = 'full_sync_streamed' if streamed else 'full_sync'
+        record(name, **_measure(repeat, full_sync_setup, full_sync))
+        record(f'{name}_memory', peak_bytes=_peak_memory(full_sync_setup, full_sync))
+    api.settings.stream_sync = False
+
+    changed = max(tasks // 100, 1)
+    record('partial_sync', changed=changed, **_measure(repeat, lambda: fake.touch('items', changed, seed=fake.version), api.sync))
+
+    def clear_items() -> None:
+        for key in CACHE_MAPPING:
+            getattr(api, key)._items = {}  # pylint: disable=protected-access
+
+    record('cache_cold_load', **_measure(repeat, clear_items, lambda: api._read_all_caches(force=True)))  # pylint: disable=protected-access
+    api.sync()
+    record('find', **_measure(repeat, lambda: None, lambda: api.find_task(pattern=rf'^Task {tasks - 1}$')))
+
+    def queue_commands() -> None:
+        for i in range(commands):
+            api.add_task(Task(content=f'Benchmark task {i}'))
+
+    record('commit', commands=commands, **_measure(repeat, queue_commands, api.commit))
+    api.close()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmarks and write the results to a JSON file"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000], help='the number of tasks of the synthetic accounts')
+    parser.add_argument('--commands', type=int, default=100, help='the number of commands sent by the commit benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of runs of each benchmark')
+    parser.add_argument('--cache-backend', type=CacheBackendEnum, default=CacheBackendEnum.json, choices=list(CacheBackendEnum),
+                        help='the cache backend of the API client')
+    parser.add_argument('--hydration', type=HydrationEnum, default=HydrationEnum.validate, choices=list(HydrationEnum),
+                        help='the hydration mode of the API client')
+    parser.add_argument('--output', type=Path, default=Path('benchmark_results.json'), help='the file the results are written to')
+    args = parser.parse_args(argv)
+
+    try:
+        package_version = version('synctodoist')
+    except PackageNotFoundError:
+        package_version = 'unknown'
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = [result for size in args.sizes for result in run_size(size, args.commands, args.repeat, Path(cache_dir), args.cache_backend, args.hydration)]
+
+    report = {
+        'synctodoist_version': package_version,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,2 @@
+from .async_todoist_api import AsyncTodoistAPI
 from .todoist_api import TodoistAPI
@@ -0,0 +1,249 @@
+import asyncio
+from typing import Any
+
+import httpx
+
+from synctodoist import tracing
+from synctodoist.auto_flush import AsyncAutoFlusher
+from synctodoist.background_sync import AsyncBackgroundSyncer
+from synctodoist.managers.command_manager import build_async_client
+from synctodoist.models import Task, Project, ResourceChanges, Settings
+from synctodoist.todoist_api import BaseTodoistAPI, CACHE_MAPPING, RESOURCE_TYPES
+
+
+class AsyncTodoistAPI(BaseTodoistAPI):
+    """Non-blocking client for the Todoist Sync API built on `httpx.AsyncClient`"""
+
+    def __init__(self, settings: Settings | None = None, transport: httpx.AsyncBaseTransport | None = None, **kwargs):
+        """
+        `AsyncTodoistAPI` accepts the same arguments as `TodoistAPI` and shares its models, managers and caches. Every method that talks to Todoist is a
+        coroutine, and reading or writing the cache files is done in a worker thread, so the event loop is never blocked.
+
+        Examples:
+            >>> from synctodoist import AsyncTodoistAPI
+            >>> async with AsyncTodoistAPI() as api:
+            ...     await api.sync()
+            ...     task = await api.get_task(task_id='123')
+
+        Args:
+            settings: an instance of the `Settings` class
+            transport: a custom httpx transport used by the HTTP client instead of the network, e.g. `FakeSyncAPI.async_transport()`
+            **kwargs: keyword arguments that should be passed on to the `Settings` object. These will be passed on only if the `settings` argument is not
+                provided.
+        """
+        super().__init__(settings=settings, **kwargs)
+
+        self.client = build_async_client(self.settings, transport=transport)
+        self.command_manager.async_client = self.client
+        self.command_manager.async_transport = transport
+        # Syncs and commits of several tasks, e.g. the background sync and a request handler, are applied one after the other
+        self._sync_lock = asyncio.Lock()
+        self.auto_flusher: AsyncAutoFlusher | None = None
+        self.background_syncer: AsyncBackgroundSyncer | None = None
+
+    async def __aenter__(self) -> 'AsyncTodoistAPI':
+        if self.settings.auto_flush:
+            self.start_auto_flush()
+        if self.settings.background_sync:
+            self.start_background_sync()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and release all pooled connections
+
+        If automatic commits are enabled, the background task is stopped and the remaining commands are committed first. Background syncs are stopped
+        as well.
+        """
+        await self.stop_background_sync()
+        await self.stop_auto_flush()
+        await self.client.aclose()
+
+    def start_auto_flush(self) -> None:
+        """Commit queued commands automatically in a background task of the running event loop
+
+        The queue is committed when it holds `Settings.auto_flush_max_commands` commands or its oldest command has been waiting for
+        `Settings.auto_flush_max_age` seconds. This is started automatically by `async with` if `Settings.auto_flush` is `True`.
+        """
+        if not self.auto_flusher:
+            self.auto_flusher = AsyncAutoFlusher(self, max_commands=self.settings.auto_flush_max_commands, max_age=self.settings.auto_flush_max_age)
+        self.auto_flusher.start()
+
+    async def stop_auto_flush(self, flush: bool = True) -> None:
+        """Stop committing queued commands automatically
+
+        Args:
+            flush: set to `False` to leave the queued commands uncommitted
+        """
+        if self.auto_flusher:
+            await self.auto_flusher.stop(flush=flush)
+            self.auto_flusher = None
+
+    def start_background_sync(self) -> None:
+        """Sync automatically in a background task of the running event loop
+
+        The interval adapts like the one of `TodoistAPI.start_background_sync()`. This is started automatically by `async with` if
+        `Settings.background_sync` is `True`.
+        """
+        if not self.background_syncer:
+            self.background_syncer = AsyncBackgroundSyncer(self, min_interval=self.settings.background_sync_min_interval,
+                                                           max_interval=self.settings.background_sync_max_interval,
+                                                           backoff=self.settings.background_sync_backoff, jitter=self.settings.background_sync_jitter)
+        self.background_syncer.start()
+
+    async def stop_background_sync(self) -> None:
+        """Stop syncing automatically, after the running sync has finished"""
+        if self.background_syncer:
+            await self.background_syncer.stop()
+            self.background_syncer = None
+
+    async def flush(self) -> None:
+        """Commit all queued commands and wait until the commit is finished
+
+        Raises:
+            TodoistError: if the commit fails
+        """
+        if self.auto_flusher:
+            await self.auto_flusher.flush()
+        elif self.command_manager.commands:
+            await self.commit()
+
+    async def commit(self) -> Any:
+        """Commit open commands to Todoist.
+
+        Unless `Settings.commit_with_sync` is disabled, the local state is synchronized in the same round trip as the last batch of commands.
+
+        Examples:
+            >>> from synctodoist import AsyncTodoistAPI
+            >>> api = AsyncTodoistAPI()
+            >>> await api.commit()
+
+        Raises:
+            TodoistBatchError: if the Todoist Sync API rejects commands of a batch. Batches after the failed one stay in the queue.
+        """
+        async with self._sync_lock:
+            with tracing.span('commit', command_count=len(self.command_manager.commands)):
+                return await self._commit()
+
+    async def _commit(self) -> Any:
+        if not self.settings.commit_with_sync:
+            result = await self.command_manager.commit_async()
+            await self._sync()
+            return result
+
+        await asyncio.to_thread(self._read_sync_state)
+        result = await self.command_manager.commit_async(resource_types=RESOURCE_TYPES)
+        if not all(resource_type in result for resource_type in RESOURCE_TYPES):
+            # Nothing was committed, so no resources were received
+            await self._sync()
+            return result
+
+        await self._store_sync_result(result)
+        return result
+
+    async def sync(self, full_sync: bool = False) -> bool:
+        """Synchronize with Todoist API
+
+        Concurrent syncs and commits of the event loop, e.g. of the background sync, wait for each other.
+
+        Examples:
+            >>> from synctodoist import AsyncTodoistAPI
+            >>> api = AsyncTodoistAPI()
+            >>> await api.sync()
+
+        Args:
+            full_sync: Set to `True` if you would like to perform a full synchronization, or `False` if you prefer a partial sync.
+
+        Returns:
+            `True` if a full sync was performed, `False` otherwise
+
+        Raises:
+            TodoistError: if the synchronization fails
+        """
+        async with self._sync_lock:
+            return await self._sync(full_sync)
+
+    async def _sync(self, full_sync: bool = False) -> bool:
+        with tracing.span('sync', streamed=self.settings.stream_sync) as span:
+            await asyncio.to_thread(self._read_sync_state, full_sync)
+
+            data = {'resource_types': RESOURCE_TYPES}
+            if self.settings.stream_sync:
+                full_sync = await self._streamed_sync(data)
+            else:
+                result = await self.command_manager.post_async(data, 'sync', **self._sync_arguments())
+                await self._store_sync_result(result)
+                full_sync = result['full_sync']
+
+            span.set_attribute('full_sync', full_sync)
+            return full_sync
+
+    async def _streamed_sync(self, data: dict[str, Any]) -> bool:
+        result: dict[str, Any] = {}
+        changes = {key: ResourceChanges() for key in CACHE_MAPPING}
+        construction_time = dict.fromkeys(RESOURCE_TYPES, 0.0)
+        hydrators = self._hydrators()
+        events = self._event_lists()
+        with self._changing_managers():
+            with tracing.span('sync.stream') as span:
+                async for event in self.command_manager.post_stream_async(data, 'sync', stream_keys=RESOURCE_TYPES, **self._sync_arguments()):
+                    self._apply_sync_event(event, result, changes, construction_time, hydrators, events)
+                span.set_attribute('item_count', sum(resource_changes.count for resource_changes in changes.values()))
+
+            self._finish_streamed_sync(result, changes, construction_time, hydrators, events)
+        await self._store_sync_state()
+        return result['full_sync']  # type: ignore
+
+    async def _store_sync_result(self, result: Any) -> None:
+        self._apply_sync_result(result)
+        await self._store_sync_state()
+
+    async def _store_sync_state(self) -> None:
+        await asyncio.to_thread(self._write_sync_state)
+        self.synced = True
+        self.metrics.export()
+        self._publish_changes()
+
+    async def get_project(self, project_id: int | str) -> Project:
+        """Get project by id
+
+        Note:
+            This is convenience wrapper for AsyncTodoistAPI.projects.get_async(project_id)
+
+        Args:
+            project_id: the id of the project
+
+        Returns:
+            A `Project` instance with all project details
+
+        Raises:
+            TodoistError: if `project_id` is not found
+        """
+        return await self.projects.get_async(item_id=project_id)  # type: ignore
+
+    async def get_task(self, task_id: int | str) -> Task:
+        """Get task by id
+
+        Note:
+            This is convenience wrapper for AsyncTodoistAPI.tasks.get_async(task_id)
+
+        Args:
+            task_id: the id of the task
+
+        Returns:
+            A Task instance with all task details
+
+        Raises:
+            TodoistError: if `task_id` is not found
+        """
+        return await self.tasks.get_async(item_id=task_id)  # type: ignore
+
+    async def get_stats(self) -> dict:
+        """Get Todoist usage statistics
+
+        Returns:
+            A dict with all user stats
+        """
+        return await self.command_manager.get_async('completed/get_stats')  # type: ignore
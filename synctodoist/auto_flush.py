@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from synctodoist.managers.command_manager import CommandManager
+    from synctodoist.async_todoist_api import AsyncTodoistAPI
+    from synctodoist.todoist_api import TodoistAPI
+
+
+class _FlushPolicy:
+    """Decides when the command queue is due for a commit"""
+
+    def __init__(self, command_manager: CommandManager, max_commands: int, max_age: float):
+        self.command_manager = command_manager
+        self.max_commands = max_commands
+        self.max_age = max_age
+        self.last_error: Exception | None = None
+        self._retry_at = 0.0
+
+    def time_until_due(self) -> float | None:
+        """The number of seconds until the queue has to be committed, or `None` if it is empty"""
+        if not self.command_manager.commands:
+            return None
+
+        if len(self.command_manager.commands) >= self.max_commands:
+            due_in = 0.0
+        else:
+            due_in = self.max_age - self.command_manager.oldest_command_age()
+
+        # Do not hammer Todoist if the last commit failed
+        return max(due_in, self._retry_at - monotonic(), 0.0)
+
+    def succeeded(self) -> None:
+        """Record a successful commit"""
+        self.last_error = None
+        self._retry_at = 0.0
+
+    def failed(self, ex: Exception) -> None:
+        """Record a failed commit, which holds back the next attempt for `max_age` seconds"""
+        self.last_error = ex
+        self._retry_at = monotonic() + self.max_age
+
+
+class AutoFlusher:
+    """
+    Commits the command queue of a `TodoistAPI` in a background thread
+
+    The queue is committed as soon as it holds `max_commands` commands or its oldest command has been waiting for `max_age` seconds. If a commit fails, the
+    commands stay in the queue, the error is stored in `last_error` and the next attempt is made after `max_age` seconds.
+
+    Examples:
+        >>> from synctodoist import TodoistAPI
+        >>> api = TodoistAPI(auto_flush=True, auto_flush_max_commands=50, auto_flush_max_age=0.5)
+        >>> api.add_task(task)
+        >>> api.flush()
+    """
+
+    def __init__(self, api: TodoistAPI, max_commands: int, max_age: float):
+        """
+        Args:
+            api: the `TodoistAPI` whose queue is committed
+            max_commands: the number of queued commands that triggers a commit
+            max_age: the number of seconds a command may wait in the queue before it is committed
+        """
+        self.api = api
+        self._policy = _FlushPolicy(api.command_manager, max_commands=max_commands, max_age=max_age)
+        self._condition = threading.Condition()
+        self._commit_lock = threading.Lock()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def last_error(self) -> Exception | None:
+        """The error raised by the last background commit, or `None` if it succeeded"""
+        return self._policy.last_error
+
+    @property
+    def running(self) -> bool:
+        """`True` if the background thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _notify(self) -> None:
+        with self._condition:
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping and (due_in := self._policy.time_until_due()) != 0.0:
+                    self._condition.wait(due_in)
+                if self._stopping:
+                    return
+
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                pass  # the error is stored in last_error by flush()
+
+    def start(self) -> None:
+        """Start the background thread"""
+        if self.running:
+            return
+
+        self._stopping = False
+        self.api.command_manager.queue_listeners.append(self._notify)
+        self._thread = threading.Thread(target=self._run, name='synctodoist-auto-flush', daemon=True)
+        self._thread.start()
+
+    def flush(self) -> None:
+        """
+        Commit all queued commands and wait until the commit is finished
+
+        Raises:
+            TodoistError: if the commit fails
+        """
+        with self._commit_lock:
+            if not self.api.command_manager.commands:
+                return
+
+            try:
+                self.api.commit()
+            except Exception as ex:
+                self._policy.failed(ex)
+                raise
+            self._policy.succeeded()
+
+    def stop(self, flush: bool = True, timeout: float | None = None) -> None:
+        """
+        Stop the background thread
+
+        Args:
+            flush: set to `False` to leave the queued commands uncommitted
+            timeout: the maximum number of seconds to wait for the background thread to finish
+        """
+        if self._notify in self.api.command_manager.queue_listeners:
+            self.api.command_manager.queue_listeners.remove(self._notify)
+
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+        if flush:
+            self.flush()
+
+
+class AsyncAutoFlusher:
+    """
+    Commits the command queue of an `AsyncTodoistAPI` in a background asyncio task
+
+    It works like `AutoFlusher`, but it has to be started from a running event loop and commands have to be queued from the thread of that loop.
+    """
+
+    def __init__(self, api: AsyncTodoistAPI, max_commands: int, max_age: float):
+        """
+        Args:
+            api: the `AsyncTodoistAPI` whose queue is committed
+            max_commands: the number of queued commands that triggers a commit
+            max_age: the number of seconds a command may wait in the queue before it is committed
+        """
+        self.api = api
+        self._policy = _FlushPolicy(api.command_manager, max_commands=max_commands, max_age=max_age)
+        self._event = asyncio.Event()
+        self._commit_lock = asyncio.Lock()
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def last_error(self) -> Exception | None:
+        """The error raised by the last background commit, or `None` if it succeeded"""
+        return self._policy.last_error
+
+    @property
+    def running(self) -> bool:
+        """`True` if the background task is running"""
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        while True:
+            while not self._stopping:
+                self._event.clear()
+                if (due_in := self._policy.time_until_due()) == 0.0:
+                    break
+                try:
+                    await asyncio.wait_for(self._event.wait(), due_in)
+                except asyncio.TimeoutError:
+                    pass
+
+            if self._stopping:
+                return
+
+            try:
+                await self.flush()
+            except Exception:  # pylint: disable=broad-except
+                pass  # the error is stored in last_error by flush()
+
+    def start(self) -> None:
+        """Start the background task in the running event loop"""
+        if self.running:
+            return
+
+        self._stopping = False
+        self.api.command_manager.queue_listeners.append(self._event.set)
+        self._task = asyncio.get_running_loop().create_task(self._run(), name='synctodoist-auto-flush')
+
+    async def flush(self) -> None:
+        """
+        Commit all queued commands and wait until the commit is finished
+
+        Raises:
+            TodoistError: if the commit fails
+        """
+        async with self._commit_lock:
+            if not self.api.command_manager.commands:
+                return
+
+            try:
+                await self.api.commit()
+            except Exception as ex:
+                self._policy.failed(ex)
+                raise
+            self._policy.succeeded()
+
+    async def stop(self, flush: bool = True) -> None:
+        """
+        Stop the background task
+
+        Args:
+            flush: set to `False` to leave the queued commands uncommitted
+        """
+        if self._event.set in self.api.command_manager.queue_listeners:
+            self.api.command_manager.queue_listeners.remove(self._event.set)
+
+        self._stopping = True
+        self._event.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+        if flush:
+            await self.flush()
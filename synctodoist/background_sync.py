@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from datetime import datetime, timezone
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from synctodoist.rate_limiter import RateLimiter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from synctodoist.async_todoist_api import AsyncTodoistAPI
+    from synctodoist.todoist_api import TodoistAPI
+
+
+class BackgroundSyncHealth(BaseModel):
+    """
+    Status of a background sync loop
+
+    Attributes:
+        running: `True` if the loop is running
+        interval: the current number of seconds between two syncs
+        sync_count: the number of successful syncs
+        consecutive_failures: the number of syncs that failed since the last successful one
+        last_error: the error raised by the last sync, or `None` if it succeeded
+        last_sync_at: the time of the last successful sync
+        last_change_at: the time of the last sync that received changes
+    """
+    running: bool = False
+    interval: float = 0.0
+    sync_count: int = 0
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    last_sync_at: datetime | None = None
+    last_change_at: datetime | None = None
+
+    @property
+    def healthy(self) -> bool:
+        """`True` if the loop is running and its last sync succeeded"""
+        return self.running and not self.consecutive_failures
+
+
+class _SyncPolicy:  # pylint: disable=too-many-instance-attributes
+    """Decides when the next background sync is due"""
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float, jitter: float):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.interval = min_interval
+        self.sync_count = 0
+        self.consecutive_failures = 0
+        self.last_error: Exception | None = None
+        self.last_sync_at: datetime | None = None
+        self.last_change_at: datetime | None = None
+        self._random = random.Random()
+        # Loops started at the same time, e.g. for many accounts, are spread over the first interval
+        self._due_at = monotonic() + self._random.uniform(0.0, min_interval) * min(jitter, 1.0)
+
+    def _schedule(self) -> None:
+        self._due_at = monotonic() + self.interval * self._random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def _back_off(self) -> None:
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def time_until_due(self, rate_limiter: RateLimiter | None) -> float:
+        """The number of seconds until the next sync, which waits for the rate limiter instead of queueing behind other requests"""
+        due_in = self._due_at - monotonic()
+        if rate_limiter:
+            due_in = max(due_in, rate_limiter.wait_time())
+        return max(due_in, 0.0)
+
+    def succeeded(self, change_count: int) -> None:
+        """Record a successful sync, which polls faster if it received changes and slower otherwise"""
+        self.sync_count += 1
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.last_sync_at = datetime.now(timezone.utc)
+        if change_count:
+            self.last_change_at = self.last_sync_at
+            self.interval = self.min_interval
+        else:
+            self._back_off()
+        self._schedule()
+
+    def failed(self, ex: Exception) -> None:
+        """Record a failed sync, which holds back the next attempt like a sync without changes"""
+        self.consecutive_failures += 1
+        self.last_error = ex
+        self._back_off()
+        self._schedule()
+
+    def activity(self, immediate: bool = False) -> None:
+        """Poll at the shortest interval again, e.g. because commands were queued, and sync right away if `immediate` is `True`"""
+        self.interval = self.min_interval
+        self._due_at = min(self._due_at, monotonic() + (0.0 if immediate else self.min_interval))
+
+    def health(self, running: bool) -> BackgroundSyncHealth:
+        """The status of the loop"""
+        return BackgroundSyncHealth(running=running, interval=self.interval, sync_count=self.sync_count, consecutive_failures=self.consecutive_failures,
+                                    last_error=repr(self.last_error) if self.last_error else None, last_sync_at=self.last_sync_at,
+                                    last_change_at=self.last_change_at)
+
+
+def _change_count(api: TodoistAPI | AsyncTodoistAPI) -> int:
+    return sum(resource_changes.count for resource_changes in api.last_sync_changes.values())
+
+
+class BackgroundSyncer:
+    """
+    Keeps a `TodoistAPI` up to date by syncing in a background thread
+
+    The interval between two syncs adapts to the account: it starts at `min_interval`, is multiplied by `backoff` after every sync that received no changes
+    or failed, up to `max_interval`, and drops back to `min_interval` after a sync that received changes, when commands are queued locally, or when
+    `wake()` is called. Every interval is varied randomly by `jitter`, so the loops of many accounts do not send their requests at the same time, and a
+    sync waits while the rate limiter of the API key has no budget left.
+
+    Examples:
+        >>> from synctodoist import TodoistAPI
+        >>> api = TodoistAPI(background_sync=True, background_sync_min_interval=10, background_sync_max_interval=600)
+        >>> api.background_syncer.health
+        >>> api.close()
+    """
+
+    def __init__(self, api: TodoistAPI, min_interval: float, max_interval: float, backoff: float = 2.0, jitter: float = 0.1):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """
+        Args:
+            api: the `TodoistAPI` that is synced
+            min_interval: the shortest number of seconds between two syncs
+            max_interval: the longest number of seconds between two syncs
+            backoff: the factor by which the interval grows after a sync without changes
+            jitter: the share by which every interval is varied randomly
+        """
+        self.api = api
+        self._policy = _SyncPolicy(min_interval=min_interval, max_interval=max_interval, backoff=backoff, jitter=jitter)
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def last_error(self) -> Exception | None:
+        """The error raised by the last background sync, or `None` if it succeeded"""
+        return self._policy.last_error
+
+    @property
+    def running(self) -> bool:
+        """`True` if the background thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def health(self) -> BackgroundSyncHealth:
+        """The status of the loop, e.g. for a health check endpoint"""
+        with self._condition:
+            return self._policy.health(self.running)
+
+    def _notify(self) -> None:
+        with self._condition:
+            self._policy.activity()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping and (due_in := self._policy.time_until_due(self.api.rate_limiter)) > 0.0:
+                    self._condition.wait(due_in)
+                if self._stopping:
+                    return
+
+            try:
+                self.api.sync()
+            except Exception as ex:  # pylint: disable=broad-except
+                with self._condition:
+                    self._policy.failed(ex)
+                self.api.metrics.increment('background_sync.failures')
+                continue
+
+            with self._condition:
+                self._policy.succeeded(_change_count(self.api))
+            self.api.metrics.increment('background_sync.syncs')
+
+    def start(self) -> None:
+        """Start the background thread"""
+        if self.running:
+            return
+
+        self._stopping = False
+        self.api.command_manager.queue_listeners.append(self._notify)
+        self._thread = threading.Thread(target=self._run, name='synctodoist-background-sync', daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        """Sync as soon as possible, e.g. after a webhook reported a change, and poll at the shortest interval again"""
+        with self._condition:
+            self._policy.activity(immediate=True)
+            self._condition.notify()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop the background thread, after the sync it is running has finished
+
+        Args:
+            timeout: the maximum number of seconds to wait for the background thread to finish
+        """
+        if self._notify in self.api.command_manager.queue_listeners:
+            self.api.command_manager.queue_listeners.remove(self._notify)
+
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class AsyncBackgroundSyncer:
+    """
+    Keeps an `AsyncTodoistAPI` up to date by syncing in a background asyncio task
+
+    It works like `BackgroundSyncer`, but it has to be started from a running event loop and commands have to be queued from the thread of that loop.
+    """
+
+    def __init__(self, api: AsyncTodoistAPI, min_interval: float, max_interval: float, backoff: float = 2.0, jitter: float = 0.1):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """
+        Args:
+            api: the `AsyncTodoistAPI` that is synced
+            min_interval: the shortest number of seconds between two syncs
+            max_interval: the longest number of seconds between two syncs
+            backoff: the factor by which the interval grows after a sync without changes
+            jitter: the share by which every interval is varied randomly
+        """
+        self.api = api
+        self._policy = _SyncPolicy(min_interval=min_interval, max_interval=max_interval, backoff=backoff, jitter=jitter)
+        self._event = asyncio.Event()
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def last_error(self) -> Exception | None:
+        """The error raised by the last background sync, or `None` if it succeeded"""
+        return self._policy.last_error
+
+    @property
+    def running(self) -> bool:
+        """`True` if the background task is running"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def health(self) -> BackgroundSyncHealth:
+        """The status of the loop, e.g. for a health check endpoint"""
+        return self._policy.health(self.running)
+
+    def _notify(self) -> None:
+        self._policy.activity()
+        self._event.set()
+
+    async def _run(self) -> None:
+        while True:
+            while not self._stopping:
+                self._event.clear()
+                if (due_in := self._policy.time_until_due(self.api.rate_limiter)) == 0.0:
+                    break
+                try:
+                    await asyncio.wait_for(self._event.wait(), due_in)
+                except asyncio.TimeoutError:
+                    pass
+
+            if self._stopping:
+                return
+
+            try:
+                await self.api.sync()
+            except Exception as ex:  # pylint: disable=broad-except
+                self._policy.failed(ex)
+                self.api.metrics.increment('background_sync.failures')
+                continue
+
+            self._policy.succeeded(_change_count(self.api))
+            self.api.metrics.increment('background_sync.syncs')
+
+    def start(self) -> None:
+        """Start the background task in the running event loop"""
+        if self.running:
+            return
+
+        self._stopping = False
+        self.api.command_manager.queue_listeners.append(self._notify)
+        self._task = asyncio.get_running_loop().create_task(self._run(), name='synctodoist-background-sync')
+
+    def wake(self) -> None:
+        """Sync as soon as possible, e.g. after a webhook reported a change, and poll at the shortest interval again"""
+        self._policy.activity(immediate=True)
+        self._event.set()
+
+    async def stop(self) -> None:
+        """Stop the background task, after the sync it is running has finished"""
+        if self._notify in self.api.command_manager.queue_listeners:
+            self.api.command_manager.queue_listeners.remove(self._notify)
+
+        self._stopping = True
+        self._event.set()
+        if self._task:
+            await self._task
+            self._task = None
@@ -0,0 +1,149 @@
+"""
+Compact binary cache files
+
+A binary cache file starts with a fixed header (`MAGIC` and the schema version as an unsigned 16-bit integer), followed by a msgpack document in a columnar
+layout: the field names of the model are stored once, and every item is a row of values in the same order. Dates and datetimes are stored as msgpack
+extension types, so they can be loaded without parsing and validation. Items that are only held as raw records, e.g. in lazy store mode, are written as
+they are, and their date and time strings are parsed when the file is loaded.
+"""
+import struct
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Mapping, Type, TypeVar
+
+from pydantic import BaseModel
+
+from synctodoist.cache_files import atomic_write
+from synctodoist.exceptions import TodoistError
+from synctodoist.hydration import paused_gc, trusted_constructor
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+MAGIC = b'SYNCTODO'
+SCHEMA_VERSION = 1
+HEADER = struct.Struct('>8sH')
+EXT_DATETIME = 1
+EXT_DATE = 2
+
+TModel = TypeVar('TModel', bound=BaseModel)  # pylint: disable=invalid-name
+
+
+class CacheFormatError(TodoistError):
+    """Raised when a binary cache file was not written by a compatible version of synctodoist"""
+
+
+def require_msgpack() -> None:
+    """
+    Raises:
+        TodoistError: if `msgpack` is not installed
+    """
+    if msgpack is None:
+        raise TodoistError('The binary cache requires msgpack. Install it with `pip install synctodoist[msgpack]`.')
+
+
+def _default(obj: Any) -> Any:
+    # datetime has to be checked first, because it is a subclass of date
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return {key: value for key, value in obj if value is not None}
+    raise TypeError(f'Cannot serialize {type(obj).__name__} in the binary cache')
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == EXT_DATE:
+        return date.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+def _row_getter(model: Type[BaseModel], columns: list[str]) -> Callable[[BaseModel | dict[str, Any]], list[Any]]:
+    # Records are keyed like in the Todoist API or by field name
+    keys = [(model.model_fields[column].alias or column, column) for column in columns]
+
+    def row(item: BaseModel | dict[str, Any]) -> list[Any]:
+        if isinstance(item, BaseModel):
+            return [getattr(item, column) for column in columns]
+        return [item[alias] if alias in item else item.get(column) for alias, column in keys]
+
+    return row
+
+
+def dump(path: Path, name: str, model: Type[BaseModel], items: Mapping[str, BaseModel | dict[str, Any]], fsync: bool = True) -> int:
+    """
+    Write items to a binary cache file
+
+    The file is replaced atomically, so readers never see a partially written file.
+
+    Args:
+        path: the cache file
+        name: the name of the cache
+        model: the model class of the items
+        items: the items by id, as model instances or as records keyed like in the Todoist API or by field name
+        fsync: set to `False` to skip flushing the file to disk before it replaces the old one
+
+    Returns:
+        The size of the file in bytes
+    """
+    columns = list(model.model_fields)
+    row = _row_getter(model, columns)
+    body = msgpack.packb({
+        'name': name,
+        'columns': columns,
+        'ids': list(items),
+        'rows': [row(item) for item in items.values()],
+    }, default=_default, use_bin_type=True)
+
+    with atomic_write(path, fsync=fsync) as cache_fp:
+        cache_fp.write(HEADER.pack(MAGIC, SCHEMA_VERSION))
+        cache_fp.write(body)
+    return HEADER.size + len(body)
+
+
+def load(path: Path, model: Type[TModel], materialize: bool = True) -> dict[str, TModel] | dict[str, dict[str, Any]]:
+    """
+    Read items from a binary cache file
+
+    The items are created without validation, because they were validated before they were written. Date and time strings of items that were written
+    as raw records are parsed.
+
+    Args:
+        path: the cache file
+        model: the model class of the items
+        materialize: set to `False` to get the field values of every item as a dict instead of a model instance
+
+    Returns:
+        The items by id
+
+    Raises:
+        CacheFormatError: if the file is not a binary cache file or has an unsupported schema version
+    """
+    data = path.read_bytes()
+    if len(data) < HEADER.size:
+        raise CacheFormatError(f'{path} is not a binary cache file')
+
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise CacheFormatError(f'{path} is not a binary cache file')
+    if version != SCHEMA_VERSION:
+        raise CacheFormatError(f'{path} has schema version {version}, but only version {SCHEMA_VERSION} is supported')
+
+    construct = trusted_constructor(model, from_json=True)
+    with paused_gc():
+        cache = msgpack.unpackb(memoryview(data)[HEADER.size:], ext_hook=_ext_hook, raw=False, strict_map_key=False)
+        # Columns of fields that were removed from the model since the file was written are skipped
+        columns = [column if column in model.model_fields else None for column in cache['columns']]
+        if not materialize:
+            return {item_id: {column: value for column, value in zip(columns, row) if value is not None and column is not None}
+                    for item_id, row in zip(cache['ids'], cache['rows'])}
+        return {item_id: construct({column: value for column, value in zip(columns, row) if value is not None and column is not None})
+                for item_id, row in zip(cache['ids'], cache['rows'])}
@@ -0,0 +1,125 @@
+"""
+Safe access to cache files shared by several processes
+
+Cache files are replaced atomically: they are written to a temporary file in the same directory, flushed to disk and renamed over the old file, so a reader
+sees either the old or the new version, but never a truncated file. A `CacheLock` serializes the processes using the same cache directory: reading the sync
+token and the caches takes a shared lock, writing them takes an exclusive lock, so a reader never combines caches and a sync token of different syncs.
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+if sys.platform == 'win32':  # pragma: no cover
+    import msvcrt  # pylint: disable=import-error
+else:
+    import fcntl
+
+# Temporary files are created with mode 0600, so the mode of a new cache file is set like open() would set it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Makes the rename durable. Directories cannot be opened on Windows, where the rename is durable without it.
+    if not hasattr(os, 'O_DIRECTORY'):
+        return  # pragma: no cover
+
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)  # pylint: disable=no-member
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = 'wb', fsync: bool = True, **kwargs: Any) -> Iterator[IO[Any]]:
+    """
+    Open a temporary file that replaces `path` when the block ends without an exception
+
+    Examples:
+        >>> with atomic_write(Path('cache.json'), 'w', encoding='utf-8') as cache_fp:
+        ...     json.dump(data, cache_fp)
+
+    Args:
+        path: the file to replace
+        mode: the mode in which the temporary file is opened, `'wb'` or `'w'`
+        fsync: set to `False` to skip flushing the file to disk before it is renamed (faster, but the file may be empty after a crash of the machine)
+        **kwargs: passed on to `open()`, e.g. `encoding`
+
+    Returns:
+        The temporary file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **kwargs) as temp_fp:
+            yield temp_fp
+            temp_fp.flush()
+            if fsync:
+                os.fsync(temp_fp.fileno())
+        os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
+
+    if fsync:
+        _fsync_directory(path.parent)
+
+
+class CacheLock:
+    """
+    Advisory lock of a cache directory, shared by all processes and threads that use it
+
+    The lock is held on a separate lock file, so the cache files themselves can be replaced while it is held. Every acquisition opens the lock file again, so
+    the lock also works between threads of the same process. It is not reentrant. Windows does not support shared locks, so both kinds of lock are
+    exclusive there.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: the lock file, e.g. `todoist_cache.lock` in the cache directory
+        """
+        self.path = path
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock together with other readers"""
+        with self._acquire(exclusive=False):
+            yield
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock alone"""
+        with self._acquire(exclusive=True):
+            yield
+
+    @contextmanager
+    def _acquire(self, exclusive: bool) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open('a+b') as lock_fp:
+            if sys.platform == 'win32':  # pragma: no cover
+                lock_fp.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(lock_fp.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(0.01)
+                try:
+                    yield
+                finally:
+                    lock_fp.seek(0)
+                    msvcrt.locking(lock_fp.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_fp.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_fp.fileno(), fcntl.LOCK_UN)
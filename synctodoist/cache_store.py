@@ -0,0 +1,147 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    resource_type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (resource_type, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+GENERATION_KEY = 'generation:{}'
+
+
+@dataclass
+class CacheChanges:
+    """
+    The changes of one resource type since the cache was last written
+
+    This is a plain dataclass rather than a pydantic model, so the items of large syncs are not validated again on their way to the database.
+
+    Attributes:
+        upserted: the items that were added or changed, by id
+        deleted: the ids of the items that were removed
+        replace_all: `True` if all stored items should be replaced by `upserted`, e.g. after a full sync
+    """
+    upserted: dict[str, dict[str, Any]] = field(default_factory=dict)
+    deleted: set[str] = field(default_factory=set)
+    replace_all: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.upserted or self.deleted or self.replace_all)
+
+
+class SQLiteCacheStore:
+    """
+    Cache of all resource types in a single SQLite database
+
+    Every item is stored in its own row keyed by resource type and id, so a sync only upserts and deletes the rows it touched instead of rewriting the
+    whole cache. The sync token is stored in the same transaction as the items, so the cache and the token never disagree after a crash.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: the database file
+        """
+        self.path = path
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def load(self, resource_type: str) -> dict[str, dict[str, Any]]:
+        """
+        Read all stored items of a resource type
+
+        Args:
+            resource_type: the resource type, e.g. `items`
+
+        Returns:
+            The stored items by id
+        """
+        with self._connect() as connection:
+            rows = connection.execute('SELECT id, data FROM items WHERE resource_type = ?', (resource_type,))
+            return {item_id: json.loads(data) for item_id, data in rows}
+
+    def generation(self, resource_type: str) -> tuple[str, int] | None:
+        """
+        The generation of the stored items of a resource type
+
+        The generation changes whenever the items of the resource type are written, by any process, so a client can skip reloading items it already holds.
+
+        Args:
+            resource_type: the resource type, e.g. `items`
+
+        Returns:
+            The database file and the number of writes of the resource type, or `None` if the database does not exist
+        """
+        if not self.path.exists():
+            return None
+
+        with self._connect() as connection:
+            row = connection.execute('SELECT value FROM meta WHERE key = ?', (GENERATION_KEY.format(resource_type),)).fetchone()
+        return str(self.path), int(row[0]) if row else 0
+
+    def write(self, changes: dict[str, CacheChanges], sync_token: str) -> dict[str, tuple[str, int]]:
+        """
+        Apply the changes of a sync and store the sync token in a single transaction
+
+        Args:
+            changes: the changes by resource type
+            sync_token: the sync token the changes belong to
+
+        Returns:
+            The new generation of every resource type in `changes`
+        """
+        generations: dict[str, tuple[str, int]] = {}
+        with self._connect() as connection:
+            for resource_type, resource_changes in changes.items():
+                key = GENERATION_KEY.format(resource_type)
+                if resource_changes:
+                    connection.execute("INSERT INTO meta (key, value) VALUES (?, '1') ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+                                       (key,))
+                row = connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+                generations[resource_type] = str(self.path), int(row[0]) if row else 0
+
+                if resource_changes.replace_all:
+                    connection.execute('DELETE FROM items WHERE resource_type = ?', (resource_type,))
+                elif resource_changes.deleted:
+                    connection.executemany('DELETE FROM items WHERE resource_type = ? AND id = ?',
+                                           ((resource_type, item_id) for item_id in resource_changes.deleted))
+
+                connection.executemany('INSERT OR REPLACE INTO items (resource_type, id, data) VALUES (?, ?, ?)',
+                                       ((resource_type, item_id, json.dumps(data, default=str)) for item_id, data in resource_changes.upserted.items()))
+
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('sync_token', ?)", (sync_token,))
+        return generations
+
+    def read_sync_token(self) -> str:
+        """The stored sync token, or `*` if nothing was synced yet"""
+        if not self.path.exists():
+            return '*'
+
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'sync_token'").fetchone()
+        return row[0] if row else '*'
+
+    def write_sync_token(self, sync_token: str) -> None:
+        """Store the sync token without changing any items"""
+        self.write({}, sync_token=sync_token)
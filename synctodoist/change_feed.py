@@ -0,0 +1,99 @@
+"""
+Change events of syncs
+
+While a sync applies the changes received from Todoist, the managers describe every added, updated and deleted item as a `ChangeEvent`. The events are
+passed to the subscribers registered in a `ChangeFeed` once the sync is stored, so consumers such as search indexes or notifiers process only the changed
+items instead of comparing the contents of the managers. Events are only created for resource types that have a subscriber, so a sync without subscribers
+costs nothing extra.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from synctodoist.models import ChangeKindEnum
+
+
+@dataclass
+class ChangeEvent:
+    """
+    A change of one item applied by a sync
+
+    This is a plain dataclass rather than a pydantic model, so the field values are not validated again for every changed item.
+
+    Attributes:
+        resource: the cache label of the resource type, e.g. `'tasks'`
+        kind: whether the item was added, updated or deleted
+        id: the id of the item
+        item: the model instance of the item, `None` if it was deleted
+        old: the field values before the sync, `None` if the item was added
+        new: the field values after the sync, `None` if the item was deleted
+    """
+    resource: str
+    kind: ChangeKindEnum
+    id: str
+    item: Any = None
+    old: dict[str, Any] | None = None
+    new: dict[str, Any] | None = None
+
+    @property
+    def changed_fields(self) -> set[str]:
+        """The names of the fields whose value was changed by the sync, all fields for added and deleted items"""
+        old, new = self.old or {}, self.new or {}
+        return {name for name in old.keys() | new.keys() if name not in old or name not in new or old[name] != new[name]}
+
+
+Subscriber = Callable[[ChangeEvent], None]
+Predicate = Callable[[ChangeEvent], bool]
+
+
+class ChangeFeed:
+    """
+    The subscribers to the change events of an API instance
+
+    A subscriber receives the events of all resource types, of one resource type, or only the events accepted by a predicate. Subscribers are called in
+    the order in which they were registered, on the thread that ran the sync. An exception raised by a subscriber is passed on to the caller of the sync,
+    after the sync was stored.
+    """
+
+    def __init__(self):
+        self._subscriptions: list[tuple[Subscriber, str | None, Predicate | None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber: Subscriber, resource: str | None = None, predicate: Predicate | None = None) -> None:
+        """
+        Register a callback that receives change events
+
+        Args:
+            subscriber: a callable that accepts a `ChangeEvent`
+            resource: the cache label of the resource type whose events are passed to `subscriber`, e.g. `'tasks'`. All resource types if `None`.
+            predicate: a callable that accepts a `ChangeEvent` and returns `True` if it should be passed to `subscriber`
+        """
+        with self._lock:
+            self._subscriptions.append((subscriber, resource, predicate))
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """
+        Unregister all subscriptions of a callback
+
+        Args:
+            subscriber: the callable passed to `subscribe()`
+        """
+        with self._lock:
+            self._subscriptions = [subscription for subscription in self._subscriptions if subscription[0] != subscriber]
+
+    def wants(self, resource: str) -> bool:
+        """`True` if a subscriber may receive events of the resource type, so a sync has to create them"""
+        return any(subscribed in (None, resource) for _, subscribed, _ in self._subscriptions)
+
+    def publish(self, events: Iterable[ChangeEvent]) -> None:
+        """
+        Pass change events to the subscribers that want them
+
+        Args:
+            events: the events in the order in which the changes were applied
+        """
+        subscriptions = list(self._subscriptions)
+        for event in events:
+            for subscriber, resource, predicate in subscriptions:
+                if resource in (None, event.resource) and (predicate is None or predicate(event)):
+                    subscriber(event)
@@ -0,0 +1,122 @@
+from typing import Any, Collection
+
+from pydantic import BaseModel
+
+from synctodoist.models import Command
+
+TOGGLE_GROUPS = {
+    'item_complete': 'item_completion',
+    'item_uncomplete': 'item_completion',
+    'project_archive': 'project_archival',
+    'project_unarchive': 'project_archival',
+    'section_archive': 'section_archival',
+    'section_unarchive': 'section_archival',
+}
+
+
+class CoalesceStats(BaseModel):
+    """
+    Statistics of a coalescing pass
+
+    Attributes:
+        before: the number of commands before coalescing
+        after: the number of commands after coalescing
+        merged_updates: the number of update commands merged into a later update of the same item
+        dropped_add_delete: the number of commands dropped because the item was added and deleted before it was committed
+        collapsed_toggles: the number of close/reopen (or archive/unarchive) commands superseded by a later toggle of the same item
+    """
+    before: int = 0
+    after: int = 0
+    merged_updates: int = 0
+    dropped_add_delete: int = 0
+    collapsed_toggles: int = 0
+
+    @property
+    def eliminated(self) -> int:
+        """The number of commands removed from the queue"""
+        return self.before - self.after
+
+
+def _target_id(command: Command) -> Any:
+    if isinstance(command.args, dict):
+        return command.args.get('id')
+    return None
+
+
+def _references(value: Any, temp_id: str) -> bool:
+    match value:
+        case str():
+            return value == temp_id
+        case dict():
+            return any(_references(item, temp_id) for item in value.values())
+        case list():
+            return any(_references(item, temp_id) for item in value)
+    return False
+
+
+def _drop_added_and_deleted(queued: list[Command], sent: Collection[str], stats: CoalesceStats) -> list[Command]:
+    # An add that was sent may have been executed by Todoist even if the response was lost, so only the delete can remove the item again
+    added = {command.temp_id: command for command in queued if command.type.endswith('_add') and command.temp_id and command.uuid not in sent}
+    dropped: set[str] = set()
+
+    for command in queued:
+        temp_id = _target_id(command)
+        if not command.type.endswith('_delete') or temp_id not in added:
+            continue
+
+        related = [other for other in queued if other is not added[temp_id] and _references(other.args, temp_id)]
+        # Only drop the item if nothing but unsent commands on the item itself refer to it (e.g. no sub-task or reminder was added for it)
+        if all(_target_id(other) == temp_id and other.uuid not in sent for other in related):
+            dropped.update(other.uuid for other in [added[temp_id], *related])
+
+    stats.dropped_add_delete = len(dropped)
+    return [command for command in queued if command.uuid not in dropped]
+
+
+def coalesce_commands(queued: list[Command], sent: Collection[str] = frozenset()) -> tuple[list[Command], CoalesceStats]:
+    """
+    Remove redundant commands from a command queue
+
+    These rules are applied, while the order of all remaining commands is preserved:
+
+    - if an item that was added in the queue is deleted in the same queue, the add, the delete and all commands on the item in between are dropped,
+      unless one of them was already sent to Todoist
+    - consecutive `*_update` commands on the same item are merged into one command at the position of the last update
+    - of consecutive close/reopen (or archive/unarchive) commands on the same item only the last one is kept
+
+    Commands are consecutive if no other command on the same item is queued between them. Merged commands keep the `uuid` of the last update.
+
+    Args:
+        queued: the commands in the order they were queued
+        sent: the `uuid` of the queued commands that were sent to Todoist before, but not acknowledged
+
+    Returns:
+        The coalesced list of commands and the statistics of the pass
+    """
+    stats = CoalesceStats(before=len(queued))
+    slots: list[Command | None] = []
+    last_slot: dict[Any, int] = {}
+
+    for command in _drop_added_and_deleted(queued, sent, stats):
+        target_id = _target_id(command)
+        previous = slots[last_slot[target_id]] if target_id is not None and target_id in last_slot else None
+
+        if previous and previous.type == command.type and command.type.endswith('_update') and isinstance(previous.args, dict):
+            slots[last_slot[target_id]] = None
+            command = command.model_copy(update={
+                'args': {**previous.args, **command.args},  # type: ignore
+                'item': command.item or previous.item,
+                'is_update_command': command.is_update_command or previous.is_update_command,
+            })
+            stats.merged_updates += 1
+        elif previous and command.type in TOGGLE_GROUPS and TOGGLE_GROUPS.get(previous.type) == TOGGLE_GROUPS[command.type]:
+            slots[last_slot[target_id]] = None
+            stats.collapsed_toggles += 1
+
+        if target_id is not None:
+            last_slot[target_id] = len(slots)
+        slots.append(command)
+
+    result = [command for command in slots if command is not None]
+    stats.after = len(result)
+    return result, stats
@@ -1,2 +1,24 @@
+from typing import Any
+
+
 class TodoistError(Exception):
     """A generic error class for all API-related errors"""
+
+
+class TodoistBatchError(TodoistError):
+    """
+    Raised when Todoist rejects commands of a batch sent by `commit()`
+
+    Attributes:
+        batch_index: the zero-based index of the batch that failed
+        batch_count: the total number of batches of the commit
+        errors: the sync status entries of the failed commands
+        result: the merged response of all batches sent so far, including the failed one
+    """
+
+    def __init__(self, message: str, batch_index: int, batch_count: int, errors: list[dict[str, Any]], result: dict[str, Any]):
+        super().__init__(message)
+        self.batch_index = batch_index
+        self.batch_count = batch_count
+        self.errors = errors
+        self.result = result
@@ -0,0 +1,342 @@
+"""
+A stateful, local fake of the Todoist Sync API
+
+`FakeSyncAPI` implements the `sync`, `items/get`, `projects/get` and `completed/get_stats` endpoints: it applies commands, issues sync tokens and returns
+incremental deltas. It can add latency to every response and answer with HTTP 429, so clients can be tested and load-tested at realistic scale without the
+real API and its rate limits.
+
+Use it in-process through an httpx transport:
+
+    >>> from synctodoist import TodoistAPI
+    >>> from synctodoist.fake_server import FakeSyncAPI
+    >>> fake = FakeSyncAPI()
+    >>> fake.populate(tasks=10_000)
+    >>> api = TodoistAPI(api_key='fake', transport=fake.transport())
+
+or run it as an HTTP server and point `Settings.base_url` at it:
+
+    python -m synctodoist.fake_server --tasks 10000 --port 8080 --latency 0.05 --max-requests 1000 --period 900
+
+    >>> api = TodoistAPI(api_key='fake', base_url='http://127.0.0.1:8080/sync/v9')
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+RESOURCE_TYPES = ['projects', 'items', 'sections', 'labels', 'reminders']
+COMMAND_RESOURCES = {'project': 'projects', 'item': 'items', 'section': 'sections', 'label': 'labels', 'reminder': 'reminders'}
+
+
+class FakeSyncAPI:  # pylint: disable=too-many-instance-attributes
+    """
+    Stateful fake of the `sync`, `items/get`, `projects/get` and `completed/get_stats` endpoints
+
+    Every change bumps a version number. The sync token is the version the client has seen, so partial syncs return only the objects changed since then.
+    Like Todoist, the fake executes every command `uuid` only once: a command that is sent again, e.g. after a lost response, is answered with the status of
+    the first execution. The fake is thread-safe, so it can serve many clients at once.
+    """
+
+    def __init__(self, latency: float = 0.0, latency_jitter: float = 0.0, max_requests: int | None = None, period: float = 900.0,  # pylint: disable=too-many-arguments
+                 throttle_probability: float = 0.0, retry_after: float = 1.0, seed: int | None = None):
+        """
+        Args:
+            latency: the number of seconds every response is delayed by
+            latency_jitter: a random number of seconds between 0 and this value added to the latency of every response
+            max_requests: the number of requests allowed in `period`, like the rate limit of Todoist. Further requests are answered with HTTP 429.
+            period: the length of the rate limit period in seconds
+            throttle_probability: the probability of answering any request with HTTP 429, to simulate throttling independently of the request rate
+            retry_after: the value of the `Retry-After` header of randomly throttled responses in seconds
+            seed: the seed of the random generator used for the jitter and the random throttling
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.max_requests = max_requests
+        self.period = period
+        self.throttle_probability = throttle_probability
+        self.retry_after = retry_after
+
+        self.version = 0
+        self.next_id = 1
+        self.resources: dict[str, dict[str, dict[str, Any]]] = {resource_type: {} for resource_type in RESOURCE_TYPES}
+        self.versions: dict[str, dict[str, int]] = {resource_type: {} for resource_type in RESOURCE_TYPES}
+        self.command_statuses: dict[str, str | dict[str, Any]] = {}
+        self.temp_ids: dict[str, str] = {}
+        self.request_count = 0
+        self.throttled_count = 0
+        self._request_times: deque[float] = deque()
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+
+    def _new_id(self) -> str:
+        self.next_id += 1
+        return str(self.next_id)
+
+    def put(self, resource_type: str, obj: dict[str, Any]) -> dict[str, Any]:
+        """Store an object and mark it as changed"""
+        with self._lock:
+            self.version += 1
+            self.resources[resource_type][obj['id']] = obj
+            # Moved to the end, so the versions of a resource type are in ascending order and a delta only visits the changed objects
+            self.versions[resource_type].pop(obj['id'], None)
+            self.versions[resource_type][obj['id']] = self.version
+        return obj
+
+    def populate(self, tasks: int, projects: int = 0, seed: int = 0) -> None:
+        """
+        Generate a synthetic account
+
+        Args:
+            tasks: the number of tasks
+            projects: the number of projects, by default one per 100 tasks
+            seed: the seed of the random generator
+        """
+        rng = random.Random(seed)
+        projects = projects or max(tasks // 100, 1)
+        project_ids = [self.put('projects', {'id': self._new_id(), 'name': f'Project {i}', 'child_order': i})['id'] for i in range(projects)]
+        section_ids = [self.put('sections', {'id': self._new_id(), 'name': f'Section {i}', 'project_id': project_id})['id']
+                       for i, project_id in enumerate(project_ids)]
+        label_names = [self.put('labels', {'id': self._new_id(), 'name': f'label_{i}', 'item_order': i})['name'] for i in range(20)]
+
+        for i in range(tasks):
+            self.put('items', {
+                'id': self._new_id(), 'content': f'Task {i}', 'description': f'Description of task {i}', 'project_id': rng.choice(project_ids),
+                'section_id': rng.choice(section_ids), 'priority': rng.randint(1, 4), 'child_order': i, 'checked': False,
+                'labels': rng.sample(label_names, k=rng.randint(0, 3)), 'added_at': '2023-01-01T12:00:00Z',
+                'due': {'date': '2023-06-01', 'string': 'Jun 1', 'lang': 'en', 'is_recurring': False} if i % 3 == 0 else None,
+            })
+
+    def touch(self, resource_type: str, count: int, seed: int = 0) -> None:
+        """Change `count` random objects of a resource type, e.g. to prepare a partial sync"""
+        rng = random.Random(seed)
+        with self._lock:
+            for obj_id in rng.sample(sorted(self.resources[resource_type]), k=count):
+                self.put(resource_type, {**self.resources[resource_type][obj_id], 'description': f'changed {self.version}'})
+
+    def _apply_command(self, command: dict[str, Any], temp_id_mapping: dict[str, str]) -> str | dict[str, Any]:
+        if command['uuid'] in self.command_statuses:
+            if command.get('temp_id') in self.temp_ids:
+                temp_id_mapping[command['temp_id']] = self.temp_ids[command['temp_id']]
+            return self.command_statuses[command['uuid']]
+
+        status = self._execute_command(command, temp_id_mapping)
+        self.command_statuses[command['uuid']] = status
+        return status
+
+    def _execute_command(self, command: dict[str, Any], temp_id_mapping: dict[str, str]) -> str | dict[str, Any]:
+        prefix, _, action = command['type'].partition('_')
+        resource_type = COMMAND_RESOURCES.get(prefix)
+        if not resource_type:
+            return {'error_code': 1, 'error': f'Unknown command {command["type"]}'}
+
+        # Temp ids of earlier requests are resolved as well, so commands on an item can be sent after the response of its add was lost
+        args = {key: self.temp_ids.get(value, value) if isinstance(value, str) else value for key, value in command['args'].items()}
+        if action == 'add':
+            obj = self.put(resource_type, {**args, 'id': self._new_id()})
+            temp_id_mapping[command['temp_id']] = self.temp_ids[command['temp_id']] = obj['id']
+            return 'ok'
+
+        current = self.resources[resource_type].get(args.get('id', ''))
+        if current is None or current.get('is_deleted'):
+            return {'error_code': 22, 'error': 'Item not found'}
+
+        match action:
+            case 'delete':
+                self.put(resource_type, {**current, 'is_deleted': True})
+            case 'complete' | 'uncomplete' | 'close' | 'reopen':
+                self.put(resource_type, {**current, 'checked': action in ('complete', 'close')})
+            case 'archive' | 'unarchive':
+                self.put(resource_type, {**current, 'is_archived': action == 'archive'})
+            case _:
+                self.put(resource_type, {**current, **args})
+        return 'ok'
+
+    def _delta(self, resource_type: str, since: int) -> list[dict[str, Any]]:
+        objects = self.resources[resource_type]
+        if not since:
+            return [obj for obj in objects.values() if not obj.get('is_deleted')]
+
+        changed = []
+        for obj_id, obj_version in reversed(self.versions[resource_type].items()):
+            if obj_version <= since:
+                break
+            changed.append(objects[obj_id])
+        changed.reverse()
+        return changed
+
+    def sync(self, form: dict[str, Any]) -> dict[str, Any]:
+        """Handle a request to the `sync` endpoint"""
+        since = 0 if form.get('sync_token', '*') == '*' else int(form['sync_token'])
+        result: dict[str, Any] = {}
+
+        with self._lock:
+            if 'commands' in form:
+                temp_id_mapping: dict[str, str] = {}
+                result['sync_status'] = {command['uuid']: self._apply_command(command, temp_id_mapping) for command in form['commands']}
+                result['temp_id_mapping'] = temp_id_mapping
+
+            if 'resource_types' in form:
+                result['full_sync'] = since == 0
+                for resource_type in form['resource_types']:
+                    result[resource_type] = self._delta(resource_type, since)
+
+            result['sync_token'] = str(self.version)
+        return result
+
+    def _throttle(self) -> float | None:
+        """Count a request and return the number of seconds the client has to wait if it is throttled"""
+        with self._lock:
+            self.request_count += 1
+            now = time.monotonic()
+            while self._request_times and self._request_times[0] <= now - self.period:
+                self._request_times.popleft()
+
+            wait: float | None = None
+            if self.max_requests is not None and len(self._request_times) >= self.max_requests:
+                wait = self._request_times[0] + self.period - now
+            elif self.throttle_probability and self._rng.random() < self.throttle_probability:
+                wait = self.retry_after
+            else:
+                self._request_times.append(now)
+
+            if wait is not None:
+                self.throttled_count += 1
+            return wait
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._rng.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+
+    def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict[str, str], dict[str, Any]]:
+        """
+        Handle a request without latency
+
+        Args:
+            method: the HTTP method
+            path: the path of the URL, optionally with a query string
+            body: the form-encoded body of the request
+
+        Returns:
+            The status code, the headers and the JSON body of the response
+        """
+        if (wait := self._throttle()) is not None:
+            return 429, {'Retry-After': f'{max(wait, 0.0):.3f}'}, {'error': 'Too many requests', 'error_code': 429, 'http_code': 429}
+
+        url = urlsplit(path)
+        raw_form = parse_qs(url.query) if method == 'GET' else parse_qs(body.decode())
+        form = {key: values[0] if key == 'sync_token' else json.loads(values[0]) for key, values in raw_form.items()}
+        endpoint = url.path.rsplit('/v9/', 1)[-1]
+
+        match endpoint:
+            case 'sync':
+                return 200, {}, self.sync(form)
+            case 'items/get':
+                with self._lock:
+                    item = self.resources['items'].get(str(form['item_id']))
+                return (200, {}, {'item': item}) if item else (404, {}, {'error': 'Item not found'})
+            case 'projects/get':
+                with self._lock:
+                    project = self.resources['projects'].get(str(form['project_id']))
+                return (200, {}, {'project': project}) if project else (404, {}, {'error': 'Project not found'})
+            case 'completed/get_stats':
+                return 200, {}, {'karma': 1000, 'completed_count': 42, 'days_items': [], 'week_items': []}
+        return 404, {}, {'error': f'Unknown endpoint {endpoint}'}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Handle a request sent through `httpx.MockTransport`"""
+        if delay := self._delay():
+            time.sleep(delay)
+        status_code, headers, payload = self.dispatch(request.method, request.url.raw_path.decode(), request.read())
+        return httpx.Response(status_code, headers=headers, json=payload)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        """Handle a request sent through `httpx.MockTransport` by an async client, without blocking the event loop"""
+        if delay := self._delay():
+            await asyncio.sleep(delay)
+        status_code, headers, payload = self.dispatch(request.method, request.url.raw_path.decode(), await request.aread())
+        return httpx.Response(status_code, headers=headers, json=payload)
+
+    def transport(self) -> httpx.MockTransport:
+        """An httpx transport that sends all requests of an `httpx.Client` to this fake"""
+        return httpx.MockTransport(self.handle)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """An httpx transport that sends all requests of an `httpx.AsyncClient` to this fake"""
+        return httpx.MockTransport(self.handle_async)
+
+    def serve(self, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+        """
+        Build an HTTP server that answers requests with this fake
+
+        Start it with `serve_forever()`, e.g. in a thread, and stop it with `shutdown()`. The server handles every request in a separate thread.
+
+        Args:
+            host: the address the server listens on
+            port: the port the server listens on, or 0 to pick a free port. The port can be read from `server.server_address`.
+
+        Returns:
+            The HTTP server
+        """
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Pass every request on to the fake"""
+
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self) -> None:
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if delay := fake._delay():  # pylint: disable=protected-access
+                    time.sleep(delay)
+                status_code, headers, payload = fake.dispatch(self.command, self.path, body)
+                content = json.dumps(payload).encode()
+                self.send_response(status_code)
+                for name, value in {**headers, 'Content-Type': 'application/json', 'Content-Length': str(len(content))}.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+                pass
+
+        return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the fake Sync API as an HTTP server"""
+    parser = argparse.ArgumentParser(description='Run a local fake of the Todoist Sync API')
+    parser.add_argument('--host', default='127.0.0.1', help='the address the server listens on')
+    parser.add_argument('--port', type=int, default=8080, help='the port the server listens on')
+    parser.add_argument('--tasks', type=int, default=1000, help='the number of tasks of the synthetic account')
+    parser.add_argument('--latency', type=float, default=0.0, help='the number of seconds every response is delayed by')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='the maximum random number of seconds added to the latency')
+    parser.add_argument('--max-requests', type=int, default=None, help='the number of requests allowed per period before answering with HTTP 429')
+    parser.add_argument('--period', type=float, default=900.0, help='the length of the rate limit period in seconds')
+    parser.add_argument('--throttle-probability', type=float, default=0.0, help='the probability of answering any request with HTTP 429')
+    args = parser.parse_args(argv)
+
+    fake = FakeSyncAPI(latency=args.latency, latency_jitter=args.latency_jitter, max_requests=args.max_requests, period=args.period,
+                       throttle_probability=args.throttle_probability)
+    fake.populate(tasks=args.tasks)
+    server = fake.serve(args.host, args.port)
+    print(f'Fake Todoist Sync API listening on http://{args.host}:{server.server_port}/sync/v9')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
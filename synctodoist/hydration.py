@@ -0,0 +1,220 @@
+import gc
+import random
+from contextlib import contextmanager
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from types import UnionType
+from typing import Any, Callable, Generic, Iterator, Type, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from synctodoist.models import HydrationEnum
+
+TModel = TypeVar('TModel', bound=BaseModel)  # pylint: disable=invalid-name
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector while many objects are created at once
+
+    Hydrating a large cache allocates hundreds of thousands of container objects, and without pausing the collector a large part of the time is spent in
+    collections that cannot free anything.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        # datetime.fromisoformat() only accepts the Z suffix that Todoist uses for UTC since Python 3.11
+        return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    return value
+
+
+def _parse_date(value: Any) -> Any:
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+
+def _parse_date_or_datetime(value: Any) -> Any:
+    if isinstance(value, str) and len(value) == 10:
+        return date.fromisoformat(value)
+    return _parse_datetime(value)
+
+
+def _differs(value: Any, other: Any) -> bool:
+    # The types are compared as well, because e.g. 1 == True, but validation would have converted the 1
+    return type(value) is not type(other) or value != other
+
+
+def _field_converter(annotation: Any, from_json: bool = False) -> Callable[[Any], Any] | None:
+    candidates = get_args(annotation) if get_origin(annotation) in (Union, UnionType) else (annotation,)
+    for candidate in candidates:
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            nested = trusted_constructor(candidate, from_json)
+            return lambda value: nested(value) if isinstance(value, dict) else value
+        if isinstance(candidate, type) and issubclass(candidate, Enum):
+            enum = candidate
+            return lambda value: enum(value) if value is not None else value
+
+    if from_json and datetime in candidates:
+        return _parse_date_or_datetime if date in candidates else _parse_datetime
+    if from_json and date in candidates:
+        return _parse_date
+    return None
+
+
+@lru_cache(maxsize=None)
+def trusted_constructor(model: Type[TModel], from_json: bool = False) -> Callable[[dict[str, Any]], TModel]:
+    """
+    Build a function that creates instances of a model from data that is known to be valid, without validating it
+
+    The function is compiled once per model. It sets the state of the instance directly, like `model_construct`, but without looking up the fields and
+    their defaults for every instance, which makes it several times faster than validation. Nested models and enums are converted with the class of their
+    field, and all other values are used as they are. Only use it for data this library wrote itself, or check it with a `Hydrator` in sampled mode.
+
+    Args:
+        model: the pydantic model class
+        from_json: set to `True` if the data was decoded from JSON: the keys are then looked up by alias like in validation, unknown keys are dropped,
+            and date and time strings are parsed. Otherwise date and time values must already be `date`/`datetime` objects.
+
+    Returns:
+        A function that takes the field values by name and returns a model instance. Unless `from_json` is set, the values must only hold fields of the
+        model.
+
+    Raises:
+        ValueError: (raised by the returned function) if `from_json` is set and a required field is missing, or a date or time string cannot be parsed
+    """
+    fields = model.model_fields
+    # Required fields and fields with a default factory get a placeholder, so the state keeps the order of the fields
+    template = {name: None if field.default_factory or field.is_required() else field.default for name, field in fields.items()}
+    factories = {name: field.default_factory for name, field in fields.items() if field.default_factory is not None}
+    converters = {name: converter for name, field in fields.items() if (converter := _field_converter(field.annotation, from_json))}
+    required = frozenset(name for name, field in fields.items() if field.is_required())
+    names = {name: name for name, field in fields.items() if not field.alias or model.model_config.get('populate_by_name')}
+    names.update({field.alias: name for name, field in fields.items() if field.alias})
+    unchanged_keys = frozenset(key for key, name in names.items() if key == name)
+    new = model.__new__
+    set_attribute = object.__setattr__
+
+    def construct(values: dict[str, Any]) -> TModel:
+        if from_json:
+            # Caches written by this library only hold field names, which can be copied as they are
+            values = values.copy() if values.keys() <= unchanged_keys else {names[key]: value for key, value in values.items() if key in names}
+            if not required <= values.keys():
+                raise ValueError(f'{model.__name__} is missing required fields: {", ".join(sorted(required - values.keys()))}')
+
+        for name, converter in converters.items():
+            if name in values:
+                values[name] = converter(values[name])
+
+        state = template.copy()
+        state.update(values)
+        for name, factory in factories.items():
+            if name not in values:
+                state[name] = factory()  # type: ignore
+
+        instance = new(model)
+        set_attribute(instance, '__dict__', state)
+        set_attribute(instance, '__pydantic_fields_set__', set(values))
+        set_attribute(instance, '__pydantic_extra__', None)
+        set_attribute(instance, '__pydantic_private__', None)
+        return instance
+
+    return construct
+
+
+@lru_cache(maxsize=None)
+def _factory_fields(model: Type[BaseModel]) -> tuple[str, ...]:
+    return tuple(name for name, field in model.model_fields.items() if field.default_factory is not None)
+
+
+def replace_state(instance: TModel, source: TModel) -> dict[str, Any]:
+    """
+    Give an existing model instance the field values of another instance of the same model, so all references to it see the new values
+
+    Fields with a default factory that are not set in `source`, such as `temp_id`, keep their value, because `source` only got a new random one.
+
+    Args:
+        instance: the instance to update
+        source: the instance with the new values, which must not be used afterwards
+
+    Returns:
+        The previous field values of `instance`
+    """
+    previous = instance.__dict__
+    state = source.__dict__
+    for name in _factory_fields(type(instance)):
+        if name not in source.__pydantic_fields_set__:
+            state[name] = previous[name]
+
+    object.__setattr__(instance, '__dict__', state)
+    object.__setattr__(instance, '__pydantic_fields_set__', source.__pydantic_fields_set__)
+    return previous
+
+
+class Hydrator(Generic[TModel]):
+    """
+    Create model instances from decoded JSON data, as set by the `hydration` setting
+
+    In `validate` mode every item is validated by pydantic. In `trusted` mode the items are created by `trusted_constructor()`, and only items it cannot
+    handle (e.g. a date in an unexpected format) are validated. `sampled` mode works like `trusted` mode, but validates a random share of the items and
+    compares the results: after the first difference, all remaining items of the batch are validated.
+
+    Create one hydrator per batch, e.g. per resource type in a sync or a cache load.
+    """
+
+    def __init__(self, model: Type[TModel], mode: HydrationEnum = HydrationEnum.validate, sample_rate: float = 0.0):
+        """
+        Args:
+            model: the pydantic model class
+            mode: the hydration mode
+            sample_rate: the share of items validated in `sampled` mode
+        """
+        self.model = model
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.sampled = 0
+        self.mismatches = 0
+        self._construct: Callable[[dict[str, Any]], TModel] = trusted_constructor(model, from_json=True)
+        # Fields with a default factory (e.g. `temp_id`) get a new value in every instance, so they cannot be compared
+        self._compared_fields = [name for name, field in model.model_fields.items() if field.default_factory is None]
+
+    def __call__(self, values: dict[str, Any]) -> TModel:
+        """
+        Args:
+            values: the data of one item, keyed like in the Todoist API
+
+        Returns:
+            A model instance
+        """
+        if self.mode == HydrationEnum.validate:
+            return self.model(**values)
+        if self.mode == HydrationEnum.sampled and random.random() < self.sample_rate:  # nosec
+            return self._sample(values)
+
+        try:
+            return self._construct(values)
+        except (TypeError, ValueError):
+            return self.model(**values)
+
+    def _sample(self, values: dict[str, Any]) -> TModel:
+        self.sampled += 1
+        validated = self.model(**values)
+        try:
+            trusted = self._construct(values)
+        except (TypeError, ValueError):
+            trusted = None
+
+        if trusted is None or any(_differs(getattr(trusted, name), getattr(validated, name)) for name in self._compared_fields):
+            self.mismatches += 1
+            self.mode = HydrationEnum.validate
+        return validated
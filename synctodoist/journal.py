@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+from synctodoist.models import Command
+
+
+class CommandJournal:
+    """
+    Append-only journal of the pending command queue
+
+    Every command added to the queue is appended to the journal before `commit()` sends it, and every batch sent to Todoist is recorded before and after
+    the request. When the journal is replayed, all commands that were not acknowledged by Todoist are put back into the queue with their original `uuid`,
+    so commands that reached Todoist right before a crash are not executed twice.
+
+    The journal is one JSON document per line with these events:
+
+    - `add`: a command was queued
+    - `sent`: a batch of commands was sent to Todoist
+    - `ack`: Todoist acknowledged the commands of a batch (successfully or with an error)
+    """
+
+    def __init__(self, path: Path, fsync: bool = True):
+        """
+        Args:
+            path: the journal file
+            fsync: set to `False` to skip flushing every record to disk (faster, but records may be lost if the machine crashes)
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+    def _append(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open('a', encoding='utf-8') as journal_fp:
+                journal_fp.write(json.dumps(record, default=str) + '\n')
+                journal_fp.flush()
+                if self.fsync:
+                    os.fsync(journal_fp.fileno())
+
+    def record_add(self, command: Command) -> None:
+        """Record a command that was added to the queue"""
+        self._append({'event': 'add', 'command': command.dict(exclude_none=True)})
+
+    def record_sent(self, uuids: Iterable[str]) -> None:
+        """Record a batch of commands right before it is sent to Todoist"""
+        self._append({'event': 'sent', 'uuids': list(uuids)})
+
+    def record_acknowledged(self, sync_status: dict[str, Any]) -> None:
+        """Record the status Todoist returned for a batch of commands"""
+        self._append({'event': 'ack', 'sync_status': sync_status})
+
+    def _read(self) -> tuple[dict[str, Command], set[str]]:
+        pending: dict[str, Command] = {}
+        sent: set[str] = set()
+        if not self.path.exists():
+            return pending, sent
+
+        with self._lock, self.path.open('r', encoding='utf-8') as journal_fp:
+            for line in journal_fp:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line is left behind if the process crashed while appending
+                    continue
+
+                match record.get('event'):
+                    case 'add':
+                        command = Command(**record['command'])
+                        pending[command.uuid] = command
+                    case 'sent':
+                        sent.update(record['uuids'])
+                    case 'ack':
+                        for uuid in record['sync_status']:
+                            pending.pop(uuid, None)
+
+        return pending, sent & pending.keys()
+
+    def replay(self) -> list[Command]:
+        """
+        Read the commands that were not acknowledged by Todoist
+
+        Returns:
+            The pending commands in the order they were added
+        """
+        pending, _ = self._read()
+        return list(pending.values())
+
+    def replay_sent(self) -> set[str]:
+        """
+        Read the commands that were sent to Todoist, but not acknowledged
+
+        Returns:
+            The `uuid` of the pending commands that may have been executed by Todoist already
+        """
+        _, sent = self._read()
+        return sent
+
+    def compact(self, pending: Iterable[Command], sent: Iterable[str] = ()) -> None:
+        """
+        Replace the journal with one that only holds the pending commands
+
+        Args:
+            pending: the commands that are still waiting to be committed
+            sent: the `uuid` of the pending commands that were sent to Todoist, but not acknowledged
+        """
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            with temp_path.open('w', encoding='utf-8') as journal_fp:
+                for command in pending:
+                    journal_fp.write(json.dumps({'event': 'add', 'command': command.dict(exclude_none=True)}, default=str) + '\n')
+                if sent := list(sent):
+                    journal_fp.write(json.dumps({'event': 'sent', 'uuids': sent}) + '\n')
+                journal_fp.flush()
+                if self.fsync:
+                    os.fsync(journal_fp.fileno())
+            os.replace(temp_path, self.path)
@@ -0,0 +1,173 @@
+"""
+Lazily materialized items of a manager
+
+In lazy store mode, a manager keeps the items it received from Todoist or read from a cache as raw records, and only turns them into model instances when
+they are accessed. The model instances are cached in a least-recently-used cache of a bounded size, so a process that only ever touches a handful of items
+never holds a model instance for the others.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, Mapping, MutableMapping, Type, TypeVar
+
+from pydantic import BaseModel
+
+from synctodoist.hydration import replace_state
+
+TModel = TypeVar('TModel', bound=BaseModel)  # pylint: disable=invalid-name
+
+
+class LazyItems(MutableMapping[str, TModel]):  # pylint: disable=too-many-instance-attributes
+    """
+    A mapping of item ids to model instances that are created on first access
+
+    The values are stored either as raw records (dicts keyed like in the Todoist API or by field name) or as model instances. Model instances that are
+    stored directly, e.g. items fetched one by one, are kept as they are. Records are turned into model instances by `hydrate` when they are accessed, and
+    the last `max_materialized` instances are cached.
+
+    Important:
+        An instance that was evicted from the cache is created again from its record on the next access, so changes made directly to an instance are
+        lost after its eviction. Use the `update` methods of the API to change items.
+    """
+
+    def __init__(self, model: Type[TModel], hydrate: Callable[[dict[str, Any]], TModel], max_materialized: int = 1000,
+                 records: Mapping[str, dict[str, Any] | TModel] | None = None):
+        """
+        Args:
+            model: the model class of the items
+            hydrate: the function that creates a model instance from a record
+            max_materialized: the maximum number of model instances that are cached
+            records: the initial records by id
+        """
+        self.model = model
+        self.max_materialized = max_materialized
+        self._hydrate = hydrate
+        self._records: dict[str, dict[str, Any] | TModel] = dict(records or {})
+        self._materialized: OrderedDict[str, TModel] = OrderedDict()
+        # Reading an item updates the cache of model instances, so readers in several threads need the lock, too
+        self._lock = threading.RLock()
+        self._keys = {name: (field.alias or name, name) for name, field in model.model_fields.items()}
+        self._defaults = {name: field.get_default(call_default_factory=False) for name, field in model.model_fields.items()}
+
+    def __getitem__(self, key: str) -> TModel:
+        with self._lock:
+            if (item := self._materialized.get(key)) is not None:
+                self._materialized.move_to_end(key)
+                return item
+
+            record = self._records[key]
+            if isinstance(record, BaseModel):
+                return record  # type: ignore
+
+            item = self._hydrate(record)
+            self._materialized[key] = item
+            if len(self._materialized) > self.max_materialized:
+                self._materialized.popitem(last=False)
+            return item
+
+    def __setitem__(self, key: str, value: dict[str, Any] | TModel) -> None:  # type: ignore[override]
+        with self._lock:
+            self._records[key] = value
+            self._materialized.pop(key, None)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            del self._records[key]
+            self._materialized.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
+    def keys(self):  # type: ignore[override]
+        return self._records.keys()
+
+    def copy(self) -> 'LazyItems[TModel]':
+        """
+        Copy the mapping, e.g. to change the copy while readers keep using the original
+
+        Returns:
+            A LazyItems instance with the same records, which shares the cached model instances of this one
+        """
+        with self._lock:
+            items = LazyItems(self.model, self._hydrate, self.max_materialized, self._records)
+            items._materialized = OrderedDict(self._materialized)  # pylint: disable=protected-access
+        return items
+
+    def update_record(self, key: str, record: dict[str, Any]) -> None:
+        """
+        Replace the record of an item, and update its model instance in place if it is materialized
+
+        Args:
+            key: the id of the item
+            record: the new record
+        """
+        stored = self._records.get(key)
+        if isinstance(stored, BaseModel):
+            # Model instances that were stored directly are kept as they are
+            replace_state(stored, self._hydrate(record))
+            return
+
+        with self._lock:
+            self._records[key] = record
+            item = self._materialized.get(key)
+        if item is not None:
+            replace_state(item, self._hydrate(record))
+
+    @property
+    def materialized_count(self) -> int:
+        """The number of model instances currently cached"""
+        return len(self._materialized)
+
+    def peek(self, key: str) -> TModel | dict[str, Any]:
+        """
+        Get an item without creating a model instance for it
+
+        Args:
+            key: the id of the item
+
+        Returns:
+            The model instance of the item if it exists, otherwise its record
+        """
+        return self._materialized.get(key) or self._records[key]
+
+    def field(self, key: str, name: str) -> Any:
+        """
+        Get the value of a field of an item without creating a model instance for it
+
+        The value is taken from the record as it is, so e.g. dates are returned as strings if the record was decoded from JSON.
+
+        Args:
+            key: the id of the item
+            name: the name of the field
+
+        Returns:
+            The value of the field, or its default if the record does not contain it
+        """
+        record = self.peek(key)
+        if isinstance(record, BaseModel):
+            return getattr(record, name)
+
+        alias, field_name = self._keys[name]
+        if alias in record:
+            return record[alias]
+        return record.get(field_name, self._defaults[name])
+
+    def record(self, key: str) -> dict[str, Any]:
+        """
+        Get an item as a dict that can be stored in a cache
+
+        Args:
+            key: the id of the item
+
+        Returns:
+            The fields of the model instance without `None` values if the item is materialized, otherwise its record
+        """
+        record = self.peek(key)
+        if isinstance(record, BaseModel):
+            return record.dict(exclude_none=True)
+        return record
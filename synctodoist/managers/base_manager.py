@@ -3,46 +3,74 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Iterable, Any, TYPE_CHECKING, TypeVar, Generic, Type
-
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Collection, Hashable, Iterable, Iterator, Any, Mapping, MutableMapping, TYPE_CHECKING, TypeVar, Generic, Type
+
+from synctodoist import binary_cache, tracing
+from synctodoist.cache_files import atomic_write
+from synctodoist.cache_store import CacheChanges
+from synctodoist.change_feed import ChangeEvent
 from synctodoist.exceptions import TodoistError
-from synctodoist.managers import command_manager
-from synctodoist.models import TodoistBaseModel, Settings
+from synctodoist.hydration import Hydrator, paused_gc, replace_state
+from synctodoist.lazy_store import LazyItems
+from synctodoist.models import TodoistBaseModel, Settings, CacheBackendEnum, CacheReloadEnum, ChangeKindEnum, ResourceChanges
 
-if TYPE_CHECKING:
-    pass
+if TYPE_CHECKING:  # pragma: no cover
+    from synctodoist.managers.command_manager import CommandManager
 
 TBaseModel = TypeVar('TBaseModel', bound=TodoistBaseModel)  # pylint: disable=invalid-name
 
 
-class BaseManager(Generic[TBaseModel]):
-    """Base manager"""
-    _items: dict[str, TBaseModel]
-    _instances: dict[Type[TBaseModel], Any] = {}
+class BaseManager(Generic[TBaseModel]):  # pylint: disable=too-many-instance-attributes
+    """
+    Base manager
+
+    A manager can be shared by several threads. The published `_items` mapping is never changed: writers apply their changes to a copy under `_lock` and
+    replace `_items` with it when they are done, so readers iterate a consistent set of items without locking. The copy is only made once something is
+    changed, so a sync without changes of a manager does not copy its items.
+
+    Important:
+        Only the mapping is copied, not the items. An updated item is changed in place, so references held by the application see the new values, and
+        this includes the items of a snapshot taken before the sync. Every item shows either all its values before or all its values after an update,
+        but while a sync is applied, a reader may see some items of the snapshot updated and others not yet.
+    """
+    _items: MutableMapping[str, TBaseModel]
+    _staged_items: MutableMapping[str, TBaseModel] | None
+    _publish_depth: int
+    _changed_ids: set[str]
+    _deleted_ids: set[str]
+    _replace_all: bool
+    _cache_generation: Hashable | None
     model: Type[TBaseModel]
     settings: Settings
+    command_manager: CommandManager
 
-    def __new__(cls, model: Type[TBaseModel], settings: Settings | None = None, **kwargs):  # pylint: disable=unused-argument
-        if model not in cls._instances:
-            cls._instances[model] = super().__new__(cls)
-            cls._instances[model].settings = settings
-            cls._instances[model].model = model
-
-        return cls._instances.get(model)
-
-    def __init__(self, settings: Settings | None = None):
-        if not hasattr(self, '_items'):
-            self._items = {}
-
-        if not hasattr(self, 'settings') and settings:
-            self.settings = settings
+    def __init__(self, settings: Settings, command_manager: CommandManager):
+        """
+        Args:
+            settings: the settings of the account
+            command_manager: the command manager of the account, which queues the commands of the manager
+        """
+        self.settings = settings
+        self.command_manager = command_manager
+        self._items = {}
+        self._staged_items = None
+        self._publish_depth = 0
+        self._lock = threading.RLock()
+        self._cache_generation = None
+        self._clear_cache_changes()
 
     # region Pass-through to dict
     def _dict_get(self, __key: str, default: Any) -> TBaseModel | None:
         return self._items.get(__key, default)
 
-    def _dict_update(self, _m: dict[str, TBaseModel], **kwargs) -> None:
-        return self._items.update(_m, **kwargs)
+    def _dict_update(self, _m: Mapping[str, TBaseModel | dict[str, Any]], **kwargs) -> None:
+        with self._changing() as items:
+            self._changed_ids.update(_m, kwargs)
+            self._deleted_ids.difference_update(_m, kwargs)
+            return items.update(_m, **kwargs)  # type: ignore
 
     def _dict_values(self) -> Iterable[TBaseModel]:
         return self._items.values()
@@ -56,6 +84,33 @@ class BaseManager(Generic[TBaseModel]):
     # endregion
 
     # region Private methods
+    @contextmanager
+    def _publishing(self) -> Iterator[None]:
+        # The changes staged by `_changing()` are published when the outermost block ends, even if it failed half way, like in-place changes would have
+        # been. A whole sync is applied in one block, so readers see the added and deleted items of a sync all at once (see the class docstring for updates).
+        with self._lock:
+            self._publish_depth += 1
+            try:
+                yield
+            finally:
+                self._publish_depth -= 1
+                if not self._publish_depth and self._staged_items is not None:
+                    self._items, self._staged_items = self._staged_items, None
+
+    @contextmanager
+    def _changing(self) -> Iterator[MutableMapping[str, TBaseModel]]:
+        # Changes are staged on a copy of the items, which is made by the first change of a `_publishing()` block
+        with self._publishing():
+            if self._staged_items is not None:
+                yield self._staged_items
+                return
+
+            if self.settings.lazy_store and not isinstance(self._items, LazyItems):
+                self._staged_items = self._lazy_items(self._items)
+            else:
+                self._staged_items = self._items.copy()  # type: ignore[attr-defined]
+            yield self._staged_items
+
     def _extract_params(self, item: str | int | TBaseModel) -> tuple[dict[str, Any], str]:
         params: dict[str, Any] = {}
         match item:
@@ -75,41 +130,233 @@ class BaseManager(Generic[TBaseModel]):
                 raise TodoistError('task has to be a Task object, a str or an int')
         return params, item_id
 
-    def _remove_deleted(self, received: list[Any], full_sync: bool = False):
-        received_keys = {x['id'] for x in received}
-        result: dict[str, TBaseModel] = {}
-
-        if full_sync:
-            for key, value in self._items.items():
-                if key in received_keys:
-                    result[key] = value
-        else:
-            result = {key: value for key, value in self._items.items() if not getattr(value, 'is_deleted', False)}
-
-        self._items = result
-
-    def _read_cache(self):
-        cache_file = self.settings.cache_dir / f'todoist_{self.model.TodoistConfig.cache_label}.json'
-        if not cache_file.exists():
+    def _apply_record(self, record: dict[str, Any], hydrate: Hydrator[TBaseModel], changes: ResourceChanges, events: list[ChangeEvent] | None = None) -> None:
+        # Applies one item of a sync response without touching the other items, so a partial sync costs O(changed items) besides one copy of the items
+        with self._changing() as items:
+            key = record['id']
+            label = self.model.TodoistConfig.cache_label
+            if record.get('is_deleted'):
+                if key in items:
+                    if events is not None:
+                        events.append(ChangeEvent(label, ChangeKindEnum.deleted, key, old=self._item_state(key)))
+                    del items[key]
+                    self._deleted_ids.add(key)
+                    self._changed_ids.discard(key)
+                    changes.deleted.append(key)
+                return
+
+            old = None
+            if key not in items:
+                items[key] = self._hydrate(record, hydrate)  # type: ignore
+                changes.added.append(key)
+            elif isinstance(items, LazyItems):
+                if events is not None:
+                    old = self._item_state(key)
+                items.update_record(key, record)
+                changes.updated.append(key)
+            else:
+                # Updated in place, so references to the item held by the application see the new values
+                old = replace_state(items[key], hydrate(record))
+                changes.updated.append(key)
+            self._changed_ids.add(key)
+            self._deleted_ids.discard(key)
+
+            if events is not None:
+                item = items[key]
+                events.append(ChangeEvent(label, ChangeKindEnum.updated if old is not None else ChangeKindEnum.added, key, item=item, old=old,
+                                          new=dict(item.__dict__)))
+
+    def _remove_deleted(self, received_ids: Collection[str], changes: ResourceChanges, events: list[ChangeEvent] | None = None) -> None:
+        # A full sync only returns the items that still exist
+        label = self.model.TodoistConfig.cache_label
+        with tracing.span('sync.remove_deleted', resource=label, full_sync=True) as span, self._changing() as items:
+            removed_ids = [key for key in items if key not in received_ids]
+            span.set_attribute('removed_count', len(removed_ids))
+            for key in removed_ids:
+                if events is not None:
+                    events.append(ChangeEvent(label, ChangeKindEnum.deleted, key, old=self._item_state(key)))
+                del items[key]
+            self._deleted_ids.update(removed_ids)
+            self._changed_ids.difference_update(removed_ids)
+            self._replace_all = True
+            changes.deleted.extend(removed_ids)
+
+    def _item_state(self, key: str) -> dict[str, Any]:
+        # A copy of the field values, so they are not changed by later updates of the item. Lazy items are materialized for it.
+        items = self._items if self._staged_items is None else self._staged_items
+        return dict(items[key].__dict__)
+
+    def _api_get_data(self, item_id: int | str) -> dict[str, Any]:  # pylint: disable=unused-argument
+        raise TodoistError(f'{self.model} does not support the get method without syncing. Please, sync your API first.')
+
+    def _api_get_result(self, result: Any) -> TBaseModel:  # pylint: disable=unused-argument
+        raise TodoistError(f'{self.model} does not support the get method without syncing. Please, sync your API first.')
+
+    def _lazy_items(self, records: Mapping[str, Any] | None = None) -> LazyItems[TBaseModel]:
+        return LazyItems(self.model, self._hydrator(), self.settings.lazy_store_size, records)
+
+    def _hydrate(self, values: dict[str, Any], hydrate: Hydrator[TBaseModel]) -> TBaseModel | dict[str, Any]:
+        # In lazy store mode the record is kept as it is until the item is accessed
+        items = self._items if self._staged_items is None else self._staged_items
+        return values if isinstance(items, LazyItems) else hydrate(values)
+
+    def _item_field(self, key: str, name: str) -> Any:
+        items = self._items
+        if isinstance(items, LazyItems):
+            return items.field(key, name)
+        return getattr(items[key], name)
+
+    def _item_record(self, key: str) -> dict[str, Any]:
+        items = self._items
+        if isinstance(items, LazyItems):
+            return items.record(key)
+        return items[key].dict(exclude_none=True)
+
+    def _clear_cache_changes(self) -> None:
+        self._changed_ids = set()
+        self._deleted_ids = set()
+        self._replace_all = False
+
+    def _cache_changes(self) -> CacheChanges:
+        with self._lock:
+            if self._replace_all:
+                upserted_ids: Iterable[str] = self._items.keys()
+            else:
+                upserted_ids = self._changed_ids & self._items.keys()
+            return CacheChanges(upserted={key: self._item_record(key) for key in upserted_ids}, deleted=set(self._deleted_ids),
+                                replace_all=self._replace_all)
+
+    def _hydrator(self) -> Hydrator[TBaseModel]:
+        return Hydrator(self.model, self.settings.hydration, self.settings.hydration_sample_rate)
+
+    def _record_hydration(self, hydrator: Hydrator[TBaseModel]) -> None:
+        if hydrator.sampled:
+            label = self.model.TodoistConfig.cache_label
+            self.command_manager.metrics.increment(f'hydration.sampled.{label}', hydrator.sampled)
+            self.command_manager.metrics.increment(f'hydration.mismatches.{label}', hydrator.mismatches)
+
+    def _cache_file(self, backend: CacheBackendEnum | None = None) -> Path:
+        suffix = 'msgpack' if (backend or self.settings.cache_backend) == CacheBackendEnum.binary else 'json'
+        return self.settings.account_cache_dir / f'todoist_{self.model.TodoistConfig.cache_label}.{suffix}'
+
+    def _stored_cache_generation(self) -> Hashable | None:
+        # Read before the cache itself, so a concurrent write can only cause an unnecessary reload, never a missed one
+        if self.command_manager.cache_store:
+            return self.command_manager.cache_store.generation(self.model.TodoistConfig.todoist_resource_type)
+
+        try:
+            stat = self._cache_file().stat()
+        except FileNotFoundError:
+            return None
+        return str(self._cache_file()), stat.st_mtime_ns, stat.st_size
+
+    def _read_cache(self, force: bool = False):
+        with self._lock:
+            if self.settings.lazy_store and not isinstance(self._items, LazyItems):
+                self._items = self._lazy_items(self._items)
+            if self.settings.cache_backend == CacheBackendEnum.binary:
+                self._migrate_json_cache()
+
+            generation = self._stored_cache_generation()
+            if not force:
+                match self.settings.cache_reload:
+                    case CacheReloadEnum.changed if generation == self._cache_generation:
+                        self.command_manager.metrics.increment(f'cache.reload_skipped.{self.model.TodoistConfig.cache_label}')
+                        return
+                    case CacheReloadEnum.never if self._cache_generation is not None:
+                        return
+
+            if self.command_manager.cache_store:
+                self._read_sqlite_cache()
+            elif generation is not None and self.settings.cache_backend == CacheBackendEnum.binary:
+                self._read_binary_cache()
+            elif generation is not None:
+                self._read_json_cache()
+            self._cache_generation = generation
+
+    def _migrate_json_cache(self):
+        json_cache_file = self._cache_file(CacheBackendEnum.json)
+        if self._cache_file().exists() or not json_cache_file.exists():
             return
 
-        with cache_file.open('r', encoding='utf-8') as cache_fp:
-            cache = json.load(cache_fp)
-
-        self._items = {key: self.model(**value) for key, value in cache['data'].items()}
+        with tracing.span('cache.migrate', resource=self.model.TodoistConfig.cache_label):
+            self._read_json_cache(json_cache_file)
+            self._write_cache()
+            # Another process sharing the cache directory may have migrated it at the same time
+            json_cache_file.unlink(missing_ok=True)
+
+    def _read_json_cache(self, cache_file: Path | None = None):
+        label = self.model.TodoistConfig.cache_label
+        with tracing.span('cache.read', resource=label) as span, self.command_manager.metrics.timer(f'cache.read.{label}'):
+            with (cache_file or self._cache_file()).open('r', encoding='utf-8') as cache_fp:
+                cache = json.load(cache_fp)
+                span.set_attribute('bytes', cache_fp.tell())
+
+            self._items = self._load_records(cache['data'])
+            self._clear_cache_changes()
+            span.set_attribute('item_count', len(self._items))
+
+    def _read_binary_cache(self):
+        label = self.model.TodoistConfig.cache_label
+        with tracing.span('cache.read', resource=label, backend='binary') as span, self.command_manager.metrics.timer(f'cache.read.{label}'):
+            try:
+                if self.settings.lazy_store:
+                    self._items = self._lazy_items(binary_cache.load(self._cache_file(), self.model, materialize=False))
+                else:
+                    self._items = binary_cache.load(self._cache_file(), self.model)  # type: ignore
+            except binary_cache.CacheFormatError:
+                # The cache was written by an incompatible version, so it is rebuilt by a full sync
+                self._items = {}
+                self.command_manager.sync_token = '*'  # nosec
+            self._clear_cache_changes()
+            span.set_attribute('item_count', len(self._items))
+
+    def _read_sqlite_cache(self):
+        label = self.model.TodoistConfig.cache_label
+        with tracing.span('cache.read', resource=label, backend='sqlite') as span, self.command_manager.metrics.timer(f'cache.read.{label}'):
+            cache = self.command_manager.cache_store.load(self.model.TodoistConfig.todoist_resource_type)  # type: ignore
+            self._items = self._load_records(cache)
+            self._clear_cache_changes()
+            span.set_attribute('item_count', len(self._items))
+
+    def _load_records(self, records: dict[str, dict[str, Any]]) -> MutableMapping[str, TBaseModel]:
+        if self.settings.lazy_store:
+            return self._lazy_items(records)
+
+        hydrate = self._hydrator()
+        with paused_gc():
+            items = {key: hydrate(value) for key, value in records.items()}
+        self._record_hydration(hydrate)
+        return items
 
     def _write_cache(self):
-        if not self.settings.cache_dir.exists():
-            self.settings.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if not (self._changed_ids or self._deleted_ids or self._replace_all) and self._cache_generation is not None \
+                    and self._stored_cache_generation() == self._cache_generation:
+                # The file on disk already holds exactly these items
+                return
+
+            label = self.model.TodoistConfig.cache_label
+            cache_file = self._cache_file()
+            with tracing.span('cache.write', resource=label, item_count=len(self._items)) as span, self.command_manager.metrics.timer(f'cache.write.{label}'):
+                if self.settings.cache_backend == CacheBackendEnum.binary:
+                    items: Mapping[str, TBaseModel | dict[str, Any]] = self._items
+                    if isinstance(items, LazyItems):
+                        # Items that are not materialized are written from their records, so the write creates no model instance
+                        items = {key: items.peek(key) for key in items}
+                    span.set_attribute('bytes', binary_cache.dump(cache_file, label, self.model, items, fsync=self.settings.cache_fsync))
+                else:
+                    cache = {
+                        'name': label,
+                        'data': {key: self._item_record(key) for key in self._items}
+                    }
 
-        cache_file = self.settings.cache_dir / f'todoist_{self.model.TodoistConfig.cache_label}.json'
-        cache = {
-            'name': self.model.TodoistConfig.cache_label,
-            'data': {key: value.dict(exclude_none=True) for key, value in self._items.items()}
-        }
+                    with atomic_write(cache_file, 'w', fsync=self.settings.cache_fsync, encoding='utf-8') as cache_fp:
+                        json.dump(cache, cache_fp, default=str)
+                        span.set_attribute('bytes', cache_fp.tell())
 
-        with cache_file.open('w', encoding='utf-8') as cache_fp:
-            json.dump(cache, cache_fp, default=str)
+            self._clear_cache_changes()
+            self._cache_generation = self._stored_cache_generation()
 
     # endregion
 
@@ -131,6 +378,26 @@ class BaseManager(Generic[TBaseModel]):
 
         return None
 
+    async def get_async(self, item_id: int | str) -> TBaseModel | None:
+        """Get item by id without blocking the event loop
+
+        If the item is not available locally and the model supports it, the item is fetched through `httpx.AsyncClient`.
+
+        Args:
+            item_id: the id of the item
+
+        Returns:
+            A TodoistBaseModel instance with all item details
+        """
+        if item := BaseManager.get(self, item_id=item_id):
+            return item
+
+        try:
+            result = await self.command_manager.post_async(self._api_get_data(item_id), self.model.TodoistConfig.api_get)
+            return self._api_get_result(result)
+        except Exception as ex:
+            raise TodoistError(f'{self.model.__name__} {item_id} not found') from ex
+
     def find(self, pattern: str, field: str = 'name', return_all: bool = False) -> TBaseModel | list[TBaseModel]:
         """Get an item if its field matches a regex pattern
 
@@ -146,12 +413,19 @@ class BaseManager(Generic[TBaseModel]):
         """
         items: list[TBaseModel] = []
         compiled_pattern = re.compile(pattern=pattern)
-        for item in self._items.values():
-            if compiled_pattern.findall(getattr(item, field)):
-                if not return_all:
-                    return item
+        # A snapshot, which is never changed by a concurrent sync
+        snapshot = self._items
+        if isinstance(snapshot, LazyItems):
+            # Only the matching items are materialized
+            matches: Iterable[TBaseModel] = (snapshot[key] for key in snapshot if compiled_pattern.findall(snapshot.field(key, field)))
+        else:
+            matches = (item for item in snapshot.values() if compiled_pattern.findall(getattr(item, field)))
+
+        for item in matches:
+            if not return_all:
+                return item
 
-                items.append(item)
+            items.append(item)
 
         if not return_all:
             raise TodoistError(f'Project matching pattern {pattern} not found. Run .sync() before you try to find a project based on a pattern.')
@@ -160,7 +434,7 @@ class BaseManager(Generic[TBaseModel]):
 
     def add(self, item: TBaseModel):
         """Add new item to command_manager queue"""
-        command_manager.add_command(data=item.dict(exclude_none=True, exclude_defaults=True), command_type=self.model.TodoistConfig.command_add, item=item)
+        self.command_manager.add_command(data=item.dict(exclude_none=True, exclude_defaults=True), command_type=self.model.TodoistConfig.command_add, item=item)
 
     def delete(self, item: int | str | TBaseModel) -> None:
         """Delete an item
@@ -173,7 +447,7 @@ class BaseManager(Generic[TBaseModel]):
 
         _, item_id = self._extract_params(item)
 
-        command_manager.add_command(data={'id': item_id}, command_type=self.model.TodoistConfig.command_delete)
+        self.command_manager.add_command(data={'id': item_id}, command_type=self.model.TodoistConfig.command_delete)
 
     def update(self, item: int | str | TBaseModel, updated_item: TBaseModel):
         """
@@ -185,7 +459,7 @@ class BaseManager(Generic[TBaseModel]):
         """
         params, item_id = self._extract_params(item)
 
-        command_manager.add_command(data={'id': item_id, **updated_item.dict(exclude={'id'}, exclude_none=True, exclude_defaults=True)},
+        self.command_manager.add_command(data={'id': item_id, **updated_item.dict(exclude={'id'}, exclude_none=True, exclude_defaults=True)},
                                     command_type=self.model.TodoistConfig.command_update, **params)  # type: ignore
 
     # endregion
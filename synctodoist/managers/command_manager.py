@@ -1,28 +1,28 @@
-# pylint: disable=invalid-name
+import asyncio
+import codecs
 import json
+import threading
 import uuid
 from datetime import datetime, date, time, timedelta
-from typing import Any
+from time import monotonic, perf_counter, sleep
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
 
 import httpx
 from httpx._types import TimeoutTypes
 
-from synctodoist.exceptions import TodoistError
-from synctodoist.models import Command, TodoistBaseModel, Settings
+from synctodoist import tracing
+from synctodoist.cache_files import atomic_write
+from synctodoist.cache_store import SQLiteCacheStore
+from synctodoist.coalescing import CoalesceStats, coalesce_commands
+from synctodoist.exceptions import TodoistBatchError
+from synctodoist.journal import CommandJournal
+from synctodoist.metrics import MetricsRegistry
+from synctodoist.models import Command, TodoistBaseModel, Settings, RetryPolicy
+from synctodoist.rate_limiter import RATE_LIMITED_STATUS_CODES, get_rate_limiter, retry_after
+from synctodoist.streaming import IncrementalJSONParser, JSONEvent
 
 BASE_URL = 'https://api.todoist.com/sync/v9'
 
-_headers = {
-    'Content-Type': 'application/x-www-form-urlencoded'
-}
-
-commands: dict[str, Command] = {}
-temp_items: dict[str, TodoistBaseModel] = {}
-SYNC_TOKEN: str = '*'
-settings: Settings = Settings()
-full_sync_count = 0
-partial_sync_count = 0
-
 TIMEOUT = 30
 
 
@@ -39,63 +39,43 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(o)
 
 
-def add_command(data: Any, command_type: str, item: TodoistBaseModel | None = None, is_update_command: bool = False) -> None:
-    """Add a Todoist command to command cache
-
-    Args:
-        data: The dataset to submit with the command
-        command_type: The type of the command
-        item: the TodoistBaseModel sublcass item to which this command is linked
-        is_update_command: True if this command should update item on successful execution
-    """
-    if item and getattr(item, 'temp_id', None):
-        temp_items[str(item.temp_id)] = item
-
-    temp_id = data.pop('temp_id', str(uuid.uuid4()))
-    extra_params: dict[str, Any] = {}
-    if item:
-        extra_params['item'] = item
-        extra_params['is_update_command'] = is_update_command
-    command = Command(type=command_type, temp_id=temp_id, args=data, **extra_params)
+def _client_limits(settings: Settings) -> httpx.Limits:
+    return httpx.Limits(max_connections=settings.max_connections, max_keepalive_connections=settings.max_keepalive_connections,
+                        keepalive_expiry=settings.keepalive_expiry)
 
-    commands[command.uuid] = command
 
+def build_client(settings: Settings, transport: httpx.BaseTransport | None = None) -> httpx.Client:
+    """Build a pooled, keep-alive HTTP client configured from settings
 
-def _build_request_data(data: Any) -> dict:
-    encoder = DateTimeEncoder()
-    result = {
-        'sync_token': SYNC_TOKEN,
-        **{key: encoder.encode(value) for key, value in data.items()}
-    }
-
-    return result
+    Args:
+        settings: the settings used to configure connection limits, keep-alive expiry and HTTP/2 support
+        transport: a custom transport that sends the requests instead of the network, e.g. `httpx.MockTransport` or `FakeSyncAPI.transport()`
 
+    Returns:
+        An `httpx.Client` instance that can be reused for all requests sent to Todoist
+    """
+    return httpx.Client(limits=_client_limits(settings), http2=settings.http2, timeout=TIMEOUT, transport=transport)
 
-def post(data: dict, endpoint: str, timeout: TimeoutTypes = TIMEOUT) -> Any:
-    """Post data to Todoist"""
-    global SYNC_TOKEN  # pylint: disable=global-statement
 
-    url = f'{BASE_URL}/{endpoint}'
-    _headers.update({'Authorization': f'Bearer {settings.api_key}'})
+def build_async_client(settings: Settings, transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """Build a pooled, keep-alive async HTTP client configured from settings
 
-    dataset = _build_request_data(data=data)
-    response = httpx.post(url=url, data=dataset, headers=_headers, timeout=timeout)
-    response.raise_for_status()
-    result = response.json()
+    Args:
+        settings: the settings used to configure connection limits, keep-alive expiry and HTTP/2 support
+        transport: a custom transport that sends the requests instead of the network, e.g. `FakeSyncAPI.async_transport()`
 
-    if 'sync_token' in result:
-        SYNC_TOKEN = result.pop('sync_token')
-    return result
+    Returns:
+        An `httpx.AsyncClient` instance that can be reused for all requests sent to Todoist
+    """
+    return httpx.AsyncClient(limits=_client_limits(settings), http2=settings.http2, timeout=TIMEOUT, transport=transport)
 
 
-def get(endpoint: str, timeout: TimeoutTypes = TIMEOUT) -> Any:
-    """Get data from Todoist"""
-    url = f'{BASE_URL}/{endpoint}'
-    _headers.update({'Authorization': f'Bearer {settings.api_key}'})
-    with httpx.Client(headers=_headers) as client:
-        response = client.get(url=url, timeout=timeout)
-        response.raise_for_status()
-        return response.json()  # type: ignore
+def _parse_stream(events: list[JSONEvent], received: dict[str, Any]) -> Iterator[JSONEvent]:
+    for event in events:
+        if event.key == 'sync_token' and not event.is_item:
+            received['sync_token'] = event.value
+        else:
+            yield event
 
 
 def _update_item(command):
@@ -104,56 +84,514 @@ def _update_item(command):
     command.item.refresh(**values)
 
 
-def commit() -> Any:
-    """Commit open commands to Todoist"""
-    global full_sync_count  # pylint: disable=global-statement
-    global partial_sync_count  # pylint: disable=global-statement
-
-    endpoint = 'sync'
-    data = {'commands': [command.dict(exclude_none=True, exclude_defaults=True) for command in commands.values()]}
-    result = post(data=data, endpoint=endpoint)
-
-    if result.get('full_sync', False):
-        full_sync_count += 1
-    else:
-        partial_sync_count += 1
-
-    errors = []
-    for key, value in result['sync_status'].items():
-        command = commands.pop(key)
-        if 'error' in value:
-            errors.append({key: value})
-        if value == 'ok':
-            if command.item and command.is_update_command:
-                _update_item(command)
-
-    if errors:
-        raise TodoistError(f'Sync Error: {errors}')
-
-    for key, value in result['temp_id_mapping'].items():
-        item = temp_items[key]
-        item.id = value  # type: ignore
-        temp_items.pop(key)  # type: ignore
+def _replace_temp_ids(value: Any, temp_id_mapping: dict[str, Any]) -> Any:
+    match value:
+        case str() if value in temp_id_mapping:
+            return temp_id_mapping[value]
+        case dict():
+            return {key: _replace_temp_ids(item, temp_id_mapping) for key, item in value.items()}
+        case list():
+            return [_replace_temp_ids(item, temp_id_mapping) for item in value]
+    return value
 
-    return result
 
+def _build_commit_data(batch: list[Command], temp_id_mapping: dict[str, Any]) -> dict[str, Any]:
+    if temp_id_mapping:
+        # Temp ids created by an earlier batch are only known to Todoist by their real ids
+        for command in batch:
+            command.args = _replace_temp_ids(command.args, temp_id_mapping)
 
-def write_sync_token():
-    """Store the sync token"""
-    if not settings.cache_dir.exists():  # pylint: disable=no-member
-        settings.cache_dir.mkdir(parents=True, exist_ok=True)  # pylint: disable=no-member
+    return {'commands': [command.dict(exclude_none=True, exclude_defaults=True) for command in batch]}
 
-    with (settings.cache_dir / 'todoist_sync_token.json').open('w', encoding='utf-8') as cache_fp:
-        json.dump({'sync_token': SYNC_TOKEN}, cache_fp)
 
+class CommandManager:  # pylint: disable=too-many-instance-attributes
+    """
+    The command queue, the sync token and the connection to Todoist of one account
+
+    Every `TodoistAPI` and `AsyncTodoistAPI` owns its own command manager, so several accounts can be served from one process without sharing any state.
+
+    Attributes:
+        settings: the settings of the account
+        commands: the queued commands by `uuid`
+        temp_items: the items added by queued commands by `temp_id`, whose ids are set once Todoist created them
+        sent_uuids: the `uuid` of the queued commands that were sent to Todoist, but not acknowledged (e.g. because the response was lost)
+        queue_lock: the lock that guards `commands`, `temp_items` and `sent_uuids`
+        commit_lock: the lock held while the queue is committed, so commands are never sent twice by concurrent commits
+        queue_listeners: callables that are called whenever a command is queued
+        sync_token: the sync token of the last sync, `'*'` before the first sync
+        client: the HTTP client, created on first use if it was not provided
+        async_client: the async HTTP client, created on first use if it was not provided
+        transport: the custom transport of the HTTP client, which is kept when the client is created again after it was closed
+        async_transport: the custom transport of the async HTTP client, which is kept when the client is created again after it was closed
+        journal: the journal that records the queue, or `None` if journaling is disabled
+        cache_store: the SQLite cache, or `None` if another cache backend is used
+        last_coalesce_stats: the statistics of the last `coalesce()` pass
+        metrics: the metrics collected for the account
+    """
 
-def read_sync_token():
-    """Load the sync token"""
-    global SYNC_TOKEN  # pylint: disable=global-statement
-    cache_file = settings.cache_dir / 'todoist_sync_token.json'
-    if not cache_file.exists():
-        SYNC_TOKEN = '*'  # nosec
-        return
+    def __init__(self, settings: Settings, metrics: MetricsRegistry | None = None):
+        """
+        Args:
+            settings: the settings of the account
+            metrics: the registry that collects the metrics, a new one if `None`
+        """
+        self.settings = settings
+        self.commands: dict[str, Command] = {}
+        self.temp_items: dict[str, TodoistBaseModel] = {}
+        self.sent_uuids: set[str] = set()
+        self.queue_lock = threading.RLock()
+        self.commit_lock = threading.Lock()
+        self._async_commit_lock: asyncio.Lock | None = None
+        self.queue_listeners: list[Callable[[], None]] = []
+        self.sync_token: str = '*'
+        self.client: httpx.Client | None = None
+        self.async_client: httpx.AsyncClient | None = None
+        self.transport: httpx.BaseTransport | None = None
+        self.async_transport: httpx.AsyncBaseTransport | None = None
+        self.journal: CommandJournal | None = None
+        self.cache_store: SQLiteCacheStore | None = None
+        self.last_coalesce_stats: CoalesceStats = CoalesceStats()
+        self.metrics = metrics or MetricsRegistry()
+
+    def add_command(self, data: Any, command_type: str, item: TodoistBaseModel | None = None, is_update_command: bool = False) -> None:
+        """Add a Todoist command to command cache
+
+        Args:
+            data: The dataset to submit with the command
+            command_type: The type of the command
+            item: the TodoistBaseModel sublcass item to which this command is linked
+            is_update_command: True if this command should update item on successful execution
+        """
+        temp_id = data.pop('temp_id', str(uuid.uuid4()))
+        extra_params: dict[str, Any] = {}
+        if item:
+            extra_params['item'] = item
+            extra_params['is_update_command'] = is_update_command
+        command = Command(type=command_type, temp_id=temp_id, args=data, **extra_params)
+
+        with self.queue_lock:
+            if item and getattr(item, 'temp_id', None):
+                self.temp_items[str(item.temp_id)] = item
+            self.commands[command.uuid] = command
+            if self.journal:
+                self.journal.record_add(command)
+
+        # A copy, because listeners may be added or removed by other threads
+        for listener in list(self.queue_listeners):
+            listener()
+
+    def oldest_command_age(self) -> float:
+        """The number of seconds the oldest queued command has been waiting, or 0 if the queue is empty"""
+        with self.queue_lock:
+            oldest = next(iter(self.commands.values()), None)
+        return monotonic() - oldest.queued_at if oldest else 0.0
+
+    def replay_journal(self) -> int:
+        """Put the commands of the journal that were not acknowledged by Todoist back into the queue
+
+        Returns:
+            The number of commands added to the queue
+        """
+        if not self.journal:
+            return 0
+
+        with self.queue_lock:
+            replayed = [command for command in self.journal.replay() if command.uuid not in self.commands]
+            for command in replayed:
+                self.commands[command.uuid] = command
+            self.sent_uuids.update(self.journal.replay_sent())
+
+            self.journal.compact(self.commands.values(), self.sent_uuids)
+        return len(replayed)
+
+    def _get_client(self) -> httpx.Client:
+        if self.client is None or self.client.is_closed:
+            self.client = build_client(self.settings, transport=self.transport)
+        return self.client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self.async_client is None or self.async_client.is_closed:
+            self.async_client = build_async_client(self.settings, transport=self.async_transport)
+        return self.async_client
+
+    def _url(self, endpoint: str) -> str:
+        return f'{self.settings.base_url.rstrip("/")}/{endpoint}'
+
+    def _build_request_data(self, data: Any) -> dict:
+        encoder = DateTimeEncoder()
+        result = {
+            'sync_token': self.sync_token,
+            **{key: encoder.encode(value) for key, value in data.items()}
+        }
+
+        return result
+
+    def _build_headers(self) -> dict[str, str]:
+        return {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Authorization': f'Bearer {self.settings.api_key}',
+        }
+
+    def _process_post_response(self, response: httpx.Response) -> Any:
+        response.raise_for_status()
+        result = response.json()
+
+        if 'sync_token' in result:
+            self.sync_token = result.pop('sync_token')
+        return result
+
+    def _send(self, method: str, endpoint: str, policy: RetryPolicy, stream: bool = False, **kwargs) -> httpx.Response:
+        limiter = get_rate_limiter(self.settings)
+        metrics = self.metrics
+        attempt = 0
+        throttled = 0
+        while True:
+            if limiter:
+                limiter.acquire()
+
+            try:
+                client = self._get_client()
+                request = client.build_request(method, self._url(endpoint), headers=self._build_headers(), **kwargs)
+                metrics.increment(f'request.count.{endpoint}')
+                metrics.increment(f'request.bytes_sent.{endpoint}', len(request.content))
+                start = perf_counter()
+                with tracing.span('http.request', method=method, endpoint=endpoint, attempt=attempt + throttled + 1, bytes_sent=len(request.content)) as span:
+                    response = client.send(request, stream=stream)
+                    span.set_attribute('status_code', response.status_code)
+                    if not stream:
+                        span.set_attribute('bytes_received', len(response.content))
+                metrics.observe(f'request.duration.{endpoint}', perf_counter() - start)
+            except httpx.TransportError:
+                if attempt >= policy.retries:
+                    raise
+                attempt += 1
+                metrics.increment(f'request.retries.{endpoint}')
+                sleep(policy.delay(attempt))
+                continue
+
+            if stream and response.is_error:
+                # Error responses are small, and their body is needed to decide on retries and to raise meaningful errors
+                response.read()
+
+            if response.status_code in RATE_LIMITED_STATUS_CODES and throttled < self.settings.rate_limit_retries:
+                response.close()
+                throttled += 1
+                metrics.increment(f'request.retries.{endpoint}')
+                if limiter:
+                    limiter.defer(retry_after(response))
+                else:
+                    sleep(retry_after(response))
+            elif response.status_code in policy.status_codes and attempt < policy.retries:
+                response.close()
+                attempt += 1
+                metrics.increment(f'request.retries.{endpoint}')
+                sleep(policy.delay(attempt))
+            else:
+                if not stream:
+                    metrics.increment(f'request.bytes_received.{endpoint}', len(response.content))
+                return response
+
+    async def _send_async(self, method: str, endpoint: str, policy: RetryPolicy, stream: bool = False, **kwargs) -> httpx.Response:
+        limiter = get_rate_limiter(self.settings)
+        metrics = self.metrics
+        attempt = 0
+        throttled = 0
+        while True:
+            if limiter:
+                await limiter.acquire_async()
+
+            try:
+                client = self._get_async_client()
+                request = client.build_request(method, self._url(endpoint), headers=self._build_headers(), **kwargs)
+                metrics.increment(f'request.count.{endpoint}')
+                metrics.increment(f'request.bytes_sent.{endpoint}', len(request.content))
+                start = perf_counter()
+                with tracing.span('http.request', method=method, endpoint=endpoint, attempt=attempt + throttled + 1, bytes_sent=len(request.content)) as span:
+                    response = await client.send(request, stream=stream)
+                    span.set_attribute('status_code', response.status_code)
+                    if not stream:
+                        span.set_attribute('bytes_received', len(response.content))
+                metrics.observe(f'request.duration.{endpoint}', perf_counter() - start)
+            except httpx.TransportError:
+                if attempt >= policy.retries:
+                    raise
+                attempt += 1
+                metrics.increment(f'request.retries.{endpoint}')
+                await asyncio.sleep(policy.delay(attempt))
+                continue
+
+            if stream and response.is_error:
+                # Error responses are small, and their body is needed to decide on retries and to raise meaningful errors
+                await response.aread()
+
+            if response.status_code in RATE_LIMITED_STATUS_CODES and throttled < self.settings.rate_limit_retries:
+                await response.aclose()
+                throttled += 1
+                metrics.increment(f'request.retries.{endpoint}')
+                if limiter:
+                    limiter.defer(retry_after(response))
+                else:
+                    await asyncio.sleep(retry_after(response))
+            elif response.status_code in policy.status_codes and attempt < policy.retries:
+                await response.aclose()
+                attempt += 1
+                metrics.increment(f'request.retries.{endpoint}')
+                await asyncio.sleep(policy.delay(attempt))
+            else:
+                if not stream:
+                    metrics.increment(f'request.bytes_received.{endpoint}', len(response.content))
+                return response
+
+    def post(self, data: dict, endpoint: str, timeout: TimeoutTypes = TIMEOUT, write: bool = False) -> Any:
+        """Post data to Todoist
+
+        Transient errors are retried with the `write_retry` policy of the settings if `write` is `True`, otherwise with the `read_retry` policy. Every
+        attempt sends exactly the same payload, so retried commands keep their `uuid` and are executed by Todoist only once.
+        """
+        policy = self.settings.write_retry if write else self.settings.read_retry
+        response = self._send('POST', endpoint, policy, data=self._build_request_data(data=data), timeout=timeout)
+        return self._process_post_response(response)
+
+    async def post_async(self, data: dict, endpoint: str, timeout: TimeoutTypes = TIMEOUT, write: bool = False) -> Any:
+        """Post data to Todoist without blocking the event loop"""
+        policy = self.settings.write_retry if write else self.settings.read_retry
+        response = await self._send_async('POST', endpoint, policy, data=self._build_request_data(data=data), timeout=timeout)
+        return self._process_post_response(response)
+
+    def get(self, endpoint: str, timeout: TimeoutTypes = TIMEOUT) -> Any:
+        """Get data from Todoist"""
+        response = self._send('GET', endpoint, self.settings.read_retry, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
 
-    with cache_file.open('r', encoding='utf-8') as cache_fp:
-        SYNC_TOKEN = json.load(cache_fp).get('sync_token', '*')  # type: ignore
+    async def get_async(self, endpoint: str, timeout: TimeoutTypes = TIMEOUT) -> Any:
+        """Get data from Todoist without blocking the event loop"""
+        response = await self._send_async('GET', endpoint, self.settings.read_retry, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def post_stream(self, data: dict, endpoint: str, stream_keys: Iterable[str], timeout: TimeoutTypes = TIMEOUT) -> Iterator[JSONEvent]:
+        """Post data to Todoist and parse the response while it is downloaded
+
+        The elements of the array members listed in `stream_keys` are yielded one by one as soon as they are received, so large responses (e.g. a full
+        sync of a big account) are never held in memory as a whole. The sync token of the response is only stored once the whole response was parsed.
+        """
+        response = self._send('POST', endpoint, self.settings.read_retry, stream=True, data=self._build_request_data(data=data), timeout=timeout)
+        received: dict[str, Any] = {'sync_token': self.sync_token}
+        try:
+            response.raise_for_status()
+            parser = IncrementalJSONParser(stream_keys=stream_keys)
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for chunk in response.iter_bytes():
+                self.metrics.increment(f'request.bytes_received.{endpoint}', len(chunk))
+                yield from _parse_stream(parser.feed(decoder.decode(chunk)), received)
+            yield from _parse_stream(parser.feed(decoder.decode(b'', final=True)) + parser.close(), received)
+        finally:
+            response.close()
+
+        self.sync_token = received['sync_token']
+
+    async def post_stream_async(self, data: dict, endpoint: str, stream_keys: Iterable[str], timeout: TimeoutTypes = TIMEOUT) -> AsyncIterator[JSONEvent]:
+        """Post data to Todoist and parse the response while it is downloaded, without blocking the event loop"""
+        response = await self._send_async('POST', endpoint, self.settings.read_retry, stream=True, data=self._build_request_data(data=data), timeout=timeout)
+        received: dict[str, Any] = {'sync_token': self.sync_token}
+        try:
+            response.raise_for_status()
+            parser = IncrementalJSONParser(stream_keys=stream_keys)
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            async for chunk in response.aiter_bytes():
+                self.metrics.increment(f'request.bytes_received.{endpoint}', len(chunk))
+                for event in _parse_stream(parser.feed(decoder.decode(chunk)), received):
+                    yield event
+            for event in _parse_stream(parser.feed(decoder.decode(b'', final=True)) + parser.close(), received):
+                yield event
+        finally:
+            await response.aclose()
+
+        self.sync_token = received['sync_token']
+
+    def coalesce(self) -> CoalesceStats:
+        """Remove redundant commands from the queue
+
+        Consecutive updates of the same item are merged, items that are added and deleted before they are committed are dropped together with the commands
+        on them, and repeated close/reopen toggles are collapsed into the last one. See `synctodoist.coalescing.coalesce_commands` for the exact rules.
+
+        Returns:
+            The statistics of the pass, which are also stored in `last_coalesce_stats`
+        """
+        with self.queue_lock:
+            queued = list(self.commands.values())
+            coalesced, self.last_coalesce_stats = coalesce_commands(queued, self.sent_uuids)
+            if not self.last_coalesce_stats.eliminated:
+                return self.last_coalesce_stats
+
+            kept = {command.uuid: command for command in coalesced}
+            dropped = [command for command in queued if command.uuid not in kept]
+            for command in dropped:
+                self.sent_uuids.discard(command.uuid)
+                if command.temp_id:
+                    self.temp_items.pop(command.temp_id, None)
+
+            self.commands.clear()
+            self.commands.update(kept)
+
+            if self.journal:
+                for command in queued:
+                    if command.uuid in kept and kept[command.uuid] is not command:
+                        self.journal.record_add(kept[command.uuid])
+                self.journal.record_acknowledged({command.uuid: 'coalesced' for command in dropped})
+
+        return self.last_coalesce_stats
+
+    def _build_batches(self) -> list[list[Command]]:
+        with self.queue_lock:
+            queued = list(self.commands.values())
+        size = max(self.settings.commands_per_request, 1)
+        return [queued[index:index + size] for index in range(0, len(queued), size)]
+
+    def _prepare_batch(self, batch: list[Command], is_last: bool, merged_result: dict[str, Any], resource_types: list[str] | None,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                       sync_token: str) -> dict[str, Any]:
+        data = _build_commit_data(batch, merged_result['temp_id_mapping'])
+        if resource_types and is_last:
+            # Earlier batches may have advanced the token, but the delta has to include their changes, too
+            self.sync_token = sync_token
+            data['resource_types'] = resource_types
+
+        with self.queue_lock:
+            self.sent_uuids.update(command.uuid for command in batch)
+            if self.journal:
+                self.journal.record_sent(command.uuid for command in batch)
+        return data
+
+    def _compact_journal(self) -> None:
+        with self.queue_lock:
+            self.journal.compact(self.commands.values(), self.sent_uuids)  # type: ignore[union-attr]
+
+    def _process_commit_result(self, result: Any, merged_result: dict[str, Any], batch_index: int, batch_count: int) -> None:
+        # The acknowledged commands are removed in one step, so threads queueing commands meanwhile never see a partly processed result
+        with self.queue_lock:
+            acknowledged = {key: self.commands.pop(key, None) for key in result['sync_status']}
+            self.sent_uuids.difference_update(result['sync_status'])
+            if self.journal:
+                self.journal.record_acknowledged(result['sync_status'])
+            created_items = {key: item for key in result['temp_id_mapping'] if (item := self.temp_items.pop(key, None))}
+
+        errors = []
+        for key, value in result['sync_status'].items():
+            command = acknowledged[key]
+            if command:
+                self.metrics.increment(f'commands.{"committed" if value == "ok" else "failed"}.{command.type}')
+            if 'error' in value:
+                errors.append({key: value})
+            if value == 'ok':
+                if command and command.item and command.is_update_command:
+                    _update_item(command)
+
+        for key, item in created_items.items():
+            item.id = result['temp_id_mapping'][key]  # type: ignore
+
+        sync_status = {**merged_result['sync_status'], **result['sync_status']}
+        temp_id_mapping = {**merged_result['temp_id_mapping'], **result['temp_id_mapping']}
+        merged_result.update(result, sync_status=sync_status, temp_id_mapping=temp_id_mapping)
+
+        if errors:
+            raise TodoistBatchError(f'Sync Error in batch {batch_index + 1} of {batch_count}: {errors}', batch_index=batch_index, batch_count=batch_count,
+                                    errors=errors, result=merged_result)
+
+    def commit(self, resource_types: list[str] | None = None) -> Any:
+        """Commit open commands to Todoist
+
+        Redundant commands are removed by `coalesce()` first, unless `Settings.coalesce_commands` is disabled. The queue is then split into batches of at
+        most `Settings.commands_per_request` commands which are sent one after the other. Temp ids created by an earlier batch are replaced by their real
+        ids in later batches. Commands of a batch that was not sent stay in the queue. Commits of several threads wait for each other, and commands queued
+        while a commit is running are sent by the next commit.
+
+        Transient network errors are retried with the `write_retry` policy of the settings. If a batch still fails, its commands and all later batches stay
+        in the queue with their original `uuid`, so the next `commit()` replays them and Todoist skips the ones it has already executed.
+
+        If `resource_types` are provided, they are sent together with the last batch, so the response also holds the changes of these resources since the
+        current sync token, like the response of a `sync` request.
+
+        Args:
+            resource_types: the resource types to synchronize in the same request as the last batch
+
+        Returns:
+            The merged response of all batches
+
+        Raises:
+            TodoistBatchError: if Todoist rejects at least one command of a batch. The batches after it are not sent.
+        """
+        with self.commit_lock:
+            if self.settings.coalesce_commands:
+                self.coalesce()
+
+            merged_result: dict[str, Any] = {'sync_status': {}, 'temp_id_mapping': {}}
+            sync_token = self.sync_token
+            batches = self._build_batches()
+            try:
+                for batch_index, batch in enumerate(batches):
+                    with tracing.span('commit.batch', batch_index=batch_index, batch_count=len(batches), command_count=len(batch)):
+                        data = self._prepare_batch(batch, batch_index == len(batches) - 1, merged_result, resource_types, sync_token)
+                        result = self.post(data=data, endpoint='sync', write=True)
+                        self._process_commit_result(result, merged_result, batch_index, len(batches))
+            finally:
+                if self.journal and batches:
+                    self._compact_journal()
+
+        return merged_result
+
+    async def commit_async(self, resource_types: list[str] | None = None) -> Any:
+        """Commit open commands to Todoist without blocking the event loop
+
+        Batches are built and sent the same way as in `commit()`. Concurrent commits of the event loop wait for each other. The journal is written in a
+        worker thread, so flushing it to disk does not block the event loop either.
+
+        Args:
+            resource_types: the resource types to synchronize in the same request as the last batch
+        """
+        if self._async_commit_lock is None:
+            self._async_commit_lock = asyncio.Lock()
+
+        async with self._async_commit_lock:
+            if self.settings.coalesce_commands:
+                await asyncio.to_thread(self.coalesce)
+
+            merged_result: dict[str, Any] = {'sync_status': {}, 'temp_id_mapping': {}}
+            sync_token = self.sync_token
+            batches = self._build_batches()
+            try:
+                for batch_index, batch in enumerate(batches):
+                    with tracing.span('commit.batch', batch_index=batch_index, batch_count=len(batches), command_count=len(batch)):
+                        # The journal is flushed to disk by these steps, so they run in a worker thread
+                        data = await asyncio.to_thread(self._prepare_batch, batch, batch_index == len(batches) - 1, merged_result, resource_types,
+                                                       sync_token)
+                        result = await self.post_async(data=data, endpoint='sync', write=True)
+                        await asyncio.to_thread(self._process_commit_result, result, merged_result, batch_index, len(batches))
+            finally:
+                if self.journal and batches:
+                    await asyncio.to_thread(self._compact_journal)
+
+        return merged_result
+
+    def write_sync_token(self):
+        """Store the sync token"""
+        if self.cache_store:
+            self.cache_store.write_sync_token(self.sync_token)
+            return
+
+        with atomic_write(self.settings.account_cache_dir / 'todoist_sync_token.json', 'w', fsync=self.settings.cache_fsync, encoding='utf-8') as cache_fp:
+            json.dump({'sync_token': self.sync_token}, cache_fp)
+
+    def read_sync_token(self):
+        """Load the sync token"""
+        if self.cache_store:
+            self.sync_token = self.cache_store.read_sync_token()
+            return
+
+        cache_file = self.settings.account_cache_dir / 'todoist_sync_token.json'
+        if not cache_file.exists():
+            self.sync_token = '*'  # nosec
+            return
+
+        with cache_file.open('r', encoding='utf-8') as cache_fp:
+            self.sync_token = json.load(cache_fp).get('sync_token', '*')
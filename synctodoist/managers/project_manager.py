@@ -1,15 +1,52 @@
+from __future__ import annotations
+
+from typing import Any
+
 from synctodoist.exceptions import TodoistError
-from synctodoist.managers import command_manager
 from synctodoist.managers.base_manager import BaseManager
-from synctodoist.models import Project
+from synctodoist.managers.command_manager import CommandManager
+from synctodoist.managers.task_manager import TaskManager
+from synctodoist.models import Project, Settings, Task
 
 
 class ProjectManager(BaseManager[Project]):
     """Project manager model"""
     model = Project
 
-    def __new__(cls, *args, **kwargs):
-        return super().__new__(cls, *args, model=Project, **kwargs)
+    def __init__(self, settings: Settings, command_manager: CommandManager, tasks: TaskManager):
+        """
+        Args:
+            settings: the settings of the account
+            command_manager: the command manager of the account, which queues the commands of the manager
+            tasks: the task manager of the same account, which holds the tasks of the projects
+        """
+        super().__init__(settings=settings, command_manager=command_manager)
+        self.tasks = tasks
+
+    def get_tasks(self, project: Project) -> list[Task]:
+        """Get the tasks of a project of this account
+
+        Args:
+            project: the project
+
+        Returns:
+            A list of `Task` instances
+        """
+        return project.get_tasks(self.tasks)
+
+    def _api_get_data(self, item_id: int | str) -> dict[str, Any]:
+        if isinstance(item_id, str) and item_id.isdigit():
+            item_id = int(item_id)
+
+        return {'project_id': item_id, 'all_data': False}
+
+    def _api_get_result(self, result: Any) -> Project:
+        project = Project(**result['project'])
+        with self._changing() as items:
+            items[str(project.id)] = project
+            self._changed_ids.add(str(project.id))
+            self._deleted_ids.discard(str(project.id))
+        return project
 
     def get(self, item_id: int | str) -> Project:  # pylint: disable=arguments-renamed
         """Get project by id
@@ -24,14 +61,7 @@ class ProjectManager(BaseManager[Project]):
             return project
 
         try:
-            endpoint = self.model.TodoistConfig.api_get
-            if isinstance(item_id, str) and item_id.isdigit():
-                item_id = int(item_id)
-
-            data = {'project_id': item_id, 'all_data': False}
-            result = command_manager.post(data, endpoint)
-            project = Project(**result['project'])
-            self._items.update({str(project.id): project})
-            return project
+            result = self.command_manager.post(self._api_get_data(item_id), self.model.TodoistConfig.api_get)
+            return self._api_get_result(result)
         except Exception as ex:
             raise TodoistError(f'Project {item_id} not found') from ex
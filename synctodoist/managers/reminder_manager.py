@@ -5,6 +5,3 @@ from synctodoist.models import Reminder
 class ReminderManager(BaseManager[Reminder]):
     """Reminder manager"""
     model = Reminder
-
-    def __new__(cls, *args, **kwargs):
-        return super().__new__(cls, *args, model=Reminder, **kwargs)
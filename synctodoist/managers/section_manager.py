@@ -5,6 +5,3 @@ from synctodoist.models import Section
 class SectionManager(BaseManager[Section]):
     """Section manager"""
     model = Section
-
-    def __new__(cls, *args, **kwargs):
-        return super().__new__(cls, *args, model=Section, **kwargs)
@@ -1,5 +1,6 @@
+from typing import Any
+
 from synctodoist.exceptions import TodoistError
-from synctodoist.managers import command_manager
 from synctodoist.managers.base_manager import BaseManager
 from synctodoist.models import Task
 from synctodoist.models.project import Project
@@ -10,8 +11,19 @@ class TaskManager(BaseManager[Task]):
     """Task manager"""
     model = Task
 
-    def __new__(cls, *args, **kwargs):
-        return super().__new__(cls, *args, model=Task, **kwargs)
+    def _api_get_data(self, item_id: int | str) -> dict[str, Any]:
+        if isinstance(item_id, str) and item_id.isdigit():
+            item_id = int(item_id)
+
+        return {'item_id': item_id}
+
+    def _api_get_result(self, result: Any) -> Task:
+        task = Task(**result.get('item'))
+        with self._changing() as items:
+            items[task.id] = task  # type: ignore
+            self._changed_ids.add(task.id)  # type: ignore
+            self._deleted_ids.discard(task.id)  # type: ignore
+        return task
 
     def get(self, item_id: int | str) -> Task:  # pylint: disable=arguments-renamed
         """Get task by id
@@ -26,15 +38,8 @@ class TaskManager(BaseManager[Task]):
             return task
 
         try:
-            endpoint = self.model.TodoistConfig.api_get
-            if isinstance(item_id, str) and item_id.isdigit():
-                item_id = int(item_id)
-
-            data = {'item_id': item_id}
-            result = command_manager.post(data, endpoint)
-            task = Task(**result.get('item'))
-            self._items.update({task.id: task})  # type: ignore
-            return task
+            result = self.command_manager.post(self._api_get_data(item_id), self.model.TodoistConfig.api_get)
+            return self._api_get_result(result)
         except Exception as ex:
             raise TodoistError(f'Task {item_id} not found') from ex
 
@@ -49,7 +54,7 @@ class TaskManager(BaseManager[Task]):
         """
         params, task_id = self._extract_params(item)
 
-        command_manager.add_command(data={'id': task_id}, command_type=self.model.TodoistConfig.command_close, **params)
+        self.command_manager.add_command(data={'id': task_id}, command_type=self.model.TodoistConfig.command_close, **params)
 
     def reopen(self, item: int | str | Task) -> None:
         """Reopen a task
@@ -63,7 +68,7 @@ class TaskManager(BaseManager[Task]):
 
         params, task_id = self._extract_params(item)
 
-        command_manager.add_command(data={'id': task_id}, command_type=self.model.TodoistConfig.command_reopen, **params)
+        self.command_manager.add_command(data={'id': task_id}, command_type=self.model.TodoistConfig.command_reopen, **params)
 
     def move(self, item: str | int | Task, parent: str | int | Task | None = None, section: str | int | Section | None = None,
              project: str | int | Project | None = None):
@@ -110,4 +115,4 @@ class TaskManager(BaseManager[Task]):
             case str():
                 data['project_id'] = project
 
-        command_manager.add_command(data=data, command_type=self.model.TodoistConfig.command_move, **params)
+        self.command_manager.add_command(data=data, command_type=self.model.TodoistConfig.command_move, **params)
@@ -0,0 +1,170 @@
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Exporter = Callable[[dict[str, Any]], None]
+
+
+class Histogram:
+    """
+    Distribution of observed values, e.g. request latencies
+
+    Attributes:
+        buckets: the upper bounds of the buckets
+        counts: the number of observations per bucket, with one additional bucket for values above the last bound
+        count: the total number of observations
+        total: the sum of all observed values
+        min: the smallest observed value
+        max: the largest observed value
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: the upper bounds of the buckets in ascending order
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def observe(self, value: float) -> None:
+        """Add a value to the distribution"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """The current state of the histogram as a dict"""
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'mean': self.total / self.count if self.count else None,
+            'buckets': {str(bound): count for bound, count in zip([*self.buckets, float('inf')], self.counts)},
+        }
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms collected by the API client
+
+    Metric names are dotted paths that end with the label they belong to, e.g. `request.duration.sync` or `commands.committed.item_add`. These metrics
+    are collected:
+
+    - `request.count.<endpoint>`, `request.retries.<endpoint>`: the number of requests sent and retried
+    - `request.duration.<endpoint>`: histogram of the request latency in seconds
+    - `request.bytes_sent.<endpoint>`, `request.bytes_received.<endpoint>`: the size of the request and response bodies
+    - `commands.committed.<command type>`, `commands.failed.<command type>`: the number of commands accepted and rejected by Todoist
+    - `syncs.full`, `syncs.partial`: the number of full and partial synchronizations
+    - `cache.read.<resource>`, `cache.write.<resource>`: histograms of the cache read and write durations in seconds
+    - `sync.model_construction.<resource type>`: histogram of the time spent on building the models of a resource type in a sync
+
+    Examples:
+        >>> from synctodoist import TodoistAPI
+        >>> api = TodoistAPI()
+        >>> api.metrics.add_exporter(print)
+        >>> api.sync()
+        >>> api.metrics.snapshot()['counters']['request.count.sync']
+        1
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._exporters: list[Exporter] = []
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Increase a counter
+
+        Args:
+            name: the name of the counter
+            value: the amount to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        Add a value to a histogram
+
+        Args:
+            name: the name of the histogram
+            value: the observed value
+        """
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram()
+            self._histograms[name].observe(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Measure the duration of a block of code in seconds and add it to a histogram
+
+        Args:
+            name: the name of the histogram
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get the current value of all metrics
+
+        Returns:
+            A dict with the `counters` and the `histograms` by name
+        """
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {name: histogram.snapshot() for name, histogram in self._histograms.items()},
+            }
+
+    def reset(self) -> None:
+        """Remove all collected metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        """
+        Register a callback that receives a snapshot of all metrics after every `sync()` and `commit()`
+
+        Args:
+            exporter: a callable that accepts the snapshot dict
+        """
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter: Exporter) -> None:
+        """
+        Unregister an exporter callback
+
+        Args:
+            exporter: the callable passed to `add_exporter()`
+        """
+        if exporter in self._exporters:
+            self._exporters.remove(exporter)
+
+    def export(self) -> None:
+        """Pass a snapshot of all metrics to every registered exporter"""
+        if not self._exporters:
+            return
+
+        snapshot = self.snapshot()
+        for exporter in list(self._exporters):
+            exporter(snapshot)
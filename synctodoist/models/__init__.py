@@ -1,9 +1,11 @@
 from .command import Command
 from .due import Due
-from .enums import ColorEnum, LocTriggerEnum, ReminderTypeEnum
+from .enums import CacheBackendEnum, CacheReloadEnum, ChangeKindEnum, ColorEnum, HydrationEnum, LocTriggerEnum, ReminderTypeEnum
 from .label import Label
 from .project import Project
 from .reminder import Reminder
+from .resource_changes import ResourceChanges
+from .retry_policy import RetryPolicy
 from .section import Section
 from .settings import Settings
 from .task import Task
@@ -1,3 +1,5 @@
+from time import monotonic
+
 from pydantic import BaseModel, Field
 
 from synctodoist.models.todoist_base_model import TodoistBaseModel
@@ -12,3 +14,4 @@ class Command(BaseModel):
     args: dict | list
     is_update_command: bool = Field(False, exclude=True)
     item: TodoistBaseModel | None = Field(None, exclude=True)
+    queued_at: float = Field(default_factory=monotonic, exclude=True)
@@ -67,3 +67,43 @@ class LocTriggerEnum(str, Enum):
     """on enter"""
     on_leave = 'on_leave'
     """on leave"""
+
+
+class CacheBackendEnum(str, Enum):
+    """Cache backend enum"""
+    json = 'json'
+    """one JSON file per resource type, rewritten on every sync"""
+    sqlite = 'sqlite'
+    """one SQLite database with a row per item, updated incrementally"""
+    binary = 'binary'
+    """one compact msgpack file per resource type, loaded without validation (requires `msgpack`)"""
+
+
+class CacheReloadEnum(str, Enum):
+    """Cache reload policy enum"""
+    always = 'always'
+    """reload the caches from disk before every sync"""
+    changed = 'changed'
+    """reload a cache only if it was changed on disk by another process or client"""
+    never = 'never'
+    """load the caches only once and rely on the in-memory state afterwards"""
+
+
+class HydrationEnum(str, Enum):
+    """Hydration mode enum"""
+    validate = 'validate'
+    """validate every item received from Todoist or read from a cache"""
+    trusted = 'trusted'
+    """create the items without validation, which is several times faster"""
+    sampled = 'sampled'
+    """create the items without validation, but validate a sample of them and fall back to validation if the results differ"""
+
+
+class ChangeKindEnum(str, Enum):
+    """Change kind enum"""
+    added = 'added'
+    """the item was not known before the sync"""
+    updated = 'updated'
+    """the known item was changed by the sync"""
+    deleted = 'deleted'
+    """the item was deleted, or not received anymore by a full sync"""
@@ -8,6 +8,7 @@ from .enums import ColorEnum
 from .todoist_base_model import TodoistBaseModel
 
 if typing.TYPE_CHECKING:
+    from synctodoist.managers import TaskManager
     from .task import Task
 
 
@@ -58,14 +59,21 @@ class Project(TodoistBaseModel):
         command_update: str = 'project_update'
         api_get: str = 'projects/get'
 
-    @property
-    def tasks(self) -> list[Task]:  # pylint: disable=used-before-assignment
+    def get_tasks(self, tasks: TaskManager) -> list[Task]:  # pylint: disable=used-before-assignment
         """
         The list of tasks related to this project
 
+        Examples:
+            >>> from synctodoist import TodoistAPI
+            >>> api = TodoistAPI()
+            >>> api.sync()
+            >>> project = api.projects.find('Inbox')
+            >>> project.get_tasks(api.tasks)
+
+        Args:
+            tasks: the task manager of the account the project belongs to, e.g. `api.tasks`
+
         Returns:
             A list of `Task` instances
         """
-        from synctodoist.managers import TaskManager  # pylint: disable=import-outside-toplevel
-        task_manager = TaskManager()
-        return task_manager.find(pattern=self.id, field='project_id', return_all=True)  # type: ignore
+        return tasks.find(pattern=f'^{self.id}$', field='project_id', return_all=True)  # type: ignore
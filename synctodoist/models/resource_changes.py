@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+
+class ResourceChanges(BaseModel):
+    """
+    Changes of one resource type applied by a sync
+
+    Attributes:
+        full_sync: `True` if the changes were applied by a full sync
+        added: the ids of the items that were not known before the sync
+        updated: the ids of the known items that were updated in place
+        deleted: the ids of the items that were removed, because they were deleted or, in a full sync, not received anymore
+    """
+    full_sync: bool = False
+    added: list[str] = []
+    updated: list[str] = []
+    deleted: list[str] = []
+
+    @property
+    def count(self) -> int:
+        """The number of changed items"""
+        return len(self.added) + len(self.updated) + len(self.deleted)
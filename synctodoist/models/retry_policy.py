@@ -0,0 +1,38 @@
+import random
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry policy model
+
+    Failed requests are repeated with exponential backoff: the n-th retry waits `backoff * 2 ** (n - 1)` seconds, capped at `backoff_max`. A random part of
+    the delay, defined by `jitter`, is subtracted so that many clients failing at the same time do not retry in lockstep.
+
+    Attributes:
+        retries: the maximum number of retries after the first attempt
+        backoff: the delay before the first retry in seconds
+        backoff_max: the maximum delay between two attempts in seconds
+        jitter: the fraction of the delay that is randomized (between 0 and 1)
+        status_codes: the HTTP status codes that are considered transient
+    """
+    retries: int = 3
+    backoff: float = 0.5
+    backoff_max: float = 30.0
+    jitter: Annotated[float, Field(ge=0, le=1)] = 1.0
+    status_codes: set[int] = {500, 502, 503, 504}
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the delay before a retry
+
+        Args:
+            attempt: the number of the retry, starting at 1
+
+        Returns:
+            The number of seconds to wait
+        """
+        delay = min(self.backoff * 2 ** (attempt - 1), self.backoff_max)
+        return float(delay * (1 - self.jitter * random.random()))  # nosec
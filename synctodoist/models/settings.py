@@ -1,9 +1,13 @@
+import hashlib
 import tempfile
 from pathlib import Path
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .enums import CacheBackendEnum, CacheReloadEnum, HydrationEnum
+from .retry_policy import RetryPolicy
+
 
 def cache_dir_factory():
     """Cache directory factory method"""
@@ -11,8 +15,112 @@ def cache_dir_factory():
 
 
 class Settings(BaseSettings):
-    """Settings model"""
+    """
+    Settings model
+
+    Attributes:
+        api_key: your Todoist API key
+        cache_dir: the directory in which the local cache files are stored
+        cache_per_account: the cache files, the sync token and the journal are kept in a subdirectory of `cache_dir` named after a hash of `api_key`, so
+            clients of several accounts can share one `cache_dir`. Set to `False` to keep them in `cache_dir` itself.
+        cache_backend: `json` to store every resource type in its own JSON file, `sqlite` to store the cache in a SQLite database that is updated
+            incrementally, which is much faster for large accounts, or `binary` to store every resource type in a compact msgpack file that loads
+            much faster than JSON (requires `synctodoist[msgpack]`). Existing JSON caches are migrated to the binary format automatically.
+        cache_reload: when the managers reload their items from the cache before a sync: `always`, only if the cache was `changed` on disk by another
+            process or client (compared by file modification time and size, or by a generation counter in the SQLite cache), or `never` after the first load
+        cache_lock: set to `False` to disable the lock file that lets several processes share one `cache_dir`. While it is enabled, the sync token and
+            the JSON or binary caches are read under a shared lock and written under an exclusive lock. The SQLite cache is always shared safely.
+        cache_fsync: set to `False` to skip flushing the JSON or binary cache files and the sync token to disk before they replace the old files
+        hydration: how items received from Todoist or read from a JSON or SQLite cache are turned into model instances: `validate` every item with
+            pydantic, create them without validation if the data is `trusted`, which is several times faster, or create them without validation but
+            validate a `sampled` share of them and switch back to validation for the rest of the batch if the results differ. Items of the binary
+            cache are always created without validation.
+        hydration_sample_rate: the share of items validated in `sampled` mode
+        lazy_store: set to `True` to keep the items received from Todoist or read from the cache as raw records, and to create model instances only
+            when they are accessed through `get`, `find` or iteration. This cuts the memory usage of processes that only use a few items of a large
+            account. Instances evicted from the cache of created instances are rebuilt from their records, so change items through the API methods.
+        lazy_store_size: the maximum number of created model instances per manager kept in lazy store mode
+        base_url: the URL of the Todoist Sync API. Point it at a local stand-in, e.g. `synctodoist.fake_server`, to test without the real API.
+        timeout: the timeout of requests sent to Todoist in seconds
+        max_connections: the maximum number of concurrent connections the HTTP client may open
+        max_keepalive_connections: the maximum number of idle connections kept alive for reuse
+        keepalive_expiry: the number of seconds after which an idle keep-alive connection is closed
+        http2: set to `True` to enable HTTP/2 (requires `httpx[http2]` to be installed)
+        commands_per_request: the maximum number of commands sent to Todoist in a single request by `commit()`
+        coalesce_commands: set to `False` to send every queued command, even if it is made redundant by a later command
+        commit_with_sync: set to `False` to synchronize with a separate request after `commit()` instead of in the same request as the commands
+        stream_sync: set to `True` to parse the response of `sync()` while it is downloaded and to add items to the managers one by one, which keeps the
+            memory usage of full syncs of large accounts low
+        rate_limit_enabled: set to `False` to disable the client-side rate limiter
+        rate_limit_requests: the number of requests allowed per API key in `rate_limit_period`
+        rate_limit_period: the length of the rate limit period in seconds
+        rate_limit_retries: how many times a request is repeated after Todoist responded with HTTP 429 or 503
+        read_retry: the retry policy of requests that only read data (`sync`, `items/get`, `projects/get`, ...)
+        write_retry: the retry policy of requests that send commands. Retried commands keep their `uuid`, so Todoist executes them only once.
+        journal: set to `True` to record the pending command queue in a journal file in `cache_dir` and to restore it on startup
+        journal_fsync: set to `False` to skip flushing every journal record to disk
+        auto_flush: set to `True` to commit queued commands automatically in the background
+        auto_flush_max_commands: the number of queued commands that triggers an automatic commit
+        auto_flush_max_age: the number of seconds a command may wait in the queue before it is committed automatically
+        background_sync: set to `True` to sync automatically in the background, at an interval that adapts to the activity of the account
+        background_sync_min_interval: the shortest number of seconds between two background syncs, used after syncs that received changes and after
+            commands were queued
+        background_sync_max_interval: the longest number of seconds between two background syncs
+        background_sync_backoff: the factor by which the interval between two background syncs grows after a sync without changes or a failed sync
+        background_sync_jitter: the share by which every interval between two background syncs is varied randomly, so the syncs of many accounts are
+            spread out
+    """
     api_key: str = ''
     cache_dir: Path = Field(default_factory=cache_dir_factory)
+    cache_per_account: bool = True
+    cache_backend: CacheBackendEnum = CacheBackendEnum.json
+    cache_reload: CacheReloadEnum = CacheReloadEnum.changed
+    cache_lock: bool = True
+    cache_fsync: bool = True
+    hydration: HydrationEnum = HydrationEnum.validate
+    hydration_sample_rate: float = 0.01
+    lazy_store: bool = False
+    lazy_store_size: int = 1000
+    base_url: str = 'https://api.todoist.com/sync/v9'
     timeout: float | None = None
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    commands_per_request: int = 100
+    coalesce_commands: bool = True
+    commit_with_sync: bool = True
+    stream_sync: bool = False
+    rate_limit_enabled: bool = True
+    rate_limit_requests: int = 1000
+    rate_limit_period: float = 900.0
+    rate_limit_retries: int = 3
+    read_retry: RetryPolicy = RetryPolicy()
+    write_retry: RetryPolicy = RetryPolicy()
+    journal: bool = False
+    journal_fsync: bool = True
+    auto_flush: bool = False
+    auto_flush_max_commands: int = 100
+    auto_flush_max_age: float = 1.0
+    background_sync: bool = False
+    background_sync_min_interval: float = 5.0
+    background_sync_max_interval: float = 300.0
+    background_sync_backoff: float = 2.0
+    background_sync_jitter: float = 0.1
+    _account_cache_dir: tuple[tuple[Path, str, bool], Path] | None = PrivateAttr(default=None)
     model_config = SettingsConfigDict(env_prefix='todoist_', env_file='.env', env_file_encoding='utf-8', extra='ignore')
+
+    @property
+    def account_cache_dir(self) -> Path:
+        """The directory in which the cache files of the account are stored
+
+        It is derived once from `cache_dir`, `api_key` and `cache_per_account`, and again only if one of them changed. Without an `api_key` it is
+        `cache_dir`. The directory is created by the first cache write.
+        """
+        key = (self.cache_dir, self.api_key, self.cache_per_account)
+        if self._account_cache_dir is None or self._account_cache_dir[0] != key:
+            account_dir = self.cache_dir
+            if self.cache_per_account and self.api_key:
+                account_dir = self.cache_dir / f'todoist_{hashlib.sha256(self.api_key.encode("utf-8")).hexdigest()[:16]}'
+            self._account_cache_dir = (key, account_dir)
+        return self._account_cache_dir[1]
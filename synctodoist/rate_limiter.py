@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from synctodoist.models import Settings
+
+RATE_LIMITED_STATUS_CODES = {429, 503}
+DEFAULT_RETRY_AFTER = 1.0
+
+_limiters: dict[str, 'RateLimiter'] = {}
+_limiters_lock = threading.Lock()
+
+
+class RateLimiter:
+    """
+    Sliding window that paces the requests sent to Todoist
+
+    The limiter remembers when the requests of the last `period` seconds were sent. A request is sent right away if fewer than `requests` requests were
+    sent in the `period` before it, otherwise it waits until the oldest of them leaves the window. So no `period` ever holds more than `requests`
+    requests, not even the first one after the process started, and a steady stream of requests saturates the limit without exceeding it.
+
+    Attributes:
+        capacity: the maximum number of requests in a period
+        period: the length of the period in seconds
+    """
+
+    def __init__(self, requests: int, period: float):
+        """
+        Args:
+            requests: the number of requests allowed in a period
+            period: the length of the period in seconds
+        """
+        self.capacity = requests
+        self.period = period
+        # The times at which the requests of the window are (or will be) sent, in ascending order
+        self._sent: deque[float] = deque()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, requests: int, period: float) -> None:
+        """
+        Change the limit, keeping the requests that were already sent
+
+        Args:
+            requests: the number of requests allowed in a period
+            period: the length of the period in seconds
+        """
+        with self._lock:
+            self.capacity = requests
+            self.period = period
+
+    def _prune(self, now: float) -> None:
+        while self._sent and self._sent[0] <= now - self.period:
+            self._sent.popleft()
+
+    def _next_slot(self, now: float) -> float:
+        slot = max(now, self._blocked_until)
+        if self.capacity <= 0:
+            return slot
+        if len(self._sent) >= self.capacity:
+            slot = max(slot, self._sent[-self.capacity] + self.period)
+        return slot
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            slot = self._next_slot(now)
+            self._sent.append(slot)
+            return slot - now
+
+    @property
+    def budget(self) -> float:
+        """The number of requests that can be sent right now without waiting"""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            return 0.0 if self._blocked_until > now else float(max(self.capacity - len(self._sent), 0))
+
+    def wait_time(self) -> float:
+        """The number of seconds the next request would have to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            return self._next_slot(now) - now
+
+    def acquire(self) -> float:
+        """
+        Reserve a place in the window for a request, blocking until it may be sent
+
+        Returns:
+            The number of seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Reserve a place in the window for a request without blocking the event loop
+
+        Returns:
+            The number of seconds spent waiting
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def defer(self, seconds: float) -> None:
+        """
+        Hold back all requests for the given number of seconds, e.g. after Todoist responded with a `Retry-After` header
+
+        Args:
+            seconds: the number of seconds to wait before the next request
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+def get_rate_limiter(settings: Settings) -> RateLimiter | None:
+    """
+    Get the rate limiter shared by all clients using the API key of settings
+
+    The limiter counts the requests of all these clients. If the rate limit settings of a client differ from those the limiter was configured with, it
+    is configured with the settings of this client, keeping the requests that were already sent.
+
+    Args:
+        settings: the settings holding the API key and the rate limit configuration
+
+    Returns:
+        The `RateLimiter` of the API key, or `None` if rate limiting is disabled
+    """
+    if not settings.rate_limit_enabled:
+        return None
+
+    with _limiters_lock:
+        limiter = _limiters.get(settings.api_key)
+        if limiter is None:
+            limiter = _limiters[settings.api_key] = RateLimiter(requests=settings.rate_limit_requests, period=settings.rate_limit_period)
+        elif (limiter.capacity, limiter.period) != (settings.rate_limit_requests, settings.rate_limit_period):
+            limiter.configure(requests=settings.rate_limit_requests, period=settings.rate_limit_period)
+        return limiter
+
+
+def retry_after(response: httpx.Response) -> float:
+    """
+    Get the number of seconds to wait before retrying a throttled request
+
+    The `Retry-After` header may hold a number of seconds or an HTTP date. If it is missing, the `retry_after` value Todoist sends in the `error_extra`
+    field of the response body is used.
+
+    Args:
+        response: the throttled response
+
+    Returns:
+        The number of seconds to wait
+    """
+    if value := response.headers.get('Retry-After'):
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                return DEFAULT_RETRY_AFTER
+
+    try:
+        return float(response.json()['error_extra']['retry_after'])
+    except (ValueError, KeyError, TypeError):
+        return DEFAULT_RETRY_AFTER
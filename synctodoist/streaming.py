@@ -0,0 +1,157 @@
+import json
+import re
+from typing import Any, Iterable, NamedTuple
+
+from synctodoist.exceptions import TodoistError
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class JSONEvent(NamedTuple):
+    """
+    A value parsed from a streamed JSON object
+
+    Attributes:
+        key: the member of the top-level object the value belongs to
+        value: the parsed value
+        is_item: `True` if `value` is a single element of an array member that is streamed, `False` if it is the complete value of the member
+    """
+    key: str
+    value: Any
+    is_item: bool
+
+
+class IncrementalJSONParser:  # pylint: disable=too-few-public-methods
+    """
+    Incremental parser for a top-level JSON object
+
+    The document is fed in chunks of text. Members whose key is listed in `stream_keys` and whose value is an array are returned element by element, as
+    soon as an element is complete, so the whole array never has to be held in memory. All other members are returned as complete values.
+
+    Examples:
+        >>> parser = IncrementalJSONParser(stream_keys={'items'})
+        >>> list(parser.feed('{"full_sync": true, "items": [{"id": "1"}, {"i'))
+        [JSONEvent(key='full_sync', value=True, is_item=False), JSONEvent(key='items', value={'id': '1'}, is_item=True)]
+    """
+
+    def __init__(self, stream_keys: Iterable[str]):
+        """
+        Args:
+            stream_keys: the keys of the array members that should be returned element by element
+        """
+        self.stream_keys = set(stream_keys)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key = ''
+
+    def _skip_whitespace(self) -> None:
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore
+
+    def _next_char(self) -> str | None:
+        self._skip_whitespace()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _decode(self, final: bool) -> tuple[bool, Any]:
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+
+        # A value that ends with the buffer may be incomplete, e.g. a number split across two chunks
+        if end == len(self._buffer) and not final:
+            return False, None
+
+        self._pos = end
+        return True, value
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char not in expected:
+            raise TodoistError(f'Invalid JSON document: expected one of {expected!r} at position {self._pos}, got {char!r}')
+        self._pos += 1
+
+    def _parse(self, final: bool) -> list[JSONEvent]:  # pylint: disable=too-many-branches
+        events: list[JSONEvent] = []
+        while (char := self._next_char()) is not None:
+            match self._state:
+                case 'start':
+                    self._expect(char, '{')
+                    self._state = 'key'
+                case 'key':
+                    if char == '}':
+                        self._pos += 1
+                        self._state = 'end'
+                        continue
+                    complete, key = self._decode(final)
+                    if not complete:
+                        break
+                    self._key = key
+                    self._state = 'colon'
+                case 'colon':
+                    self._expect(char, ':')
+                    self._state = 'value'
+                case 'value':
+                    if char == '[' and self._key in self.stream_keys:
+                        self._pos += 1
+                        self._state = 'item'
+                        continue
+                    complete, value = self._decode(final)
+                    if not complete:
+                        break
+                    events.append(JSONEvent(self._key, value, False))
+                    self._state = 'member_separator'
+                case 'item':
+                    if char == ']':
+                        self._pos += 1
+                        self._state = 'member_separator'
+                        continue
+                    complete, value = self._decode(final)
+                    if not complete:
+                        break
+                    events.append(JSONEvent(self._key, value, True))
+                    self._state = 'item_separator'
+                case 'item_separator':
+                    self._expect(char, ',]')
+                    self._state = 'item' if char == ',' else 'member_separator'
+                case 'member_separator':
+                    self._expect(char, ',}')
+                    self._state = 'key' if char == ',' else 'end'
+                case 'end':
+                    raise TodoistError(f'Invalid JSON document: unexpected data at position {self._pos}')
+
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return events
+
+    def feed(self, chunk: str) -> list[JSONEvent]:
+        """
+        Parse the next chunk of the document
+
+        Args:
+            chunk: the next part of the document
+
+        Returns:
+            The values that were completed by this chunk
+        """
+        self._buffer += chunk
+        return self._parse(final=False)
+
+    def close(self) -> list[JSONEvent]:
+        """
+        Parse the rest of the document
+
+        Returns:
+            The remaining values
+
+        Raises:
+            TodoistError: if the document is incomplete
+        """
+        events = self._parse(final=True)
+        if self._state != 'end':
+            raise TodoistError('Invalid JSON document: unexpected end of data')
+        return events
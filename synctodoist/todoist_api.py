@@ -1,39 +1,43 @@
-from typing import Any
-
+import threading
+from contextlib import ExitStack, nullcontext
+from itertools import chain
+from time import perf_counter
+from typing import Any, ContextManager
+
+import httpx
+
+from synctodoist import binary_cache, tracing
+from synctodoist.auto_flush import AutoFlusher
+from synctodoist.background_sync import BackgroundSyncer
+from synctodoist.cache_files import CacheLock
+from synctodoist.cache_store import SQLiteCacheStore
+from synctodoist.change_feed import ChangeEvent, ChangeFeed, Predicate, Subscriber
 from synctodoist.exceptions import TodoistError
-from synctodoist.managers import ProjectManager, command_manager, TaskManager, LabelManager, SectionManager, ReminderManager
-from synctodoist.models import Task, Project, Label, Section, TodoistBaseModel, Reminder, Settings
+from synctodoist.hydration import Hydrator, paused_gc
+from synctodoist.journal import CommandJournal
+from synctodoist.metrics import MetricsRegistry
+from synctodoist.managers import ProjectManager, TaskManager, LabelManager, SectionManager, ReminderManager
+from synctodoist.managers.base_manager import BaseManager
+from synctodoist.managers.command_manager import CommandManager, build_client
+from synctodoist.models import Task, Project, Label, Section, TodoistBaseModel, Reminder, Settings, CacheBackendEnum, ResourceChanges
+from synctodoist.rate_limiter import RateLimiter, get_rate_limiter
+from synctodoist.streaming import JSONEvent
 
 CACHE_MAPPING = {x.TodoistConfig.cache_label: x for x in TodoistBaseModel.__subclasses__()}
 RESOURCE_TYPES = [x.TodoistConfig.todoist_resource_type for x in TodoistBaseModel.__subclasses__()]
+RESOURCE_MAPPING = {x.TodoistConfig.todoist_resource_type: x.TodoistConfig.cache_label for x in TodoistBaseModel.__subclasses__()}
 
 
-class TodoistAPI:  # pylint: disable=too-many-instance-attributes,missing-class-docstring,line-too-long
-    def __init__(self, settings: Settings | None = None, **kwargs):
-        """
-        You can initialize TodoistAPI in two ways: either with a `Settings` object in the settings argument, or you can provide your settings as arguments to
-        the initializer. These will be passed on directly to the initializer of the `Settings` object.
-
-        The `Settings` model will try to infer your settings from environment variables, and you can configure it to use Docker secrets inside containers.
-        For more details, please, check the documentation of the `Settings` model.
-
-        Examples:
-            >>> from synctodoist import TodoistAPI
-            >>> api = TodoistAPI()
-
-
-            or
-
-            >>> from synctodoist import TodoistAPI
-            >>> from synctodoist.models import Settings
-            >>> settings = Settings(...)
-            >>> api = TodoistAPI(settings=settings)
-
-            or
+class BaseTodoistAPI:  # pylint: disable=too-many-instance-attributes,line-too-long
+    """
+    Shared functionality of `TodoistAPI` and `AsyncTodoistAPI`.
 
-            >>> from synctodoist import TodoistAPI
-            >>> api = TodoistAPI(api_key="...", cache_dir="...")
+    This class holds the managers and all methods that only work with the local state (queueing commands, looking up synced items). It is never
+    instantiated directly.
+    """
 
+    def __init__(self, settings: Settings | None = None, **kwargs):
+        """
         Args:
             settings: an instance of the `Settings` class
             **kwargs: keyword arguments that should be passed on to the `Settings` object. These will be passed on only if the `settings` argument is not provided.
@@ -44,25 +48,173 @@ class TodoistAPI:  # pylint: disable=too-many-instance-attributes,missing-class-
             self.settings = Settings(**kwargs)
 
         self.synced = False
-        self.projects: ProjectManager = ProjectManager(settings=self.settings)
-        self.tasks: TaskManager = TaskManager(settings=self.settings)
-        self.labels: LabelManager = LabelManager(settings=self.settings)
-        self.sections: SectionManager = SectionManager(settings=self.settings)
-        self.reminders: ReminderManager = ReminderManager(settings=self.settings)
+        self.last_sync_changes: dict[str, ResourceChanges] = {}
+        self._change_feed = ChangeFeed()
+        self._pending_events: dict[str, list[ChangeEvent] | None] = {}
+        self.command_manager = CommandManager(self.settings)
+        self.tasks: TaskManager = TaskManager(settings=self.settings, command_manager=self.command_manager)
+        self.projects: ProjectManager = ProjectManager(settings=self.settings, command_manager=self.command_manager, tasks=self.tasks)
+        self.labels: LabelManager = LabelManager(settings=self.settings, command_manager=self.command_manager)
+        self.sections: SectionManager = SectionManager(settings=self.settings, command_manager=self.command_manager)
+        self.reminders: ReminderManager = ReminderManager(settings=self.settings, command_manager=self.command_manager)
+
+        self._cache_lock: CacheLock | None = None
+        if self.settings.cache_backend == CacheBackendEnum.sqlite:
+            self.command_manager.cache_store = SQLiteCacheStore(self.settings.account_cache_dir / 'todoist_cache.sqlite3')
+        elif self.settings.cache_backend == CacheBackendEnum.binary:
+            binary_cache.require_msgpack()
+
+        if self.settings.cache_lock and not self.command_manager.cache_store:
+            self._cache_lock = CacheLock(self.settings.account_cache_dir / 'todoist_cache.lock')
 
-        command_manager.settings = self.settings
+        if self.settings.journal:
+            self.command_manager.journal = CommandJournal(self.settings.account_cache_dir / 'todoist_journal.jsonl', fsync=self.settings.journal_fsync)
+            self.command_manager.replay_journal()
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """
+        The rate limiter shared by all clients using the same API key
+
+        Use its `budget` attribute and `wait_time()` method to check how many requests can be sent right now, and how long the next request would have to
+        wait. `None` if rate limiting is disabled in the settings.
+        """
+        return get_rate_limiter(self.settings)
+
+    @property
+    def metrics(self) -> MetricsRegistry:
+        """
+        The metrics collected by the client
+
+        Use its `snapshot()` method to get the current values, or register a callback with `add_exporter()` to receive a snapshot after every sync.
+        """
+        return self.command_manager.metrics
 
     # region PRIVATE METHODS
 
     def _write_all_caches(self):
-        for key in CACHE_MAPPING:
-            target = getattr(self, key)
-            target._write_cache()  # pylint: disable=protected-access
+        if self.command_manager.cache_store:
+            self._write_sqlite_cache(self.command_manager.cache_store)
+            return
+
+        with tracing.span('sync.write_caches'):
+            for key in CACHE_MAPPING:
+                target = getattr(self, key)
+                target._write_cache()  # pylint: disable=protected-access
+
+    def _write_sqlite_cache(self, cache_store: SQLiteCacheStore) -> None:
+        # Only the rows touched since the last write are changed, and the sync token is stored in the same transaction
+        managers = [getattr(self, key) for key in CACHE_MAPPING]
+        with tracing.span('sync.write_caches', backend='sqlite') as span, self.metrics.timer('cache.write.sqlite'):
+            changes = {manager.model.TodoistConfig.todoist_resource_type: manager._cache_changes() for manager in managers}  # pylint: disable=protected-access
+            span.set_attribute('upserted_count', sum(len(resource_changes.upserted) for resource_changes in changes.values()))
+            span.set_attribute('deleted_count', sum(len(resource_changes.deleted) for resource_changes in changes.values()))
+            generations = cache_store.write(changes, sync_token=self.command_manager.sync_token)
+
+        for manager in managers:
+            manager._clear_cache_changes()  # pylint: disable=protected-access
+            manager._cache_generation = generations[manager.model.TodoistConfig.todoist_resource_type]  # pylint: disable=protected-access
+
+    def _locked_caches(self, exclusive: bool = False) -> ContextManager[None]:
+        if not self._cache_lock:
+            return nullcontext()
+        return self._cache_lock.exclusive() if exclusive else self._cache_lock.shared()
+
+    def _read_sync_state(self, full_sync: bool = False) -> None:
+        # The sync token and the caches are read under one lock, so they belong to the same sync even if another process writes them concurrently
+        with self._locked_caches():
+            if not full_sync:
+                self.command_manager.read_sync_token()
+            self._read_all_caches()
+
+    def _write_sync_state(self) -> None:
+        # The sync token is written last: after a crash the caches can only be newer than the token, and the next partial sync applies the changes again
+        with self._locked_caches(exclusive=True):
+            self._write_all_caches()
+            if not self.command_manager.cache_store:
+                # The SQLite cache stores the sync token in the same transaction as the items
+                with tracing.span('sync.write_sync_token'):
+                    self.command_manager.write_sync_token()
+
+    def _read_all_caches(self, force: bool = False):
+        with tracing.span('sync.read_caches', force=force):
+            for key in CACHE_MAPPING:
+                target = getattr(self, key)
+                target._read_cache(force=force)  # pylint: disable=protected-access
+
+    def _sync_arguments(self) -> dict[str, Any]:
+        arguments = {}
+        if self.settings.timeout:
+            arguments['timeout'] = self.settings.timeout
+        return arguments
 
-    def _read_all_caches(self):
+    def _changing_managers(self) -> ExitStack:
+        # Every manager publishes the changes of a sync at once when the stack is closed, so readers never see a partly applied sync
+        stack = ExitStack()
         for key in CACHE_MAPPING:
+            stack.enter_context(getattr(self, key)._publishing())  # pylint: disable=protected-access
+        return stack
+
+    def _apply_sync_result(self, result: Any) -> None:
+        changes: dict[str, ResourceChanges] = {}
+        events = self._event_lists()
+        with self._changing_managers():
+            for key in CACHE_MAPPING:
+                target = getattr(self, key)
+                resource_type = CACHE_MAPPING[key].TodoistConfig.todoist_resource_type
+                records = result[resource_type]
+                changes[key] = ResourceChanges(full_sync=result['full_sync'])
+                with tracing.span('sync.hydrate', resource_type=resource_type, item_count=len(records)), \
+                        self.metrics.timer(f'sync.model_construction.{resource_type}'), paused_gc():
+                    hydrate = target._hydrator()  # pylint: disable=protected-access
+                    for record in records:
+                        target._apply_record(record, hydrate, changes[key], events[key])  # pylint: disable=protected-access
+                target._record_hydration(hydrate)  # pylint: disable=protected-access
+                if result['full_sync']:
+                    target._remove_deleted({x['id'] for x in records}, changes[key], events[key])  # pylint: disable=protected-access
+
+        self._finish_sync(result, changes, events)
+
+    def _finish_sync(self, result: dict[str, Any], changes: dict[str, ResourceChanges], events: dict[str, list[ChangeEvent] | None]) -> None:
+        self.last_sync_changes = changes
+        self._pending_events = events
+        self.metrics.increment('syncs.full' if result['full_sync'] else 'syncs.partial')
+
+    def _event_lists(self) -> dict[str, list[ChangeEvent] | None]:
+        # Events are only created for the resource types someone subscribed to
+        return {key: [] if self._change_feed.wants(key) else None for key in CACHE_MAPPING}
+
+    def _publish_changes(self) -> None:
+        # Called after the sync was stored, so an exception raised by a subscriber cannot prevent it
+        events, self._pending_events = self._pending_events, {}
+        self._change_feed.publish(chain.from_iterable(resource_events for resource_events in events.values() if resource_events))
+
+    def _hydrators(self) -> dict[str, Hydrator]:
+        return {resource_type: getattr(self, key)._hydrator() for resource_type, key in RESOURCE_MAPPING.items()}  # pylint: disable=protected-access
+
+    def _apply_sync_event(self, event: JSONEvent, result: dict[str, Any], changes: dict[str, ResourceChanges], construction_time: dict[str, float],  # pylint: disable=too-many-arguments
+                          hydrators: dict[str, Hydrator], events: dict[str, list[ChangeEvent] | None]) -> None:
+        if not event.is_item:
+            result[event.key] = event.value
+            return
+
+        key = RESOURCE_MAPPING[event.key]
+        start = perf_counter()
+        getattr(self, key)._apply_record(event.value, hydrators[event.key], changes[key], events[key])  # pylint: disable=protected-access
+        construction_time[event.key] += perf_counter() - start
+
+    def _finish_streamed_sync(self, result: dict[str, Any], changes: dict[str, ResourceChanges], construction_time: dict[str, float],  # pylint: disable=too-many-arguments
+                              hydrators: dict[str, Hydrator], events: dict[str, list[ChangeEvent] | None]) -> None:
+        for resource_type, key in RESOURCE_MAPPING.items():
             target = getattr(self, key)
-            target._read_cache()  # pylint: disable=protected-access
+            target._record_hydration(hydrators[resource_type])  # pylint: disable=protected-access
+            changes[key].full_sync = result['full_sync']
+            if result['full_sync']:
+                received_ids = {*changes[key].added, *changes[key].updated}
+                target._remove_deleted(received_ids, changes[key], events[key])  # pylint: disable=protected-access
+            self.metrics.observe(f'sync.model_construction.{resource_type}', construction_time[resource_type])
+
+        self._finish_sync(result, changes, events)
 
     # endregion
 
@@ -80,66 +232,33 @@ class TodoistAPI:  # pylint: disable=too-many-instance-attributes,missing-class-
         model_manager = getattr(self, key)
         model_manager.add(item=item)
 
-    def commit(self) -> Any:
-        """Commit open commands to Todoist.
+    def subscribe(self, subscriber: Subscriber, manager: BaseManager | None = None, predicate: Predicate | None = None) -> None:
+        """Register a callback that receives the changes applied by every `sync()` and `commit()`
 
-        Commands are processed in batches to be frugal with the request limits defined by the Todoist API (check
-        [Limits](https://developer.todoist.com/sync/v9/#request-limits) in the Todoist developer documentation for more details).
-
-        Examples:
-            >>> from synctodoist import TodoistAPI
-            >>> api = TodoistAPI()
-            >>> api.commit()
-
-        Raises:
-            TodoistError: if the Todoist Sync API responds with an error to your request.
-        """
-        result = command_manager.commit()
-
-        self.sync()
-        return result
-
-    def sync(self, full_sync: bool = False) -> bool:
-        """Synchronize with Todoist API
+        The callback is called once per added, updated or deleted item with a `ChangeEvent` holding the field values before and after the sync, after the
+        sync was stored.
 
         Examples:
             >>> from synctodoist import TodoistAPI
             >>> api = TodoistAPI()
+            >>> api.subscribe(print, manager=api.tasks, predicate=lambda event: 'priority' in event.changed_fields)
             >>> api.sync()
 
         Args:
-            full_sync: Set to `True` if you would like to perform a full synchronization, or `False` if you prefer a partial sync.
-
-        Returns:
-            `True` if a full sync was performed, `False` otherwise
-
-        Raises:
-            TodoistError: if the synchronization fails
+            subscriber: a callable that accepts a `ChangeEvent`
+            manager: the manager whose changes are passed to `subscriber`, e.g. `api.tasks`. The changes of all managers if `None`.
+            predicate: a callable that accepts a `ChangeEvent` and returns `True` if it should be passed to `subscriber`
         """
-        if not full_sync:
-            command_manager.read_sync_token()
-
-        self._read_all_caches()
-
-        data = {'resource_types': RESOURCE_TYPES}
-        arguments = {}
-        if self.settings.timeout:
-            arguments['timeout'] = self.settings.timeout
-        result = command_manager.post(data, 'sync', **arguments)
-
-        for key in CACHE_MAPPING:
-            target = getattr(self, key)
-            model = CACHE_MAPPING[key]
-            # Add new items
-            target._dict_update({x['id']: model(**x) for x in result[model.TodoistConfig.todoist_resource_type]})  # pylint: disable=protected-access
-            # Remove deleted items
-            target._remove_deleted(result[model.TodoistConfig.todoist_resource_type], result['full_sync'])  # pylint: disable=protected-access
+        resource = manager.model.TodoistConfig.cache_label if manager is not None else None
+        self._change_feed.subscribe(subscriber, resource=resource, predicate=predicate)
 
-        self._write_all_caches()
-        command_manager.write_sync_token()
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Unregister a callback
 
-        self.synced = True
-        return result['full_sync']  # type: ignore
+        Args:
+            subscriber: the callable passed to `subscribe()`
+        """
+        self._change_feed.unsubscribe(subscriber)
 
     # endregion
 
@@ -272,23 +391,6 @@ class TodoistAPI:  # pylint: disable=too-many-instance-attributes,missing-class-
         """
         return self.projects.find(pattern=pattern, field='name', return_all=return_all)
 
-    def get_project(self, project_id: int | str) -> Project:
-        """Get project by id
-
-        Note:
-            This is convenience wrapper for TodoistAPI.projects.get(project_id)
-
-        Args:
-            project_id: the id of the project
-
-        Returns:
-            A `Project` instance with all project details
-
-        Raises:
-            TodoistError: if `project_id` is not found
-        """
-        return self.projects.get(item_id=project_id)
-
     def update_project(self, project_id: int | str | Project, project: Project):
         """
         Update the project identified by project_id with the data from project
@@ -512,23 +614,6 @@ class TodoistAPI:  # pylint: disable=too-many-instance-attributes,missing-class-
         """
         return self.tasks.find(pattern=pattern, field='content', return_all=return_all)
 
-    def get_task(self, task_id: int | str) -> Task:
-        """Get task by id
-
-        Note:
-            This is convenience wrapper for TodoistAPI.tasks.get(project_id)
-
-        Args:
-            task_id: the id of the task
-
-        Returns:
-            A Task instance with all task details
-
-        Raises:
-            TodoistError: if `task_id` is not found
-        """
-        return self.tasks.get(item_id=task_id)
-
     def move_task(self, task: Task, parent: str | int | Task | None = None, section: str | int | Section | None = None,
                   project: str | int | Project | None = None) -> None:
         """
@@ -582,6 +667,270 @@ class TodoistAPI:  # pylint: disable=too-many-instance-attributes,missing-class-
         self.tasks.update(item=task_id, updated_item=task)
 
     # endregion
+    # endregion
+
+
+class TodoistAPI(BaseTodoistAPI):
+    """Blocking client for the Todoist Sync API"""
+
+    def __init__(self, settings: Settings | None = None, transport: httpx.BaseTransport | None = None, **kwargs):
+        """
+        You can initialize TodoistAPI in two ways: either with a `Settings` object in the settings argument, or you can provide your settings as arguments to
+        the initializer. These will be passed on directly to the initializer of the `Settings` object.
+
+        The `Settings` model will try to infer your settings from environment variables, and you can configure it to use Docker secrets inside containers.
+        For more details, please, check the documentation of the `Settings` model.
+
+        Examples:
+            >>> from synctodoist import TodoistAPI
+            >>> api = TodoistAPI()
+
+
+            or
+
+            >>> from synctodoist import TodoistAPI
+            >>> from synctodoist.models import Settings
+            >>> settings = Settings(...)
+            >>> api = TodoistAPI(settings=settings)
+
+            or
+
+            >>> from synctodoist import TodoistAPI
+            >>> api = TodoistAPI(api_key="...", cache_dir="...")
+
+        `TodoistAPI` owns a pooled, keep-alive HTTP client that is reused by all requests. Call `close()` when you no longer need the instance, or use it
+        as a context manager to release the connections automatically:
+
+            >>> from synctodoist import TodoistAPI
+            >>> with TodoistAPI() as api:
+            ...     api.sync()
+
+        To send the requests somewhere else than the network, e.g. to an in-process fake of the Sync API, pass a custom httpx transport:
+
+            >>> from synctodoist import TodoistAPI
+            >>> from synctodoist.fake_server import FakeSyncAPI
+            >>> api = TodoistAPI(api_key="...", transport=FakeSyncAPI().transport())
+
+        Args:
+            settings: an instance of the `Settings` class
+            transport: a custom httpx transport used by the HTTP client instead of the network
+            **kwargs: keyword arguments that should be passed on to the `Settings` object. These will be passed on only if the `settings` argument is not
+                provided.
+        """
+        super().__init__(settings=settings, **kwargs)
+
+        # Syncs and commits of several threads, e.g. the background sync and a web worker, are applied one after the other
+        self._sync_lock = threading.RLock()
+        self.client = build_client(self.settings, transport=transport)
+        self.command_manager.client = self.client
+        self.command_manager.transport = transport
+
+        self.auto_flusher: AutoFlusher | None = None
+        if self.settings.auto_flush:
+            self.start_auto_flush()
+
+        self.background_syncer: BackgroundSyncer | None = None
+        if self.settings.background_sync:
+            self.start_background_sync()
+
+    def __enter__(self) -> 'TodoistAPI':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the HTTP client and release all pooled connections
+
+        If automatic commits are enabled, the background thread is stopped and the remaining commands are committed first. Background syncs are stopped
+        as well.
+
+        Examples:
+            >>> from synctodoist import TodoistAPI
+            >>> api = TodoistAPI()
+            >>> api.sync()
+            >>> api.close()
+        """
+        self.stop_background_sync()
+        self.stop_auto_flush()
+        self.client.close()
+
+    def start_auto_flush(self) -> None:
+        """Commit queued commands automatically in a background thread
+
+        The queue is committed when it holds `Settings.auto_flush_max_commands` commands or its oldest command has been waiting for
+        `Settings.auto_flush_max_age` seconds. This is started automatically if `Settings.auto_flush` is `True`.
+        """
+        if not self.auto_flusher:
+            self.auto_flusher = AutoFlusher(self, max_commands=self.settings.auto_flush_max_commands, max_age=self.settings.auto_flush_max_age)
+        self.auto_flusher.start()
+
+    def stop_auto_flush(self, flush: bool = True) -> None:
+        """Stop committing queued commands automatically
+
+        Args:
+            flush: set to `False` to leave the queued commands uncommitted
+        """
+        if self.auto_flusher:
+            self.auto_flusher.stop(flush=flush)
+            self.auto_flusher = None
+
+    def start_background_sync(self) -> None:
+        """Sync automatically in a background thread
+
+        The interval between two syncs grows from `Settings.background_sync_min_interval` up to `Settings.background_sync_max_interval` while the syncs
+        receive no changes, and drops back to the minimum after changes were received or commands were queued. Use the `health` property of
+        `background_syncer` to monitor it. This is started automatically if `Settings.background_sync` is `True`.
+        """
+        if not self.background_syncer:
+            self.background_syncer = BackgroundSyncer(self, min_interval=self.settings.background_sync_min_interval,
+                                                      max_interval=self.settings.background_sync_max_interval, backoff=self.settings.background_sync_backoff,
+                                                      jitter=self.settings.background_sync_jitter)
+        self.background_syncer.start()
+
+    def stop_background_sync(self) -> None:
+        """Stop syncing automatically, after the running sync has finished"""
+        if self.background_syncer:
+            self.background_syncer.stop()
+            self.background_syncer = None
+
+    def flush(self) -> None:
+        """Commit all queued commands and wait until the commit is finished
+
+        Unlike `commit()`, this is safe to call while automatic commits are running in the background.
+
+        Raises:
+            TodoistError: if the commit fails
+        """
+        if self.auto_flusher:
+            self.auto_flusher.flush()
+        elif self.command_manager.commands:
+            self.commit()
+
+    def commit(self) -> Any:
+        """Commit open commands to Todoist.
+
+        Commands are processed in batches of at most `Settings.commands_per_request` commands to respect the request limits defined by the Todoist API (check
+        [Limits](https://developer.todoist.com/sync/v9/#request-limits) in the Todoist developer documentation for more details).
+
+        Unless `Settings.commit_with_sync` is disabled, the last batch also requests the changes of all resources, so the local state is synchronized in the
+        same round trip instead of a separate `sync()` call.
+
+        Examples:
+            >>> from synctodoist import TodoistAPI
+            >>> api = TodoistAPI()
+            >>> api.commit()
+
+        Raises:
+            TodoistBatchError: if the Todoist Sync API rejects commands of a batch. Batches after the failed one stay in the queue.
+        """
+        with self._sync_lock, tracing.span('commit', command_count=len(self.command_manager.commands)):
+            if not self.settings.commit_with_sync:
+                result = self.command_manager.commit()
+                self.sync()
+                return result
+
+            self._read_sync_state()
+            result = self.command_manager.commit(resource_types=RESOURCE_TYPES)
+            if not all(resource_type in result for resource_type in RESOURCE_TYPES):
+                # Nothing was committed, so no resources were received
+                self.sync()
+                return result
+
+            self._store_sync_result(result)
+            return result
+
+    def sync(self, full_sync: bool = False) -> bool:
+        """Synchronize with Todoist API
+
+        Examples:
+            >>> from synctodoist import TodoistAPI
+            >>> api = TodoistAPI()
+            >>> api.sync()
+
+        Args:
+            full_sync: Set to `True` if you would like to perform a full synchronization, or `False` if you prefer a partial sync.
+
+        Returns:
+            `True` if a full sync was performed, `False` otherwise
+
+        Raises:
+            TodoistError: if the synchronization fails
+        """
+        with self._sync_lock, tracing.span('sync', streamed=self.settings.stream_sync) as span:
+            self._read_sync_state(full_sync)
+
+            data = {'resource_types': RESOURCE_TYPES}
+            if self.settings.stream_sync:
+                full_sync = self._streamed_sync(data)
+            else:
+                result = self.command_manager.post(data, 'sync', **self._sync_arguments())
+                self._store_sync_result(result)
+                full_sync = result['full_sync']
+
+            span.set_attribute('full_sync', full_sync)
+            return full_sync
+
+    def _streamed_sync(self, data: dict[str, Any]) -> bool:
+        result: dict[str, Any] = {}
+        changes = {key: ResourceChanges() for key in CACHE_MAPPING}
+        construction_time = dict.fromkeys(RESOURCE_TYPES, 0.0)
+        hydrators = self._hydrators()
+        events = self._event_lists()
+        # Items are hydrated while the response is downloaded, so both phases are traced as one span
+        with self._changing_managers():
+            with tracing.span('sync.stream') as span:
+                for event in self.command_manager.post_stream(data, 'sync', stream_keys=RESOURCE_TYPES, **self._sync_arguments()):
+                    self._apply_sync_event(event, result, changes, construction_time, hydrators, events)
+                span.set_attribute('item_count', sum(resource_changes.count for resource_changes in changes.values()))
+
+            self._finish_streamed_sync(result, changes, construction_time, hydrators, events)
+        self._store_sync_state()
+        return result['full_sync']  # type: ignore
+
+    def _store_sync_result(self, result: Any) -> None:
+        self._apply_sync_result(result)
+        self._store_sync_state()
+
+    def _store_sync_state(self) -> None:
+        self._write_sync_state()
+        self.synced = True
+        self.metrics.export()
+        self._publish_changes()
+
+    def get_project(self, project_id: int | str) -> Project:
+        """Get project by id
+
+        Note:
+            This is convenience wrapper for TodoistAPI.projects.get(project_id)
+
+        Args:
+            project_id: the id of the project
+
+        Returns:
+            A `Project` instance with all project details
+
+        Raises:
+            TodoistError: if `project_id` is not found
+        """
+        return self.projects.get(item_id=project_id)
+
+    def get_task(self, task_id: int | str) -> Task:
+        """Get task by id
+
+        Note:
+            This is convenience wrapper for TodoistAPI.tasks.get(project_id)
+
+        Args:
+            task_id: the id of the task
+
+        Returns:
+            A Task instance with all task details
+
+        Raises:
+            TodoistError: if `task_id` is not found
+        """
+        return self.tasks.get(item_id=task_id)
 
     # region User methods
     def get_stats(self) -> dict:
@@ -590,8 +939,7 @@ class TodoistAPI:  # pylint: disable=too-many-instance-attributes,missing-class-
         Returns:
             A dict with all user stats
         """
-        return command_manager.get('completed/get_stats')  # type: ignore
-    # endregion
+        return self.command_manager.get('completed/get_stats')  # type: ignore
     # endregion
 
 
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+
+_hooks: list[TraceHook] = []
+_hooks_lock = threading.Lock()
+_current_span: ContextVar[Span | None] = ContextVar('synctodoist_current_span', default=None)
+
+
+class TraceHook:
+    """
+    Receives the spans of the client, e.g. to forward them to OpenTelemetry
+
+    Subclass it and override the methods you need, then register an instance with `add_hook()`.
+
+    Examples:
+        >>> from synctodoist import tracing
+        >>> class PrintHook(tracing.TraceHook):
+        ...     def on_end(self, span):
+        ...         print(span.name, span.duration, span.attributes)
+        >>> tracing.add_hook(PrintHook())
+    """
+
+    def on_start(self, trace_span: Span) -> None:
+        """Called when a span starts"""
+
+    def on_end(self, trace_span: Span) -> None:
+        """Called when a span ends. Its `duration`, `error` and all attributes set while it was running are available."""
+
+
+class Span:  # pylint: disable=too-many-instance-attributes
+    """
+    A timed phase of an operation, e.g. the HTTP request or the cache write of a `sync()`
+
+    Attributes:
+        name: the name of the phase, e.g. `sync.write_caches`
+        attributes: details of the phase, e.g. `item_count` or `bytes_received`
+        parent: the span that was running when this span started
+        start: the `perf_counter()` value at the start of the span
+        end: the `perf_counter()` value at the end of the span, `None` while it is running
+        error: the exception that ended the span, if any
+    """
+
+    def __init__(self, name: str, attributes: dict[str, Any], hooks: list[TraceHook]):
+        self.name = name
+        self.attributes = attributes
+        self.parent: Span | None = None
+        self.start = 0.0
+        self.end: float | None = None
+        self.error: BaseException | None = None
+        self._hooks = hooks
+        self._token: Any = None
+
+    @property
+    def duration(self) -> float | None:
+        """The duration of the span in seconds, `None` while it is running"""
+        return None if self.end is None else self.end - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Add a detail to the span"""
+        self.attributes[key] = value
+
+    def __enter__(self) -> Span:
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = perf_counter()
+        for hook in self._hooks:
+            hook.on_start(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.end = perf_counter()
+        self.error = exc_val
+        _current_span.reset(self._token)
+        for hook in self._hooks:
+            hook.on_end(self)
+
+
+class _NoopSpan:
+    """Returned by `span()` if no hook is registered, so tracing costs nothing but a function call"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore the attribute"""
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """
+    Create a span to be used as a context manager
+
+    Args:
+        name: the name of the phase
+        **attributes: the initial attributes of the span
+
+    Returns:
+        A `Span`, or a shared no-op span if no hook is registered
+
+    Examples:
+        >>> with span('sync.write_caches') as current:
+        ...     current.set_attribute('item_count', 10)
+    """
+    if not _hooks:
+        return _NOOP_SPAN
+    return Span(name, attributes, list(_hooks))
+
+
+def is_enabled() -> bool:
+    """`True` if at least one hook is registered. Use it to skip computing expensive attributes."""
+    return bool(_hooks)
+
+
+def add_hook(hook: TraceHook) -> None:
+    """
+    Register a hook that receives all spans
+
+    Args:
+        hook: the hook to register
+    """
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: TraceHook) -> None:
+    """
+    Unregister a hook
+
+    Args:
+        hook: the hook passed to `add_hook()`
+    """
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
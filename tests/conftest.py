@@ -6,14 +6,16 @@ import pytest
 
 from synctodoist import TodoistAPI
 from synctodoist.exceptions import TodoistError
-from synctodoist.managers import command_manager
 from synctodoist.models import Task, Due, Project, Label, Section, Reminder, ReminderTypeEnum, Settings
 
+created_apis = []
+
 
 @pytest.fixture()
 def todoist():
     settings = Settings(_env_file='.env', timeout=30)
     todoist = TodoistAPI(settings=settings)
+    created_apis.append(todoist)
     return todoist
 
 
@@ -21,6 +23,7 @@ def todoist():
 def synced_todoist():
     settings = Settings(_env_file='.env', timeout=30)
     todoist = TodoistAPI(settings=settings)
+    created_apis.append(todoist)
     todoist.sync()
     return todoist
 
@@ -94,6 +97,10 @@ def print_total_todoist_count():
     print('\n\n')
     print('Todoist Call Summary')
     print('-' * 30)
-    print(f'{command_manager.full_sync_count = }')
-    print(f'{command_manager.partial_sync_count = }')
+    counters = {}
+    for api in created_apis:
+        for name, value in api.metrics.snapshot()['counters'].items():
+            counters[name] = counters.get(name, 0) + value
+    for name in sorted(counters):
+        print(f'{name} = {counters[name]}')
     print('-' * 30)
@@ -0,0 +1,67 @@
+# pylint: disable-all
+import asyncio
+import json
+
+import httpx
+
+from synctodoist import AsyncTodoistAPI
+from synctodoist.fake_server import FakeSyncAPI
+
+EMPTY_SYNC = {'sync_token': 'TOKEN', 'full_sync': True, 'projects': [{'id': '1', 'name': 'Inbox'}], 'items': [], 'labels': [], 'sections': [],
+              'reminders': []}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith('/items/get'):
+        return httpx.Response(200, json={'item': {'id': '42', 'content': 'remote task'}})
+    if request.url.path.endswith('/completed/get_stats'):
+        return httpx.Response(200, json={'karma': 10})
+    return httpx.Response(200, json=EMPTY_SYNC)
+
+
+def test_async_sync_and_get(tmp_path):
+    async def run():
+        async with AsyncTodoistAPI(api_key='Test', cache_dir=tmp_path) as api:
+            api.client = api.command_manager.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            assert await api.sync(full_sync=True)
+            project = await api.get_project(project_id='1')
+            task = await api.get_task(task_id='42')
+            stats = await api.get_stats()
+            return api, project, task, stats
+
+    api, project, task, stats = asyncio.run(run())
+    assert project.name == 'Inbox'
+    assert task.content == 'remote task'
+    assert stats['karma'] == 10
+    assert api.command_manager.sync_token == 'TOKEN'
+    assert (api.settings.account_cache_dir / 'todoist_projects.json').exists()
+
+
+def test_concurrent_syncs_are_serialized(tmp_path):
+    fake = FakeSyncAPI(latency=0.01)
+    fake.populate(tasks=20)
+
+    async def run():
+        async with AsyncTodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.async_transport()) as api:
+            active, overlaps = [], []
+            post_async = api.command_manager.post_async
+
+            async def tracked_post_async(*args, **kwargs):
+                overlaps.append(len(active))
+                active.append(1)
+                try:
+                    return await post_async(*args, **kwargs)
+                finally:
+                    active.pop()
+
+            api.command_manager.post_async = tracked_post_async
+            await api.sync()
+            fake.touch('items', 5)
+            await asyncio.gather(api.sync(), api.sync(), api.commit())
+            return api, overlaps
+
+    api, overlaps = asyncio.run(run())
+    assert not any(overlaps)
+    assert api.command_manager.sync_token == str(fake.version)
+    assert json.loads((api.settings.account_cache_dir / 'todoist_sync_token.json').read_text(encoding='utf-8')) == {'sync_token': str(fake.version)}
+    assert len(api.tasks) == 20
@@ -0,0 +1,60 @@
+# pylint: disable-all
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+import httpx
+
+from synctodoist import TodoistAPI, AsyncTodoistAPI
+from synctodoist.models import Task
+
+EMPTY_SYNC = {'full_sync': False, 'projects': [], 'items': [], 'labels': [], 'sections': [], 'reminders': []}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    form = parse_qs(request.content.decode())
+    if 'commands' in form:
+        batch = json.loads(form['commands'][0])
+        return httpx.Response(200, json={'sync_status': {command['uuid']: 'ok' for command in batch}, 'temp_id_mapping': {}, 'full_sync': False})
+    return httpx.Response(200, json=EMPTY_SYNC)
+
+
+def test_auto_flush_by_size(monkeypatch, tmp_path):
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path, auto_flush=True, auto_flush_max_commands=2, auto_flush_max_age=60)
+    monkeypatch.setattr(api.command_manager, 'client', httpx.Client(transport=httpx.MockTransport(handler)))
+
+    api.add_task(Task(content='first'))
+    time.sleep(0.05)
+    assert len(api.command_manager.commands) == 1
+
+    api.add_task(Task(content='second'))
+    deadline = time.monotonic() + 2
+    while api.command_manager.commands and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not api.command_manager.commands
+    api.close()
+    assert api.auto_flusher is None
+
+
+def test_flush_barrier_on_close(monkeypatch, tmp_path):
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path, auto_flush=True, auto_flush_max_commands=100, auto_flush_max_age=60)
+    monkeypatch.setattr(api.command_manager, 'client', httpx.Client(transport=httpx.MockTransport(handler)))
+
+    api.add_task(Task(content='waiting'))
+    assert len(api.command_manager.commands) == 1
+
+    api.close()
+    assert not api.command_manager.commands
+
+
+def test_async_auto_flush_by_age(tmp_path):
+    async def run():
+        async with AsyncTodoistAPI(api_key='Test', cache_dir=tmp_path, auto_flush=True, auto_flush_max_age=0.05) as api:
+            api.client = api.command_manager.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            api.add_task(Task(content='aged'))
+            await asyncio.sleep(0.3)
+            return len(api.command_manager.commands)
+
+    assert asyncio.run(run()) == 0
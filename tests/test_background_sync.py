@@ -0,0 +1,122 @@
+# pylint: disable-all
+import asyncio
+import time
+
+import pytest
+
+from synctodoist import AsyncTodoistAPI, TodoistAPI
+from synctodoist.background_sync import _SyncPolicy
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.rate_limiter import RateLimiter
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_interval_adapts_to_changes():
+    policy = _SyncPolicy(min_interval=1.0, max_interval=5.0, backoff=2.0, jitter=0.0)
+    assert policy.time_until_due(None) == 0.0
+
+    policy.succeeded(change_count=0)
+    policy.succeeded(change_count=0)
+    assert policy.interval == 4.0
+    policy.failed(RuntimeError('offline'))
+    assert policy.interval == 5.0
+    assert 4.9 < policy.time_until_due(None) <= 5.0
+    assert policy.health(running=True).consecutive_failures == 1
+    assert not policy.health(running=True).healthy
+
+    policy.activity()
+    assert policy.interval == 1.0
+    assert policy.time_until_due(None) <= 1.0
+    policy.activity(immediate=True)
+    assert policy.time_until_due(None) == 0.0
+
+    policy.succeeded(change_count=0)
+    policy.succeeded(change_count=3)
+    assert policy.interval == 1.0
+    assert policy.health(running=True).healthy
+    assert policy.health(running=True).last_change_at == policy.last_sync_at
+
+    limiter = RateLimiter(requests=10, period=10)
+    limiter.defer(3.0)
+    assert policy.time_until_due(limiter) > 2.9
+
+
+def test_jitter_spreads_syncs():
+    policies = [_SyncPolicy(min_interval=10.0, max_interval=100.0, backoff=2.0, jitter=0.5) for _ in range(20)]
+    assert len({round(policy.time_until_due(None), 3) for policy in policies}) > 1
+    assert all(policy.time_until_due(None) <= 5.0 for policy in policies)
+
+    for policy in policies:
+        policy.succeeded(change_count=1)
+    assert all(5.0 <= policy.time_until_due(None) <= 15.0 for policy in policies)
+
+
+def test_background_sync(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=3)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport(),
+                    background_sync_min_interval=0.01, background_sync_max_interval=0.05, background_sync_jitter=0.0) as api:
+        api.start_background_sync()
+        syncer = api.background_syncer
+        assert wait_for(lambda: syncer.health.sync_count >= 3)
+        assert syncer.health.healthy
+        assert wait_for(lambda: syncer.health.interval == 0.05)
+
+        task_id = fake.put('items', {'id': fake._new_id(), 'content': 'from another client'})['id']
+        assert wait_for(lambda: task_id in api.tasks._items)
+
+        # Queued commands tighten the interval
+        assert syncer._notify in api.command_manager.queue_listeners
+
+    assert not syncer.running
+    assert api.background_syncer is None
+    assert syncer._notify not in api.command_manager.queue_listeners
+
+
+def test_background_sync_survives_errors(tmp_path):
+    fake = FakeSyncAPI()
+    failures = []
+
+    def fail_once():
+        if not failures:
+            failures.append(1)
+            raise RuntimeError('sync failed')
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        original_sync = api.sync
+        api.sync = lambda: (fail_once(), original_sync())[1]
+        api.start_background_sync()
+        api.background_syncer._policy.min_interval = api.background_syncer._policy.interval = 0.01
+        api.background_syncer.wake()
+
+        assert wait_for(lambda: api.background_syncer.health.sync_count >= 1)
+        assert failures
+        assert api.background_syncer.last_error is None
+        assert api.metrics.snapshot()['counters']['background_sync.failures'] >= 1
+
+
+def test_async_background_sync(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=3)
+
+    async def run():
+        async with AsyncTodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.async_transport(),
+                                   background_sync=True, background_sync_min_interval=0.01, background_sync_max_interval=0.05) as api:
+            syncer = api.background_syncer
+            for _ in range(100):
+                if syncer.health.sync_count >= 3:
+                    break
+                await asyncio.sleep(0.01)
+            health = syncer.health
+        return health, syncer.running
+
+    health, running = asyncio.run(run())
+    assert health.sync_count >= 3 and health.healthy
+    assert not running
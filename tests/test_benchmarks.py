@@ -0,0 +1,29 @@
+# pylint: disable-all
+from benchmarks.run import run_size
+from synctodoist.fake_server import FakeSyncAPI
+
+
+def test_fake_api_returns_deltas():
+    fake = FakeSyncAPI()
+    fake.populate(tasks=10)
+    full = fake.sync({'sync_token': '*', 'resource_types': ['items']})
+    assert full['full_sync']
+    assert len(full['items']) == 10
+
+    fake.touch('items', 2)
+    partial = fake.sync({'sync_token': full['sync_token'], 'resource_types': ['items']})
+    assert not partial['full_sync']
+    assert len(partial['items']) == 2
+
+    changed_id = partial['items'][0]['id']
+    fake.put('items', {**fake.resources['items'][changed_id], 'is_deleted': True})
+    delta = fake.sync({'sync_token': full['sync_token'], 'resource_types': ['items']})
+    assert [obj['id'] for obj in delta['items']] == [partial['items'][1]['id'], changed_id]
+    assert delta['items'][1]['is_deleted']
+
+
+def test_benchmarks_run(tmp_path):
+    results = run_size(tasks=50, commands=5, repeat=1, cache_dir=tmp_path)
+
+    assert {result['benchmark'] for result in results} == {'full_sync', 'full_sync_memory', 'full_sync_streamed', 'full_sync_streamed_memory', 'partial_sync',
+                                                           'cache_cold_load', 'find', 'commit'}
@@ -0,0 +1,65 @@
+# pylint: disable-all
+from datetime import date, datetime, timezone
+
+import pytest
+
+from synctodoist import TodoistAPI, binary_cache
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.models import CacheBackendEnum, ColorEnum, Due, Label, Task
+
+pytest.importorskip('msgpack')
+
+
+def test_round_trip_keeps_types(tmp_path):
+    added_at = datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    tasks = {
+        '1': Task(id='1', content='dated', due=Due(date=date(2023, 6, 1), string='Jun 1'), added_at=added_at, labels=['a'], priority=4),
+        '2': Task(id='2', content='plain'),
+    }
+    cache_file = tmp_path / 'tasks.msgpack'
+    binary_cache.dump(cache_file, 'tasks', Task, tasks)
+
+    loaded = binary_cache.load(cache_file, Task)
+
+    assert loaded == tasks
+    assert isinstance(loaded['1'].due, Due)
+    assert loaded['1'].due.date == date(2023, 6, 1)
+    assert loaded['1'].added_at == added_at
+
+    labels = {'1': Label(id='1', name='red', color='red')}
+    binary_cache.dump(tmp_path / 'labels.msgpack', 'labels', Label, labels)
+    assert binary_cache.load(tmp_path / 'labels.msgpack', Label)['1'].color is ColorEnum.red
+
+
+def test_unsupported_schema_version(tmp_path):
+    cache_file = tmp_path / 'tasks.msgpack'
+    binary_cache.dump(cache_file, 'tasks', Task, {'1': Task(id='1')})
+    data = bytearray(cache_file.read_bytes())
+    data[len(binary_cache.MAGIC):binary_cache.HEADER.size] = (binary_cache.SCHEMA_VERSION + 1).to_bytes(2, 'big')
+    cache_file.write_bytes(bytes(data))
+
+    with pytest.raises(binary_cache.CacheFormatError):
+        binary_cache.load(cache_file, Task)
+
+    json_cache_file = tmp_path / 'todoist_tasks.json'
+    json_cache_file.write_text('{"name": "tasks", "data": {}}', encoding='utf-8')
+    with pytest.raises(binary_cache.CacheFormatError):
+        binary_cache.load(json_cache_file, Task)
+
+
+def test_json_cache_is_migrated(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=20)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+        json_cache_file = api.tasks._cache_file(CacheBackendEnum.json)
+        assert json_cache_file.exists()
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport(), cache_backend=CacheBackendEnum.binary) as api:
+        api._read_all_caches(force=True)
+
+        assert not json_cache_file.exists()
+        assert api.tasks._cache_file().suffix == '.msgpack'
+        assert len(binary_cache.load(api.tasks._cache_file(), Task)) == 20
+        assert len(api.tasks) == 20
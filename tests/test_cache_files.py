@@ -0,0 +1,86 @@
+# pylint: disable-all
+import json
+import threading
+import time
+
+import pytest
+
+from synctodoist import TodoistAPI
+from synctodoist.cache_files import CacheLock, atomic_write
+from synctodoist.fake_server import FakeSyncAPI
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    with atomic_write(cache_file, 'w', encoding='utf-8') as cache_fp:
+        cache_fp.write('{"version": 1}')
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(cache_file, 'w', encoding='utf-8') as cache_fp:
+            cache_fp.write('{"vers')
+            raise RuntimeError('crash')
+
+    assert json.loads(cache_file.read_text(encoding='utf-8')) == {'version': 1}
+    assert list(tmp_path.iterdir()) == [cache_file]
+
+
+def test_readers_never_see_partial_files(tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    data = {'data': {str(i): {'content': 'x' * 100} for i in range(2000)}}
+    with atomic_write(cache_file, 'w', fsync=False, encoding='utf-8') as cache_fp:
+        json.dump(data, cache_fp)
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        for _ in range(50):
+            with atomic_write(cache_file, 'w', fsync=False, encoding='utf-8') as cache_fp:
+                json.dump(data, cache_fp)
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while not done.is_set():
+        try:
+            assert json.loads(cache_file.read_text(encoding='utf-8')) == data
+        except Exception as ex:
+            errors.append(ex)
+    thread.join()
+
+    assert not errors
+
+
+def test_exclusive_lock_waits_for_readers(tmp_path):
+    lock = CacheLock(tmp_path / 'cache.lock')
+    events = []
+
+    def writer():
+        with lock.exclusive():
+            events.append('write')
+
+    with lock.shared(), lock.shared():
+        thread = threading.Thread(target=writer)
+        thread.start()
+        time.sleep(0.1)
+        events.append('read')
+    thread.join()
+
+    assert events == ['read', 'write']
+
+
+def test_sync_writes_caches_before_token(monkeypatch, tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=10)
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        write_sync_token = api.command_manager.write_sync_token
+
+        def check_caches_then_write():
+            assert api.tasks._cache_file().exists()
+            write_sync_token()
+
+        monkeypatch.setattr(api.command_manager, 'write_sync_token', check_caches_then_write)
+        api.sync()
+
+    assert json.loads((api.settings.account_cache_dir / 'todoist_sync_token.json').read_text(encoding='utf-8')) == {'sync_token': str(fake.version)}
+    assert (api.settings.account_cache_dir / 'todoist_cache.lock').exists()
+    assert not list(api.settings.account_cache_dir.glob('*.tmp'))
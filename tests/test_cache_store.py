@@ -0,0 +1,77 @@
+# pylint: disable-all
+import pytest
+
+from synctodoist import TodoistAPI
+from synctodoist.cache_store import CacheChanges, SQLiteCacheStore
+from synctodoist.fake_server import FakeSyncAPI
+
+
+def test_store_upserts_and_deletes_rows(tmp_path):
+    store = SQLiteCacheStore(tmp_path / 'cache.sqlite3')
+    assert store.read_sync_token() == '*'
+
+    store.write({'items': CacheChanges(upserted={'1': {'id': '1'}, '2': {'id': '2'}})}, sync_token='1')
+    store.write({'items': CacheChanges(upserted={'3': {'id': '3'}}, deleted={'1'})}, sync_token='2')
+
+    assert store.load('items') == {'2': {'id': '2'}, '3': {'id': '3'}}
+    assert store.read_sync_token() == '2'
+
+    store.write({'items': CacheChanges(upserted={'4': {'id': '4'}}, replace_all=True)}, sync_token='3')
+    assert store.load('items') == {'4': {'id': '4'}}
+
+
+def test_generation_changes_with_writes_of_other_clients(tmp_path):
+    store = SQLiteCacheStore(tmp_path / 'cache.sqlite3')
+    other = SQLiteCacheStore(tmp_path / 'cache.sqlite3')
+    assert store.generation('items') is None
+
+    generations = store.write({'items': CacheChanges(upserted={'1': {'id': '1'}}), 'labels': CacheChanges()}, sync_token='1')
+    assert store.generation('items') == generations['items']
+    assert store.generation('labels') == generations['labels']
+
+    other.write({'items': CacheChanges(deleted={'1'})}, sync_token='2')
+    assert store.generation('items') != generations['items']
+    assert store.generation('labels') == generations['labels']
+
+
+def test_sync_writes_only_touched_rows(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=50)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, cache_backend='sqlite', rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+        store = api.command_manager.cache_store
+        assert len(store.load('items')) == 50
+        assert store.read_sync_token() == str(fake.version)
+
+        fake.touch('items', 2, seed=1)
+        deleted_id = next(iter(fake.resources['items']))
+        fake.put('items', {**fake.resources['items'][deleted_id], 'is_deleted': True})
+        api.sync()
+
+        changes = api.tasks._cache_changes()
+        assert not changes
+        assert len(store.load('items')) == 49
+        assert deleted_id not in store.load('items')
+        assert store.read_sync_token() == str(fake.version)
+        assert not (api.settings.account_cache_dir / 'todoist_tasks.json').exists()
+
+    assert len(api.tasks) == 49
+
+
+def test_partial_sync_tracks_changes(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=10)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, cache_backend='sqlite', rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+        fake.touch('items', 3, seed=2)
+        writes = []
+        store = api.command_manager.cache_store
+        original_write = store.write
+        store.write = lambda changes, sync_token: writes.append(changes) or original_write(changes, sync_token)
+        api.sync()
+
+    assert len(writes[0]['items'].upserted) == 3
+    assert not writes[0]['items'].replace_all
+    assert not writes[0]['projects']
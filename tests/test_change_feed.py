@@ -0,0 +1,83 @@
+# pylint: disable-all
+import pytest
+
+from synctodoist import TodoistAPI
+from synctodoist.change_feed import ChangeEvent, ChangeFeed
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.lazy_store import LazyItems
+from synctodoist.models import ChangeKindEnum
+
+
+def test_feed_filters_by_resource_and_predicate():
+    feed = ChangeFeed()
+    received = {'all': [], 'tasks': [], 'priority': []}
+    feed.subscribe(received['all'].append)
+    feed.subscribe(received['tasks'].append, resource='tasks')
+    feed.subscribe(received['priority'].append, predicate=lambda event: 'priority' in event.changed_fields)
+
+    task_event = ChangeEvent('tasks', ChangeKindEnum.updated, '1', old={'content': 'a', 'priority': 1}, new={'content': 'a', 'priority': 4})
+    project_event = ChangeEvent('projects', ChangeKindEnum.added, '2', new={'name': 'Inbox'})
+    feed.publish([task_event, project_event])
+
+    assert received == {'all': [task_event, project_event], 'tasks': [task_event], 'priority': [task_event]}
+    assert task_event.changed_fields == {'priority'}
+    assert project_event.changed_fields == {'name'}
+    assert feed.wants('tasks') and feed.wants('labels')
+
+    feed.unsubscribe(received['all'].append)
+    feed.unsubscribe(received['priority'].append)
+    assert feed.wants('tasks') and not feed.wants('labels')
+
+
+@pytest.mark.parametrize('stream_sync, lazy_store', [(False, False), (True, False), (False, True)])
+def test_sync_publishes_changes(tmp_path, stream_sync, lazy_store):
+    fake = FakeSyncAPI()
+    fake.populate(projects=2, tasks=5)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport(), stream_sync=stream_sync,
+                    lazy_store=lazy_store) as api:
+        task_events, project_events = [], []
+        api.subscribe(task_events.append, manager=api.tasks)
+        api.subscribe(project_events.append, manager=api.projects)
+
+        api.sync()
+        assert isinstance(api.tasks._items, LazyItems) == lazy_store
+        assert [event.kind for event in task_events] == [ChangeKindEnum.added] * 5
+        assert [event.id for event in task_events] == api.last_sync_changes['tasks'].added
+        assert task_events[0].item is api.get_task(task_events[0].id)
+        assert len(project_events) == 2
+
+        updated_id, deleted_id = list(fake.resources['items'])[:2]
+        task_events.clear()
+        project_events.clear()
+        api.unsubscribe(project_events.append)
+        fake.put('items', {**fake.resources['items'][updated_id], 'content': 'changed'})
+        fake.put('items', {**fake.resources['items'][deleted_id], 'is_deleted': True})
+        fake.put('projects', {**next(iter(fake.resources['projects'].values())), 'name': 'renamed'})
+        api.sync()
+
+        assert [(event.kind, event.id) for event in task_events] == [(ChangeKindEnum.updated, updated_id), (ChangeKindEnum.deleted, deleted_id)]
+        updated, deleted = task_events
+        assert updated.changed_fields == {'content'}
+        assert (updated.old['content'], updated.new['content']) == ('Task 0', 'changed')
+        assert updated.item is api.get_task(updated_id)
+        assert deleted.item is None and deleted.new is None
+        assert deleted.old['id'] == deleted_id
+        assert not project_events
+
+
+def test_events_are_published_after_the_sync_is_stored(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=3)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        def failing_subscriber(event):
+            assert api.tasks._cache_file().exists()
+            raise RuntimeError('subscriber failed')
+
+        api.subscribe(failing_subscriber, predicate=lambda event: event.kind == ChangeKindEnum.added)
+        with pytest.raises(RuntimeError):
+            api.sync()
+
+        assert api.synced
+        assert api.command_manager.sync_token == str(fake.version)
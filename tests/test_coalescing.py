@@ -0,0 +1,119 @@
+# pylint: disable-all
+import json
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from synctodoist import TodoistAPI
+from synctodoist.coalescing import coalesce_commands
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.managers.command_manager import CommandManager
+from synctodoist.models import Command, RetryPolicy, Settings, Task
+
+
+def test_consecutive_updates_are_merged():
+    first = Command(type='item_update', args={'id': '1', 'content': 'a', 'priority': 2})
+    other = Command(type='item_update', args={'id': '2', 'content': 'x'})
+    second = Command(type='item_update', args={'id': '1', 'content': 'b'})
+
+    result, stats = coalesce_commands([first, other, second])
+
+    assert [command.args for command in result] == [{'id': '2', 'content': 'x'}, {'id': '1', 'content': 'b', 'priority': 2}]
+    assert result[1].uuid == second.uuid
+    assert stats.merged_updates == 1
+    assert stats.eliminated == 1
+
+
+def test_updates_separated_by_other_command_are_kept():
+    queued = [Command(type='item_update', args={'id': '1', 'content': 'a'}), Command(type='item_move', args={'id': '1', 'project_id': '9'}),
+              Command(type='item_update', args={'id': '1', 'content': 'b'})]
+
+    result, stats = coalesce_commands(queued)
+
+    assert result == queued
+    assert stats.eliminated == 0
+
+
+def test_add_and_delete_of_uncommitted_item_are_dropped():
+    add = Command(type='item_add', temp_id='temp', args={'content': 'a'})
+    update = Command(type='item_update', args={'id': 'temp', 'content': 'b'})
+    delete = Command(type='item_delete', args={'id': 'temp'})
+    other = Command(type='item_complete', args={'id': '1'})
+
+    result, stats = coalesce_commands([add, update, other, delete])
+
+    assert result == [other]
+    assert stats.dropped_add_delete == 3
+
+
+def test_add_and_delete_with_dependants_are_kept():
+    add = Command(type='item_add', temp_id='temp', args={'content': 'a'})
+    child = Command(type='item_add', temp_id='child', args={'content': 'b', 'parent_id': 'temp'})
+    delete = Command(type='item_delete', args={'id': 'temp'})
+
+    result, stats = coalesce_commands([add, child, delete])
+
+    assert result == [add, child, delete]
+    assert stats.dropped_add_delete == 0
+
+
+def test_toggles_are_collapsed():
+    queued = [Command(type='item_complete', args={'id': '1'}), Command(type='item_uncomplete', args={'id': '1'}),
+              Command(type='item_complete', args={'id': '1'})]
+
+    result, stats = coalesce_commands(queued)
+
+    assert result == [queued[2]]
+    assert stats.collapsed_toggles == 2
+
+
+def test_coalesce_updates_queue():
+    command_manager = CommandManager(Settings())
+    command_manager.add_command(data={'id': '1', 'content': 'a'}, command_type='item_update')
+    command_manager.add_command(data={'id': '1', 'content': 'b'}, command_type='item_update')
+
+    stats = command_manager.coalesce()
+
+    assert stats.eliminated == 1
+    assert [command.args for command in command_manager.commands.values()] == [{'id': '1', 'content': 'b'}]
+
+
+def test_sent_add_is_not_dropped():
+    add = Command(type='item_add', temp_id='temp', args={'content': 'a'})
+    delete = Command(type='item_delete', args={'id': 'temp'})
+
+    result, stats = coalesce_commands([add, delete], sent={add.uuid})
+
+    assert result == [add, delete]
+    assert stats.dropped_add_delete == 0
+
+
+def test_add_with_lost_response_is_sent_with_delete(tmp_path):
+    fake = FakeSyncAPI()
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = fake.handle(request)
+        if commands := parse_qs(request.content.decode()).get('commands'):
+            sent.append([command['type'] for command in json.loads(commands[0])])
+            if len(sent) == 1:
+                # Todoist executed the add, but the response never arrived
+                raise httpx.ReadTimeout('lost response', request=request)
+        return response
+
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path, write_retry=RetryPolicy(retries=0), rate_limit_enabled=False,
+                     transport=httpx.MockTransport(handler))
+    task = Task(content='lost response')
+    api.add_task(task)
+    with pytest.raises(httpx.ReadTimeout):
+        api.commit()
+
+    api.tasks.delete(task)
+    api.commit()
+
+    assert sent == [['item_add'], ['item_add', 'item_delete']]
+    assert [obj.get('is_deleted') for obj in fake.resources['items'].values()] == [True]
+    assert api.command_manager.last_coalesce_stats.dropped_add_delete == 0
+    assert not api.command_manager.commands
+    assert not api.command_manager.sent_uuids
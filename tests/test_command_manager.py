@@ -1,21 +1,111 @@
 # pylint: disable-all
+import json
 import os
+from urllib.parse import parse_qs
 
+import httpx
 import pytest
 from dotenv import load_dotenv
 
-from synctodoist.exceptions import TodoistError
-from synctodoist.managers import command_manager
+from synctodoist.exceptions import TodoistError, TodoistBatchError
+from synctodoist.managers.command_manager import CommandManager
+from synctodoist.models import Project, Settings, RetryPolicy
 
 load_dotenv('../.env')
 API_KEY = os.environ.get('TODOIST_API')
 
 
 def test_invalid_command_commit_error():
+    command_manager = CommandManager(Settings())
     command_manager.add_command(data={'id': 'INVALID'}, command_type='INVALID')
     assert len(command_manager.commands) > 0
 
     with pytest.raises(TodoistError):
         command_manager.commit()
 
-    command_manager.commands.clear()
+
+def test_commit_splits_queue_into_batches():
+    sent_batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(parse_qs(request.content.decode())['commands'][0])
+        sent_batches.append(batch)
+        mapping = {command['temp_id']: f'real-{command["temp_id"]}' for command in batch if command['type'] == 'project_add'}
+        return httpx.Response(200, json={'sync_status': {command['uuid']: 'ok' for command in batch}, 'temp_id_mapping': mapping, 'full_sync': False})
+
+    command_manager = CommandManager(Settings(commands_per_request=2))
+    command_manager.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    project = Project(name='batched')
+    command_manager.add_command(data={'name': 'batched', 'temp_id': project.temp_id}, command_type='project_add', item=project)
+    for index in range(4):
+        command_manager.add_command(data={'content': f'task {index}', 'project_id': project.temp_id}, command_type='item_add')
+
+    result = command_manager.commit()
+
+    assert [len(batch) for batch in sent_batches] == [2, 2, 1]
+    assert sent_batches[0][1]['args']['project_id'] == project.temp_id
+    assert all(command['args']['project_id'] == f'real-{project.temp_id}' for command in sent_batches[1] + sent_batches[2])
+    assert len(result['sync_status']) == 5
+    assert project.id == f'real-{project.temp_id}'
+    assert not command_manager.commands
+
+
+def test_commit_reports_failed_batch():
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(parse_qs(request.content.decode())['commands'][0])
+        status = {command['uuid']: {'error': 'invalid'} if command['type'] == 'INVALID' else 'ok' for command in batch}
+        return httpx.Response(200, json={'sync_status': status, 'temp_id_mapping': {}, 'full_sync': False})
+
+    command_manager = CommandManager(Settings(commands_per_request=1))
+    command_manager.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    command_manager.add_command(data={'id': '1'}, command_type='item_complete')
+    command_manager.add_command(data={'id': 'INVALID'}, command_type='INVALID')
+    command_manager.add_command(data={'id': '2'}, command_type='item_complete')
+
+    with pytest.raises(TodoistBatchError) as ex:
+        command_manager.commit()
+
+    assert ex.value.batch_index == 1
+    assert ex.value.batch_count == 3
+    assert len(command_manager.commands) == 1
+
+
+def test_commit_retries_with_same_uuids():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(parse_qs(request.content.decode())['commands'][0])
+        attempts.append([command['uuid'] for command in batch])
+        if len(attempts) == 1:
+            raise httpx.ReadTimeout('timeout', request=request)
+        if len(attempts) == 2:
+            return httpx.Response(502)
+        return httpx.Response(200, json={'sync_status': {uuid: 'ok' for uuid in attempts[-1]}, 'temp_id_mapping': {}, 'full_sync': False})
+
+    command_manager = CommandManager(Settings(write_retry=RetryPolicy(retries=2, backoff=0)))
+    command_manager.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    command_manager.add_command(data={'id': '1'}, command_type='item_complete')
+    command_manager.commit()
+
+    assert len(attempts) == 3
+    assert attempts[0] == attempts[1] == attempts[2]
+    assert not command_manager.commands
+
+
+def test_commit_keeps_queue_when_retries_exhausted():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError('unreachable', request=request)
+
+    command_manager = CommandManager(Settings(write_retry=RetryPolicy(retries=1, backoff=0)))
+    command_manager.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    command_manager.add_command(data={'id': '1'}, command_type='item_complete')
+    queued = list(command_manager.commands)
+
+    with pytest.raises(httpx.ConnectError):
+        command_manager.commit()
+
+    assert list(command_manager.commands) == queued
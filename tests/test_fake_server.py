@@ -0,0 +1,81 @@
+# pylint: disable-all
+import threading
+
+import pytest
+
+from synctodoist import TodoistAPI
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.models import Task
+
+
+def test_transport_applies_commands_and_returns_deltas(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=20)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+        assert len(api.tasks) == 20
+
+        task = Task(content='Added to the fake')
+        api.add_task(task)
+        api.commit()
+        assert task.id in fake.resources['items']
+
+        fake.touch('items', 3, seed=1)
+        token = api.command_manager.sync_token
+        assert len(fake.sync({'sync_token': token, 'resource_types': ['items']})['items']) == 3
+        api.sync()
+        assert len(api.tasks) == 21
+
+
+def test_rate_limit_is_answered_with_retry_after():
+    fake = FakeSyncAPI(max_requests=2, period=60)
+    statuses = [fake.dispatch('POST', '/sync/v9/sync', b'sync_token=*&resource_types=["items"]')[0] for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    assert 0 < float(fake.dispatch('POST', '/sync/v9/sync', b'')[1]['Retry-After']) <= 60
+    assert fake.throttled_count == 2
+
+
+def test_http_server_with_base_url(tmp_path):
+    fake = FakeSyncAPI(throttle_probability=0.5, retry_after=0, seed=3)
+    fake.populate(tasks=10)
+    server = fake.serve()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+
+    try:
+        with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, rate_limit_retries=10,
+                        base_url=f'http://{host}:{port}/sync/v9') as api:
+            api.sync()
+            assert len(api.tasks) == 10
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert fake.throttled_count > 0
+
+
+def test_repeated_command_is_executed_once():
+    fake = FakeSyncAPI()
+    add = {'type': 'item_add', 'uuid': 'add-uuid', 'temp_id': 'temp', 'args': {'content': 'a'}}
+
+    first = fake.sync({'sync_token': '*', 'commands': [add]})
+    second = fake.sync({'sync_token': '*', 'commands': [add, {'type': 'item_delete', 'uuid': 'delete-uuid', 'args': {'id': 'temp'}}]})
+
+    assert first['temp_id_mapping'] == second['temp_id_mapping']
+    assert second['sync_status'] == {'add-uuid': 'ok', 'delete-uuid': 'ok'}
+    assert [obj['is_deleted'] for obj in fake.resources['items'].values()] == [True]
+
+
+def test_closed_api_keeps_transport(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=5)
+
+    api = TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport())
+    api.sync()
+    api.close()
+    api.sync()
+
+    assert fake.request_count == 2
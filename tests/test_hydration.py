@@ -0,0 +1,76 @@
+# pylint: disable-all
+from datetime import date, datetime, timezone
+
+import pydantic
+import pytest
+
+from synctodoist import TodoistAPI
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.hydration import Hydrator, trusted_constructor
+from synctodoist.models import Due, HydrationEnum, Reminder, ReminderTypeEnum, Task
+
+
+def test_json_constructor_matches_validation():
+    construct = trusted_constructor(Task, from_json=True)
+    values = {'id': '1', 'content': 'dated', 'added_at': '2023-01-01T12:00:00Z', 'due': {'date': '2023-06-01', 'string': 'Jun 1'},
+              'labels': ['a'], 'priority': 4, 'v2_id': 'unknown'}
+
+    task = construct(values)
+
+    assert task.model_dump(exclude={'temp_id'}) == Task(**values).model_dump(exclude={'temp_id'})
+    assert task.added_at == datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    assert isinstance(task.due, Due) and task.due.date == date(2023, 6, 1)
+    assert construct({'due': {'date': '2023-06-01T09:30:00'}}).due.date == datetime(2023, 6, 1, 9, 30)
+
+    reminder = trusted_constructor(Reminder, from_json=True)({'id': '1', 'type': 'relative', 'mm_offset': 30})
+    assert reminder.type is ReminderTypeEnum.relative
+    assert reminder.minute_offset == 30
+
+    with pytest.raises(ValueError):
+        trusted_constructor(Reminder, from_json=True)({'id': '1'})
+
+
+def test_trusted_hydrator_falls_back_to_validation():
+    hydrate = Hydrator(Reminder, HydrationEnum.trusted)
+
+    assert hydrate({'type': 'relative', 'mm_offset': 5}).minute_offset == 5
+    # Data the decoder cannot handle is validated, so the usual validation errors are raised
+    with pytest.raises(pydantic.ValidationError):
+        hydrate({'type': 'absolute', 'due': {'date': 'Jun 1'}})
+    with pytest.raises(pydantic.ValidationError):
+        hydrate({'id': '1'})
+
+
+def test_sampled_hydrator_validates_after_mismatch():
+    hydrate = Hydrator(Task, HydrationEnum.sampled, sample_rate=1.0)
+
+    assert hydrate({'id': '1', 'collapsed': False}).collapsed is False
+    assert hydrate.mode == HydrationEnum.sampled
+
+    # Validation converts the 1 to True, so the decoder cannot be trusted with this data
+    assert hydrate({'id': '2', 'collapsed': 1}).collapsed is True
+    assert hydrate.mode == HydrationEnum.validate
+    assert (hydrate.sampled, hydrate.mismatches) == (2, 1)
+
+
+def test_sync_with_trusted_hydration(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=30)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path / 'validated', rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+        validated = {key: task.model_dump(exclude={'temp_id'}) for key, task in api.tasks._dict_items()}
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport(), hydration=HydrationEnum.trusted) as api:
+        api.sync()
+        assert {key: task.model_dump(exclude={'temp_id'}) for key, task in api.tasks._dict_items()} == validated
+
+        api._read_all_caches(force=True)
+        assert {key: task.model_dump(exclude={'temp_id'}) for key, task in api.tasks._dict_items()} == validated
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport(), hydration=HydrationEnum.sampled,
+                    hydration_sample_rate=1.0) as api:
+        api._read_all_caches(force=True)
+
+    assert api.metrics.snapshot()['counters']['hydration.sampled.tasks'] >= 30
+    assert api.metrics.snapshot()['counters']['hydration.mismatches.tasks'] == 0
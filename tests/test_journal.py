@@ -0,0 +1,84 @@
+# pylint: disable-all
+import asyncio
+import threading
+
+import httpx
+
+from synctodoist import TodoistAPI
+from synctodoist.journal import CommandJournal
+from synctodoist.models import Command, Task
+
+
+def test_replay_skips_acknowledged_commands(tmp_path):
+    journal = CommandJournal(tmp_path / 'journal.jsonl', fsync=False)
+    first = Command(type='item_complete', args={'id': '1'})
+    second = Command(type='item_complete', args={'id': '2'})
+    journal.record_add(first)
+    journal.record_add(second)
+    journal.record_sent([first.uuid, second.uuid])
+    journal.record_acknowledged({first.uuid: 'ok'})
+
+    assert [command.uuid for command in journal.replay()] == [second.uuid]
+
+
+def test_queue_survives_restart(tmp_path):
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path, journal=True)
+    api.add_task(Task(content='journaled task'))
+    queued = list(api.command_manager.commands)
+
+    # Simulate a crash: the in-memory queue is lost
+    command_manager = TodoistAPI(api_key='Test', cache_dir=tmp_path, journal=True).command_manager
+    assert list(command_manager.commands) == queued
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={'sync_status': {uuid: 'ok' for uuid in queued}, 'temp_id_mapping': {}, 'full_sync': False})
+
+    command_manager.client = httpx.Client(transport=httpx.MockTransport(handler))
+    command_manager.commit()
+
+    assert not command_manager.commands
+    assert command_manager.journal.replay() == []
+
+
+def test_replay_keeps_sent_state(tmp_path):
+    journal = CommandJournal(tmp_path / 'journal.jsonl', fsync=False)
+    first = Command(type='item_add', temp_id='temp', args={'content': 'a'})
+    second = Command(type='item_complete', args={'id': '2'})
+    journal.record_add(first)
+    journal.record_add(second)
+    journal.record_sent([first.uuid])
+    journal.compact(journal.replay(), journal.replay_sent())
+
+    assert journal.replay_sent() == {first.uuid}
+
+
+def test_async_commit_writes_journal_off_the_event_loop(tmp_path):
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path, journal=True)
+    command_manager = api.command_manager
+    api.add_task(Task(content='journaled task'))
+    queued = list(command_manager.commands)
+    journal = command_manager.journal
+    writers = []
+
+    def record_thread(method):
+        def wrapper(*args, **kwargs):
+            writers.append(threading.current_thread())
+            return method(*args, **kwargs)
+        return wrapper
+
+    for name in ('record_sent', 'record_acknowledged', 'compact'):
+        setattr(journal, name, record_thread(getattr(journal, name)))
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={'sync_status': {uuid: 'ok' for uuid in queued}, 'temp_id_mapping': {}, 'full_sync': False})
+
+    async def run():
+        command_manager.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await command_manager.commit_async()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(run())
+    assert len(writers) == 3
+    assert loop_thread not in writers
+    assert not command_manager.commands
+    assert journal.replay() == []
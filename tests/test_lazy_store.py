@@ -0,0 +1,85 @@
+# pylint: disable-all
+from datetime import date, datetime, timezone
+
+import pytest
+
+from synctodoist import TodoistAPI, binary_cache
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.hydration import Hydrator
+from synctodoist.lazy_store import LazyItems
+from synctodoist.models import CacheBackendEnum, Reminder, Task
+
+
+def test_items_are_materialized_on_access():
+    items = LazyItems(Task, Hydrator(Task), max_materialized=2,
+                      records={str(i): {'id': str(i), 'content': f'Task {i}', 'added_at': '2023-01-01T12:00:00Z'} for i in range(5)})
+
+    assert len(items) == 5
+    assert items.field('1', 'content') == 'Task 1'
+    assert items.field('1', 'is_deleted') is False
+    assert items.materialized_count == 0
+
+    task = items['1']
+    assert isinstance(task, Task)
+    assert task.added_at == datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    assert items['1'] is task
+
+    items['2'], items['3']
+    assert items.materialized_count == 2
+    assert items['1'] is not task
+
+    items['1'] = {'id': '1', 'content': 'changed'}
+    assert items['1'].content == 'changed'
+    assert items.record('1') == {'id': '1', 'content': 'changed', 'is_deleted': False, 'temp_id': items['1'].temp_id, 'auto_reminder': False}
+
+    del items['4']
+    assert '4' not in items
+    assert list(items) == ['0', '1', '2', '3']
+
+    reminders = LazyItems(Reminder, Hydrator(Reminder), records={'1': {'id': '1', 'type': 'relative', 'mm_offset': 30}})
+    assert reminders.field('1', 'minute_offset') == 30
+
+
+def test_sync_with_lazy_store(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=50)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport(), lazy_store=True, lazy_store_size=10) as api:
+        api.sync()
+
+        assert isinstance(api.tasks._items, LazyItems)
+        assert len(api.tasks) == 50
+        assert api.tasks._items.materialized_count == 0
+
+        assert api.find_task(pattern='^Task 7$').content == 'Task 7'
+        assert api.tasks._items.materialized_count == 1
+
+        deleted_id = next(iter(fake.resources['items']))
+        fake.put('items', {**fake.resources['items'][deleted_id], 'is_deleted': True})
+        api.sync()
+        assert len(api.tasks) == 49
+        assert deleted_id not in api.tasks._items
+
+        api._read_all_caches(force=True)
+        assert isinstance(api.tasks._items, LazyItems)
+        assert api.tasks._items.materialized_count == 0
+        assert sorted(task.id for task in api.tasks._dict_values()) == sorted(key for key in fake.resources['items'] if key != deleted_id)
+        assert api.tasks._items.materialized_count == 10
+
+
+def test_binary_cache_write_keeps_items_lazy(tmp_path):
+    pytest.importorskip('msgpack')
+    fake = FakeSyncAPI()
+    fake.populate(tasks=50)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport(), lazy_store=True,
+                    cache_backend=CacheBackendEnum.binary) as api:
+        api.sync()
+        fake.touch('items', 1)
+        api.sync()
+
+        assert api.tasks._items.materialized_count == 0
+        loaded = binary_cache.load(api.tasks._cache_file(), Task)
+        assert len(loaded) == 50
+        assert all(task.added_at == datetime(2023, 1, 1, 12, tzinfo=timezone.utc) for task in loaded.values())
+        assert {type(task.due.date) for task in loaded.values() if task.due} == {date}
@@ -0,0 +1,70 @@
+# pylint: disable-all
+import json
+from urllib.parse import parse_qs
+
+import httpx
+
+from synctodoist import TodoistAPI
+from synctodoist.metrics import Histogram, MetricsRegistry
+from synctodoist.models import Task
+
+
+def test_histogram_snapshot():
+    histogram = Histogram(buckets=(1.0, 2.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 4
+    assert snapshot['sum'] == 6.5
+    assert snapshot['min'] == 0.5
+    assert snapshot['max'] == 3.0
+    assert snapshot['buckets'] == {'1.0': 1, '2.0': 2, 'inf': 1}
+
+
+def test_registry_counters_timers_and_exporters():
+    metrics = MetricsRegistry()
+    exported = []
+    metrics.add_exporter(exported.append)
+
+    metrics.increment('request.count.sync')
+    metrics.increment('request.bytes_sent.sync', 100)
+    with metrics.timer('cache.read.tasks'):
+        pass
+    metrics.export()
+
+    assert exported[0]['counters'] == {'request.count.sync': 1, 'request.bytes_sent.sync': 100}
+    assert exported[0]['histograms']['cache.read.tasks']['count'] == 1
+
+    metrics.remove_exporter(exported.append)
+    metrics.reset()
+    metrics.export()
+    assert len(exported) == 1
+    assert metrics.snapshot() == {'counters': {}, 'histograms': {}}
+
+
+def test_api_collects_metrics(monkeypatch, tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        commands = json.loads(parse_qs(request.content.decode())['commands'][0])
+        return httpx.Response(200, json={'sync_status': {command['uuid']: 'ok' for command in commands}, 'temp_id_mapping': {}, 'sync_token': 'NEXT',
+                                         'full_sync': True, 'projects': [], 'labels': [], 'sections': [], 'reminders': [],
+                                         'items': [{'id': '1', 'content': 'task'}]})
+
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path)
+    monkeypatch.setattr(api.command_manager, 'client', httpx.Client(transport=httpx.MockTransport(handler)))
+    exported = []
+    api.metrics.add_exporter(exported.append)
+
+    api.add_task(Task(content='task'))
+    api.commit()
+
+    counters = exported[-1]['counters']
+    histograms = exported[-1]['histograms']
+    assert counters['request.count.sync'] == 1
+    assert counters['request.bytes_sent.sync'] > 0
+    assert counters['request.bytes_received.sync'] > 0
+    assert counters['commands.committed.item_add'] == 1
+    assert counters['syncs.full'] == 1
+    assert histograms['request.duration.sync']['count'] == 1
+    assert histograms['sync.model_construction.items']['count'] == 1
+    assert 'cache.write.tasks' in histograms
@@ -0,0 +1,63 @@
+# pylint: disable-all
+import time
+
+import httpx
+
+from synctodoist import TodoistAPI
+from synctodoist.models import Settings
+from synctodoist.rate_limiter import RateLimiter, get_rate_limiter, retry_after
+
+
+def test_budget_is_consumed():
+    limiter = RateLimiter(requests=2, period=1000)
+    assert limiter.budget == 2
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    assert limiter.budget < 1
+    assert limiter.wait_time() > 0
+
+
+def test_no_window_holds_more_than_the_limit():
+    limiter = RateLimiter(requests=5, period=1000)
+    slots = [time.monotonic() + limiter._reserve() for _ in range(15)]
+
+    # The first requests are sent at once, but never more than 5 within a period
+    assert slots[4] - slots[0] < 1
+    assert all(later - earlier >= 1000 - 1 for earlier, later in zip(slots, slots[5:]))
+
+
+def test_limiter_follows_changed_settings():
+    limiter = get_rate_limiter(Settings(api_key='reconfigured', rate_limit_requests=10, rate_limit_period=60))
+    limiter.acquire()
+
+    assert get_rate_limiter(Settings(api_key='reconfigured', rate_limit_requests=1, rate_limit_period=60)) is limiter
+    assert (limiter.capacity, limiter.period) == (1, 60)
+    assert limiter.budget == 0
+
+
+def test_defer_blocks_requests():
+    limiter = RateLimiter(requests=100, period=1)
+    limiter.defer(0.05)
+    assert limiter.budget == 0
+    assert limiter.wait_time() > 0
+    assert limiter.acquire() > 0
+
+
+def test_retry_after_sources():
+    assert retry_after(httpx.Response(429, headers={'Retry-After': '7'})) == 7
+    assert retry_after(httpx.Response(429, json={'error_extra': {'retry_after': 3}})) == 3
+    assert retry_after(httpx.Response(503)) == 1
+
+
+def test_throttled_request_is_repeated(monkeypatch, tmp_path):
+    responses = [httpx.Response(429, headers={'Retry-After': '0'}), httpx.Response(200, json={'karma': 1})]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    api = TodoistAPI(api_key='rate-limit-test', cache_dir=tmp_path)
+    monkeypatch.setattr(api.command_manager, 'client', httpx.Client(transport=httpx.MockTransport(handler)))
+
+    assert api.get_stats() == {'karma': 1}
+    assert not responses
+    assert api.rate_limiter.budget < api.rate_limiter.capacity
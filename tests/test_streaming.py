@@ -0,0 +1,58 @@
+# pylint: disable-all
+import json
+
+import pytest
+
+from synctodoist.exceptions import TodoistError
+from synctodoist.streaming import IncrementalJSONParser, JSONEvent
+
+DOCUMENT = {
+    'full_sync': True,
+    'items': [{'id': '1', 'content': 'first, "quoted" ]}'}, {'id': '2', 'content': 'second', 'priority': 4}],
+    'projects': [],
+    'sync_token': 'TOKEN',
+    'temp_id_mapping': {'a': '1'},
+    'day_orders': 12345,
+}
+
+
+def _parse(text: str, chunk_size: int) -> list[JSONEvent]:
+    parser = IncrementalJSONParser(stream_keys={'items', 'projects'})
+    events = []
+    for start in range(0, len(text), chunk_size):
+        events.extend(parser.feed(text[start:start + chunk_size]))
+    events.extend(parser.close())
+    return events
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 10_000])
+def test_parser_yields_items_one_by_one(chunk_size):
+    events = _parse(json.dumps(DOCUMENT, indent=2), chunk_size)
+
+    assert [event.value for event in events if event.is_item] == DOCUMENT['items']
+    assert {event.key: event.value for event in events if not event.is_item} == {key: value for key, value in DOCUMENT.items() if key not in {'items', 'projects'}}
+
+
+def test_parser_returns_items_before_document_is_complete():
+    parser = IncrementalJSONParser(stream_keys={'items'})
+
+    assert parser.feed('{"items": [{"id": "1"}, {"id"') == [JSONEvent('items', {'id': '1'}, True)]
+    assert parser.feed(': "2"}], "day_orders": 1') == [JSONEvent('items', {'id': '2'}, True)]
+    # The number may continue in the next chunk
+    assert parser.feed('2}') == [JSONEvent('day_orders', 12, False)]
+    assert parser.close() == []
+
+
+def test_parser_rejects_truncated_document():
+    parser = IncrementalJSONParser(stream_keys={'items'})
+    parser.feed('{"items": [{"id": "1"}')
+
+    with pytest.raises(TodoistError):
+        parser.close()
+
+
+def test_parser_rejects_invalid_document():
+    parser = IncrementalJSONParser(stream_keys={'items'})
+
+    with pytest.raises(TodoistError):
+        parser.feed('["items"]')
@@ -0,0 +1,98 @@
+# pylint: disable-all
+import threading
+
+from synctodoist import TodoistAPI
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.models import Task
+
+
+def run_threads(*targets, count=4):
+    errors = []
+
+    def guarded(target):
+        try:
+            target()
+        except Exception as ex:
+            errors.append(ex)
+
+    threads = [threading.Thread(target=guarded, args=(target,)) for target in targets for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    return errors
+
+
+def test_shared_api_with_concurrent_writers_and_readers(tmp_path):
+    fake = FakeSyncAPI(latency=0.001)
+    fake.populate(tasks=200)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+
+        def write():
+            for index in range(10):
+                api.add_task(Task(content=f'{threading.get_ident()} {index}'))
+                if index % 3 == 0:
+                    api.commit()
+            api.commit()
+
+        def read():
+            for _ in range(50):
+                assert len(api.tasks.find('Task', field='content', return_all=True)) >= 200
+                assert len(list(api.tasks._dict_values())) >= 200
+
+        def sync():
+            for seed in range(5):
+                fake.touch('items', 20, seed=seed)
+                api.sync()
+
+        errors = run_threads(write, read, sync)
+        api.commit()
+
+        assert not errors
+        assert not api.command_manager.commands
+        # Every command was sent exactly once
+        assert len(fake.resources['items']) == 200 + 4 * 10
+        assert len(api.tasks) == 240
+
+
+def test_sync_without_changes_does_not_copy_items(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=50)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+        tasks, projects = api.tasks._items, api.projects._items
+
+        api.sync()
+        assert api.tasks._items is tasks
+        assert api.projects._items is projects
+
+        fake.touch('items', 1)
+        api.sync()
+        assert api.tasks._items is not tasks
+        assert api.projects._items is projects
+
+
+def test_snapshot_keeps_items_but_shares_updates(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=5)
+
+    with TodoistAPI(api_key='fake', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync()
+        snapshot = api.tasks._items
+        updated_id, deleted_id = list(fake.resources['items'])[:2]
+        task = snapshot[updated_id]
+
+        fake.put('items', {**fake.resources['items'][updated_id], 'content': 'changed'})
+        fake.put('items', {**fake.resources['items'][deleted_id], 'is_deleted': True})
+        added_id = fake.put('items', {'id': fake._new_id(), 'content': 'added'})['id']
+        api.sync()
+
+        # The snapshot keeps the set of items it was taken with
+        assert deleted_id in snapshot and added_id not in snapshot
+        assert deleted_id not in api.tasks._items and added_id in api.tasks._items
+        # Updated items are changed in place, in the snapshot as well
+        assert snapshot[updated_id] is task is api.get_task(updated_id)
+        assert task.content == 'changed'
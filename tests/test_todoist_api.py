@@ -1,9 +1,13 @@
 # pylint: disable-all
+import json
 from pathlib import Path
+from urllib.parse import parse_qs
+
+import httpx
 
 from synctodoist import TodoistAPI
-from synctodoist.managers import command_manager
-from synctodoist.models import Settings
+from synctodoist.fake_server import FakeSyncAPI
+from synctodoist.models import Project, Settings, Task
 
 
 def test_sync(todoist):
@@ -24,10 +28,172 @@ def test_get_stats(todoist):
 def test_sync_custom_cache_path():
     settings = Settings(cache_dir=Path.home())
     api = TodoistAPI(settings=settings)
-    assert command_manager.settings.cache_dir == Path.home()
+    assert api.command_manager.settings.cache_dir == Path.home()
 
 
 def test_settings_populated_from_kwargs():
     api = TodoistAPI(api_key='Test', cache_dir=Path.home())
     assert api.settings.api_key == 'Test'
     assert api.settings.cache_dir == Path.home()
+
+
+def test_client_shared_with_command_manager():
+    api = TodoistAPI(api_key='Test', max_keepalive_connections=2)
+    assert api.command_manager.client is api.client
+    assert api.command_manager._get_client() is api.client
+    api.close()
+
+
+def test_context_manager_closes_client():
+    with TodoistAPI(api_key='Test') as api:
+        assert not api.client.is_closed
+
+    assert api.client.is_closed
+
+
+def test_commit_with_sync_uses_single_request(monkeypatch, tmp_path):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        form = parse_qs(request.content.decode())
+        requests.append(form)
+        batch = json.loads(form['commands'][0])
+        return httpx.Response(200, json={'sync_status': {command['uuid']: 'ok' for command in batch}, 'temp_id_mapping': {batch[0]['temp_id']: '99'},
+                                         'sync_token': 'NEXT', 'full_sync': False, 'projects': [], 'labels': [], 'sections': [], 'reminders': [],
+                                         'items': [{'id': '99', 'content': 'committed'}]})
+
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path)
+    monkeypatch.setattr(api.command_manager, 'client', httpx.Client(transport=httpx.MockTransport(handler)))
+
+    task = Task(content='committed')
+    api.add_task(task)
+    api.commit()
+
+    assert len(requests) == 1
+    assert 'resource_types' in requests[0]
+    assert task.id == '99'
+    assert api.get_task('99').content == 'committed'
+    assert api.synced
+
+
+def test_streamed_sync(monkeypatch, tmp_path):
+    body = json.dumps({'full_sync': True, 'sync_token': 'STREAMED', 'projects': [{'id': '1', 'name': 'Inbox'}], 'labels': [], 'sections': [],
+                       'reminders': [], 'items': [{'id': str(i), 'content': f'task {i}', 'project_id': '1'} for i in range(100)]}).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=iter([body[i:i + 64] for i in range(0, len(body), 64)]))
+
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path, stream_sync=True)
+    monkeypatch.setattr(api.command_manager, 'client', httpx.Client(transport=httpx.MockTransport(handler)))
+
+    assert api.sync(full_sync=True)
+    assert api.synced
+    assert len(api.tasks) == 100
+    assert api.get_task('42').content == 'task 42'
+    assert api.get_project('1').name == 'Inbox'
+    assert api.command_manager.sync_token == 'STREAMED'
+
+
+def test_sync_reloads_cache_only_if_changed(monkeypatch, tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=5)
+
+    with TodoistAPI(api_key='Test', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync(full_sync=True)
+        reads = []
+        read_json_cache = api.tasks._read_json_cache
+        monkeypatch.setattr(api.tasks, '_read_json_cache', lambda: reads.append(1) or read_json_cache())
+
+        api.sync()
+        assert not reads
+        assert len(api.tasks) == 5
+
+        # Another process keeps only one task in the cache
+        cache_file = api.tasks._cache_file()
+        cache = json.loads(cache_file.read_text(encoding='utf-8'))
+        cache['data'] = dict(list(cache['data'].items())[:1])
+        cache_file.write_text(json.dumps(cache), encoding='utf-8')
+
+        api.sync()
+        assert len(reads) == 1
+        assert len(api.tasks) == 1
+
+
+def test_partial_sync_applies_only_changes(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=10)
+
+    with TodoistAPI(api_key='Test', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync(full_sync=True)
+        assert len(api.last_sync_changes['tasks'].added) == 10
+        updated_id, deleted_id = list(fake.resources['items'])[:2]
+        task = api.get_task(updated_id)
+        temp_id = task.temp_id
+
+        fake.put('items', {**fake.resources['items'][updated_id], 'content': 'changed'})
+        fake.put('items', {**fake.resources['items'][deleted_id], 'is_deleted': True})
+        added_id = fake.put('items', {'id': fake._new_id(), 'content': 'new'})['id']
+        api.sync()
+
+        changes = api.last_sync_changes['tasks']
+        assert not changes.full_sync
+        assert (changes.added, changes.updated, changes.deleted) == ([added_id], [updated_id], [deleted_id])
+        assert api.last_sync_changes['projects'].count == 0
+        assert api.get_task(updated_id) is task
+        assert task.content == 'changed'
+        assert task.temp_id == temp_id
+        assert len(api.tasks) == 10
+
+        # A sync without changes does not rewrite the caches
+        stat = api.tasks._cache_file().stat()
+        api.sync()
+        assert api.last_sync_changes['tasks'].count == 0
+        assert api.tasks._cache_file().stat().st_mtime_ns == stat.st_mtime_ns
+
+
+def test_api_instances_are_independent(tmp_path):
+    first_fake, second_fake = FakeSyncAPI(), FakeSyncAPI()
+    first_fake.populate(projects=1, tasks=3)
+    second_fake.populate(projects=2, tasks=5)
+
+    with TodoistAPI(api_key='first', cache_dir=tmp_path, rate_limit_enabled=False, transport=first_fake.transport()) as first, \
+            TodoistAPI(api_key='second', cache_dir=tmp_path, rate_limit_enabled=False, transport=second_fake.transport()) as second:
+        first.sync()
+        second.sync()
+        assert (len(first.tasks), len(second.tasks)) == (3, 5)
+        assert first.tasks is not second.tasks
+        assert first.command_manager.sync_token == str(first_fake.version)
+        assert second.command_manager.sync_token == str(second_fake.version)
+
+        first.add_task(Task(content='only in the first account'))
+        assert len(first.command_manager.commands) == 1
+        assert not second.command_manager.commands
+
+        project = second.projects.find('.')
+        project_tasks = second.projects.get_tasks(project)
+        assert project_tasks == project.get_tasks(second.tasks) == second.tasks.find(pattern=f'^{project.id}$', field='project_id', return_all=True)
+        assert all(task.project_id == project.id for task in project_tasks)
+        # A project built by the user can be looked up in any account
+        assert not Project(id='unknown', name='not synced').get_tasks(first.tasks)
+
+    assert first.settings.account_cache_dir != second.settings.account_cache_dir
+    assert first.settings.account_cache_dir.parent == tmp_path
+    assert (first.settings.account_cache_dir / 'todoist_tasks.json').exists()
+    assert (second.settings.account_cache_dir / 'todoist_sync_token.json').exists()
+    assert not (tmp_path / 'todoist_tasks.json').exists()
+    assert Settings(api_key='first', cache_dir=tmp_path, cache_per_account=False).account_cache_dir == tmp_path
+
+
+def test_fetched_items_are_written_to_cache(tmp_path):
+    fake = FakeSyncAPI()
+    fake.populate(tasks=5)
+
+    with TodoistAPI(api_key='Test', cache_dir=tmp_path, rate_limit_enabled=False, transport=fake.transport()) as api:
+        api.sync(full_sync=True)
+        # Created by another client since the last sync, so the task is fetched from Todoist
+        fake.put('items', {'id': 'remote', 'content': 'remote task', 'project_id': next(iter(fake.resources['projects']))})
+        assert api.get_task('remote').content == 'remote task'
+        api._write_all_caches()
+
+    cache = json.loads(api.tasks._cache_file().read_text(encoding='utf-8'))
+    assert cache['data']['remote']['content'] == 'remote task'
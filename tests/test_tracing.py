@@ -0,0 +1,70 @@
+# pylint: disable-all
+import json
+
+import httpx
+import pytest
+
+from synctodoist import TodoistAPI, tracing
+
+
+class RecordingHook(tracing.TraceHook):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_start(self, span):
+        self.started.append(span.name)
+
+    def on_end(self, span):
+        self.ended.append(span)
+
+
+@pytest.fixture
+def hook():
+    hook = RecordingHook()
+    tracing.add_hook(hook)
+    yield hook
+    tracing.remove_hook(hook)
+
+
+def test_span_is_noop_without_hooks():
+    assert not tracing.is_enabled()
+    with tracing.span('sync', item_count=1) as span:
+        span.set_attribute('bytes', 10)
+
+    assert tracing.span('other') is span
+
+
+def test_span_records_attributes_parent_and_error(hook):
+    with pytest.raises(ValueError):
+        with tracing.span('outer', resource='tasks') as outer:
+            with tracing.span('inner') as inner:
+                inner.set_attribute('item_count', 3)
+            raise ValueError('failed')
+
+    assert hook.started == ['outer', 'inner']
+    assert [span.name for span in hook.ended] == ['inner', 'outer']
+    assert inner.parent is outer
+    assert inner.attributes == {'item_count': 3}
+    assert outer.attributes == {'resource': 'tasks'}
+    assert isinstance(outer.error, ValueError)
+    assert outer.duration >= inner.duration >= 0
+
+
+def test_sync_phases_are_traced(hook, monkeypatch, tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={'full_sync': True, 'sync_token': 'TRACED', 'projects': [], 'labels': [], 'sections': [], 'reminders': [],
+                                         'items': [{'id': '1', 'content': 'task'}, {'id': '2', 'content': 'task'}]})
+
+    api = TodoistAPI(api_key='Test', cache_dir=tmp_path)
+    monkeypatch.setattr(api.command_manager, 'client', httpx.Client(transport=httpx.MockTransport(handler)))
+    api.sync(full_sync=True)
+
+    spans = {span.name: span for span in hook.ended}
+    assert {'sync', 'sync.read_caches', 'http.request', 'sync.hydrate', 'sync.remove_deleted', 'sync.write_caches', 'cache.write',
+            'sync.write_sync_token'} <= set(spans)
+    assert spans['sync'].attributes['full_sync'] is True
+    assert spans['http.request'].attributes['status_code'] == 200
+    assert spans['http.request'].parent is spans['sync']
+    hydrate = [span for span in hook.ended if span.name == 'sync.hydrate' and span.attributes['resource_type'] == 'items']
+    assert hydrate[0].attributes['item_count'] == 2